@@ -0,0 +1,120 @@
+"""Range-partition auth_audit_log by month
+
+Revision ID: 002_partition_auth_audit_log
+Revises: 001_add_fk_constraints
+Create Date: 2026-10-19
+
+Converts auth_audit_log into a table partitioned by RANGE (created_at):
+- One partition per month (auth_audit_log_pYYYYMM) plus a default partition
+- Existing rows are copied into the new table; the old table is kept as
+  auth_audit_log_legacy until the copy has been verified (drop it manually)
+- Indexes on (tenant_id, created_at), (event_type, created_at) and
+  (user_id, created_at) are created on the parent and inherited by partitions
+
+Set AUDIT_TENANT_HASH_PARTITIONS > 0 to also sub-partition each month by
+HASH (tenant_id).
+"""
+import os
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '002_partition_auth_audit_log'
+down_revision: Union[str, Sequence[str], None] = '001_add_fk_constraints'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+DEFAULT_PARTITION = "auth_audit_log_default"
+
+
+def month_start(value: date | datetime) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def create_partition_sql(month: date, tenant_hash_partitions: int) -> list[str]:
+    """DDL for the auth_audit_log_pYYYYMM partition of `month` (optionally hash sub-partitioned)."""
+    name = f"auth_audit_log_p{month.year:04d}{month.month:02d}"
+    bounds = f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+
+    if tenant_hash_partitions <= 0:
+        return [f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "auth_audit_log" {bounds}']
+
+    return [
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "auth_audit_log" {bounds} PARTITION BY HASH (tenant_id)',
+        *(
+            f'CREATE TABLE IF NOT EXISTS "{name}_h{remainder}" PARTITION OF "{name}" '
+            f"FOR VALUES WITH (MODULUS {tenant_hash_partitions}, REMAINDER {remainder})"
+            for remainder in range(tenant_hash_partitions)
+        ),
+    ]
+
+
+def upgrade() -> None:
+    """Swap in a partitioned auth_audit_log and copy existing rows."""
+    conn = op.get_bind()
+    tenant_hash_partitions = int(os.getenv("AUDIT_TENANT_HASH_PARTITIONS", "0"))
+
+    conn.execute(text('ALTER TABLE "auth_audit_log" RENAME TO "auth_audit_log_legacy"'))
+    conn.execute(text('ALTER TABLE "auth_audit_log_legacy" RENAME CONSTRAINT "auth_audit_log_pkey" TO "auth_audit_log_legacy_pkey"'))
+
+    # Primary key must include the partition key
+    conn.execute(text("""
+        CREATE TABLE "auth_audit_log" (
+            id TEXT NOT NULL,
+            tenant_id TEXT,
+            event_type TEXT NOT NULL,
+            user_id TEXT,
+            ip_address TEXT,
+            user_agent TEXT,
+            metadata JSONB NOT NULL DEFAULT '{}',
+            created_at TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """))
+    conn.execute(text(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "auth_audit_log" DEFAULT'))
+
+    # Monthly partitions from the oldest existing row through MONTHS_AHEAD
+    oldest = conn.execute(text('SELECT min(created_at) FROM "auth_audit_log_legacy"')).scalar()
+    current = month_start(datetime.now(timezone.utc))
+    month = month_start(oldest) if oldest else current
+    last = add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        for statement in create_partition_sql(month, tenant_hash_partitions):
+            conn.execute(text(statement))
+        month = add_months(month, 1)
+
+    conn.execute(text('CREATE INDEX "auth_audit_log_tenant_created_idx" ON "auth_audit_log" (tenant_id, created_at DESC)'))
+    conn.execute(text('CREATE INDEX "auth_audit_log_event_created_idx" ON "auth_audit_log" (event_type, created_at DESC)'))
+    conn.execute(text('CREATE INDEX "auth_audit_log_user_created_idx" ON "auth_audit_log" (user_id, created_at DESC)'))
+
+    conn.execute(text("""
+        INSERT INTO "auth_audit_log" (id, tenant_id, event_type, user_id, ip_address, user_agent, metadata, created_at)
+        SELECT id, tenant_id, event_type, user_id, ip_address, user_agent, metadata, created_at
+        FROM "auth_audit_log_legacy"
+    """))
+
+    print("✓ auth_audit_log is now partitioned. Verify row counts, then DROP TABLE auth_audit_log_legacy.")
+
+
+def downgrade() -> None:
+    """Restore the unpartitioned table (rows written since upgrade are copied back)."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        INSERT INTO "auth_audit_log_legacy" (id, tenant_id, event_type, user_id, ip_address, user_agent, metadata, created_at)
+        SELECT id, tenant_id, event_type, user_id, ip_address, user_agent, metadata, created_at
+        FROM "auth_audit_log"
+        ON CONFLICT (id) DO NOTHING
+    """))
+    conn.execute(text('DROP TABLE "auth_audit_log" CASCADE'))
+    conn.execute(text('ALTER TABLE "auth_audit_log_legacy" RENAME CONSTRAINT "auth_audit_log_legacy_pkey" TO "auth_audit_log_pkey"'))
+    conn.execute(text('ALTER TABLE "auth_audit_log_legacy" RENAME TO "auth_audit_log"'))
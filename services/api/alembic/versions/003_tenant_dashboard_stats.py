@@ -0,0 +1,100 @@
+"""Add tenant_dashboard_stats rollup table
+
+Revision ID: 003_tenant_dashboard_stats
+Revises: 002_partition_auth_audit_log
+Create Date: 2026-10-19
+
+One row per tenant with the counts shown on the reports dashboard
+(users, active users, courses, enrollments by status) and the time they
+were last recomputed. Refreshed by the report_refresh_dashboard_stats
+Celery beat task; the table is populated once here.
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '003_tenant_dashboard_stats'
+down_revision: Union[str, Sequence[str], None] = '002_partition_auth_audit_log'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ACTIVE_WINDOW_DAYS = 30
+
+
+def upgrade() -> None:
+    """Create and populate tenant_dashboard_stats."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "tenant_dashboard_stats" (
+            tenant_id TEXT PRIMARY KEY REFERENCES "tenants"(id) ON DELETE CASCADE,
+            total_users INTEGER NOT NULL DEFAULT 0,
+            active_users INTEGER NOT NULL DEFAULT 0,
+            total_courses INTEGER NOT NULL DEFAULT 0,
+            enrollments_total INTEGER NOT NULL DEFAULT 0,
+            enrollments_completed INTEGER NOT NULL DEFAULT 0,
+            enrollments_in_progress INTEGER NOT NULL DEFAULT 0,
+            enrollments_not_started INTEGER NOT NULL DEFAULT 0,
+            refreshed_at TIMESTAMP(3) NOT NULL DEFAULT now()
+        )
+    """))
+
+    now = datetime.utcnow()
+    conn.execute(text("""
+        WITH u AS (
+            SELECT "tenantId",
+                   count(*) AS total,
+                   count(*) FILTER (WHERE "lastLoginAt" >= :active_since) AS active
+            FROM users
+            WHERE "deletedAt" IS NULL
+            GROUP BY "tenantId"
+        ),
+        c AS (
+            SELECT "tenantId", count(*) AS total
+            FROM courses
+            WHERE "deletedAt" IS NULL
+            GROUP BY "tenantId"
+        ),
+        e AS (
+            SELECT "tenantId",
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   count(*) FILTER (WHERE status = 'IN_PROGRESS') AS in_progress,
+                   count(*) FILTER (WHERE status = 'NOT_STARTED') AS not_started
+            FROM enrollments
+            WHERE "deletedAt" IS NULL
+            GROUP BY "tenantId"
+        )
+        INSERT INTO "tenant_dashboard_stats" (
+            tenant_id, total_users, active_users, total_courses,
+            enrollments_total, enrollments_completed, enrollments_in_progress, enrollments_not_started,
+            refreshed_at
+        )
+        SELECT t.id,
+               COALESCE(u.total, 0), COALESCE(u.active, 0),
+               COALESCE(c.total, 0),
+               COALESCE(e.total, 0), COALESCE(e.completed, 0),
+               COALESCE(e.in_progress, 0), COALESCE(e.not_started, 0),
+               :refreshed_at
+        FROM tenants t
+        LEFT JOIN u ON u."tenantId" = t.id
+        LEFT JOIN c ON c."tenantId" = t.id
+        LEFT JOIN e ON e."tenantId" = t.id
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            total_users = EXCLUDED.total_users,
+            active_users = EXCLUDED.active_users,
+            total_courses = EXCLUDED.total_courses,
+            enrollments_total = EXCLUDED.enrollments_total,
+            enrollments_completed = EXCLUDED.enrollments_completed,
+            enrollments_in_progress = EXCLUDED.enrollments_in_progress,
+            enrollments_not_started = EXCLUDED.enrollments_not_started,
+            refreshed_at = EXCLUDED.refreshed_at
+    """), {"active_since": now - timedelta(days=ACTIVE_WINDOW_DAYS), "refreshed_at": now})
+
+
+def downgrade() -> None:
+    """Drop tenant_dashboard_stats."""
+    op.execute(text('DROP TABLE IF EXISTS "tenant_dashboard_stats"'))
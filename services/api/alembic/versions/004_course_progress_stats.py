@@ -0,0 +1,146 @@
+"""Add trigger-maintained course_progress_stats rollup
+
+Revision ID: 004_course_progress_stats
+Revises: 003_tenant_dashboard_stats
+Create Date: 2026-10-19
+
+One row per (tenant, course) with enrollment totals, completions and the
+progress sum behind /api/reports/course-progress. Statement-level triggers
+on enrollments apply insert/update/delete deltas from the transition
+tables; existing tenants are backfilled here (re-run later with
+`python -m app.reports.backfill course-progress`).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '004_course_progress_stats'
+down_revision: Union[str, Sequence[str], None] = '003_tenant_dashboard_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLY_DELTAS = """
+    INSERT INTO "course_progress_stats" AS s
+        (tenant_id, course_id, total_enrollments, completed_enrollments, progress_sum, updated_at)
+    SELECT tenant_id, course_id, sum(d_total), sum(d_completed), sum(d_progress), now()
+    FROM deltas
+    GROUP BY tenant_id, course_id
+    HAVING sum(d_total) <> 0 OR sum(d_completed) <> 0 OR sum(d_progress) <> 0
+    ON CONFLICT (tenant_id, course_id) DO UPDATE SET
+        total_enrollments = s.total_enrollments + EXCLUDED.total_enrollments,
+        completed_enrollments = s.completed_enrollments + EXCLUDED.completed_enrollments,
+        progress_sum = s.progress_sum + EXCLUDED.progress_sum,
+        updated_at = EXCLUDED.updated_at;
+"""
+
+CHANGED = """
+    (o."courseId", o.status, o.progress, o."deletedAt")
+        IS DISTINCT FROM (n."courseId", n.status, n.progress, n."deletedAt")
+"""
+
+
+def _deltas(alias: str, source: str, sign: int, where: str = "TRUE") -> str:
+    """Signed counter delta rows for the enrollments in `alias`."""
+    return f"""
+        SELECT {alias}."tenantId" AS tenant_id,
+               {alias}."courseId" AS course_id,
+               {sign} AS d_total,
+               CASE WHEN {alias}.status = 'COMPLETED' THEN {sign} ELSE 0 END AS d_completed,
+               {sign} * COALESCE({alias}.progress, 0)::bigint AS d_progress
+        FROM {source}
+        WHERE {alias}."deletedAt" IS NULL AND {where}
+    """
+
+
+def upgrade() -> None:
+    """Create the rollup table and triggers, then backfill every tenant."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "course_progress_stats" (
+            tenant_id TEXT NOT NULL,
+            course_id TEXT NOT NULL,
+            total_enrollments INTEGER NOT NULL DEFAULT 0,
+            completed_enrollments INTEGER NOT NULL DEFAULT 0,
+            progress_sum BIGINT NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP(3) NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, course_id)
+        )
+    """))
+
+    joined = "old_rows o JOIN new_rows n ON n.id = o.id"
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION course_progress_stats_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH deltas AS ({_deltas("n", "new_rows n", 1)})
+                {APPLY_DELTAS}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH deltas AS ({_deltas("o", "old_rows o", -1)})
+                {APPLY_DELTAS}
+            ELSE
+                WITH deltas AS (
+                    {_deltas("o", joined, -1, CHANGED)}
+                    UNION ALL
+                    {_deltas("n", joined, 1, CHANGED)}
+                )
+                {APPLY_DELTAS}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+
+    # Transition tables require one trigger per event
+    conn.execute(text("""
+        CREATE TRIGGER enrollments_progress_stats_insert
+            AFTER INSERT ON "enrollments"
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER enrollments_progress_stats_update
+            AFTER UPDATE ON "enrollments"
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """))
+    conn.execute(text("""
+        CREATE TRIGGER enrollments_progress_stats_delete
+            AFTER DELETE ON "enrollments"
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """))
+
+    rebuild = text("""
+        INSERT INTO "course_progress_stats" AS s
+            (tenant_id, course_id, total_enrollments, completed_enrollments, progress_sum, updated_at)
+        SELECT c."tenantId", c.id,
+               count(e.id),
+               count(e.id) FILTER (WHERE e.status = 'COMPLETED'),
+               COALESCE(sum(e.progress), 0),
+               now()
+        FROM courses c
+        LEFT JOIN enrollments e
+            ON e."tenantId" = c."tenantId" AND e."courseId" = c.id AND e."deletedAt" IS NULL
+        WHERE c."tenantId" = :tenant_id
+        GROUP BY c."tenantId", c.id
+        ON CONFLICT (tenant_id, course_id) DO UPDATE SET
+            total_enrollments = EXCLUDED.total_enrollments,
+            completed_enrollments = EXCLUDED.completed_enrollments,
+            progress_sum = EXCLUDED.progress_sum,
+            updated_at = EXCLUDED.updated_at
+    """)
+    tenant_ids = [row[0] for row in conn.execute(text('SELECT id FROM tenants'))]
+    for tenant_id in tenant_ids:
+        conn.execute(rebuild, {"tenant_id": tenant_id})
+
+
+def downgrade() -> None:
+    """Drop the triggers and the rollup table."""
+    op.execute(text('DROP TRIGGER IF EXISTS enrollments_progress_stats_insert ON "enrollments"'))
+    op.execute(text('DROP TRIGGER IF EXISTS enrollments_progress_stats_update ON "enrollments"'))
+    op.execute(text('DROP TRIGGER IF EXISTS enrollments_progress_stats_delete ON "enrollments"'))
+    op.execute(text("DROP FUNCTION IF EXISTS course_progress_stats_apply()"))
+    op.execute(text('DROP TABLE IF EXISTS "course_progress_stats"'))
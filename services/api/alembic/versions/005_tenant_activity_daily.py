@@ -0,0 +1,147 @@
+"""Add daily per-tenant activity buckets
+
+Revision ID: 005_tenant_activity_daily
+Revises: 004_course_progress_stats
+Create Date: 2026-10-19
+
+One row per (tenant, day) with new users, last-login users, new
+enrollments and completions behind /api/reports/user-activity. Triggers
+on users and enrollments keep the buckets current; the last year is
+backfilled here (re-run later with `python -m app.reports.backfill activity`).
+"""
+from datetime import datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '005_tenant_activity_daily'
+down_revision: Union[str, Sequence[str], None] = '004_course_progress_stats'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MAX_WINDOW_DAYS = 365
+METRICS = ("new_users", "last_login_users", "new_enrollments", "completions")
+
+# Source timestamp column for each metric, by table
+TABLE_METRICS = {
+    "users": {"new_users": "createdAt", "last_login_users": "lastLoginAt"},
+    "enrollments": {"new_enrollments": "createdAt", "completions": "completedAt"},
+}
+
+APPLY_DELTAS = f"""
+    INSERT INTO "tenant_activity_daily" AS a (tenant_id, day, {", ".join(METRICS)})
+    SELECT tenant_id, day, {", ".join(f"sum({m})" for m in METRICS)}
+    FROM deltas
+    GROUP BY tenant_id, day
+    ON CONFLICT (tenant_id, day) DO UPDATE SET
+        {", ".join(f"{m} = a.{m} + EXCLUDED.{m}" for m in METRICS)};
+"""
+
+
+def _metric_select(metric: str, column: str, alias: str, source: str, sign: int = 1, where: str = "TRUE") -> str:
+    """Signed per-row delta rows for one metric."""
+    values = ", ".join(f"{sign if m == metric else 0} AS {m}" for m in METRICS)
+    return (
+        f'SELECT {alias}."tenantId" AS tenant_id, {alias}."{column}"::date AS day, {values} '
+        f'FROM {source} WHERE {alias}."{column}" IS NOT NULL AND {where}'
+    )
+
+
+def _metric_selects(table: str, alias: str, source: str, sign: int = 1, where: str = "TRUE") -> str:
+    return "\nUNION ALL\n".join(
+        _metric_select(metric, column, alias, source, sign, where)
+        for metric, column in TABLE_METRICS[table].items()
+    )
+
+
+def _function_sql(table: str) -> str:
+    columns = list(TABLE_METRICS[table].values())
+    changed = (
+        "(" + ", ".join(f'o."{c}"' for c in columns) + ") IS DISTINCT FROM ("
+        + ", ".join(f'n."{c}"' for c in columns) + ")"
+    )
+    joined = "old_rows o JOIN new_rows n ON n.id = o.id"
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_activity_daily_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH deltas AS ({_metric_selects(table, "n", "new_rows n")})
+                {APPLY_DELTAS}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH deltas AS ({_metric_selects(table, "o", "old_rows o", -1)})
+                {APPLY_DELTAS}
+            ELSE
+                WITH deltas AS (
+                    {_metric_selects(table, "o", joined, -1, changed)}
+                    UNION ALL
+                    {_metric_selects(table, "n", joined, 1, changed)}
+                )
+                {APPLY_DELTAS}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Create the bucket table and triggers, then backfill the last year."""
+    conn = op.get_bind()
+
+    conn.execute(text(f"""
+        CREATE TABLE IF NOT EXISTS "tenant_activity_daily" (
+            tenant_id TEXT NOT NULL,
+            day DATE NOT NULL,
+            {", ".join(f"{metric} INTEGER NOT NULL DEFAULT 0" for metric in METRICS)},
+            PRIMARY KEY (tenant_id, day)
+        )
+    """))
+
+    for table in TABLE_METRICS:
+        conn.execute(text(_function_sql(table)))
+        # Transition tables require one trigger per event
+        for event, referencing in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        ):
+            conn.execute(text(f"""
+                CREATE TRIGGER {table}_activity_daily_{event.lower()}
+                    AFTER {event} ON "{table}"
+                    REFERENCING {referencing}
+                    FOR EACH STATEMENT EXECUTE FUNCTION {table}_activity_daily_apply()
+            """))
+
+    selects = "\nUNION ALL\n".join(
+        _metric_select(
+            metric, column, "t", f"{table} t",
+            where=f't."{column}" >= :start_at AND t."{column}" < :end_at',
+        )
+        for table, metrics in TABLE_METRICS.items()
+        for metric, column in metrics.items()
+    )
+    end_day = datetime.now(timezone.utc).date() + timedelta(days=1)
+    start_day = end_day - timedelta(days=MAX_WINDOW_DAYS + 1)
+    conn.execute(text(f"""
+        WITH src AS ({selects})
+        INSERT INTO "tenant_activity_daily" AS a (tenant_id, day, {", ".join(METRICS)})
+        SELECT tenant_id, day, {", ".join(f"sum({m})" for m in METRICS)}
+        FROM src
+        GROUP BY tenant_id, day
+        ON CONFLICT (tenant_id, day) DO UPDATE SET
+            {", ".join(f"{m} = EXCLUDED.{m}" for m in METRICS)}
+    """), {
+        "start_at": datetime.combine(start_day, time.min),
+        "end_at": datetime.combine(end_day, time.min),
+    })
+
+
+def downgrade() -> None:
+    """Drop the triggers and the bucket table."""
+    for table in TABLE_METRICS:
+        for event in ("insert", "update", "delete"):
+            op.execute(text(f'DROP TRIGGER IF EXISTS {table}_activity_daily_{event} ON "{table}"'))
+        op.execute(text(f"DROP FUNCTION IF EXISTS {table}_activity_daily_apply()"))
+    op.execute(text('DROP TABLE IF EXISTS "tenant_activity_daily"'))
@@ -0,0 +1,53 @@
+"""Add user_notifications table
+
+Revision ID: 006_user_notifications
+Revises: 005_tenant_activity_daily
+Create Date: 2026-10-19
+
+One row per in-app notification and recipient, written in batches by the
+notify_batch Celery task. Indexed for a user's newest-first feed and
+unread count.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '006_user_notifications'
+down_revision: Union[str, Sequence[str], None] = '005_tenant_activity_daily'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create user_notifications and its indexes."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "user_notifications" (
+            id TEXT PRIMARY KEY,
+            tenant_id TEXT NOT NULL REFERENCES "tenants"(id) ON DELETE CASCADE,
+            user_id TEXT NOT NULL,
+            type TEXT NOT NULL DEFAULT 'in_app',
+            title TEXT NOT NULL,
+            body TEXT NOT NULL,
+            link TEXT,
+            metadata JSONB,
+            read_at TIMESTAMP(3),
+            created_at TIMESTAMP(3) NOT NULL DEFAULT now()
+        )
+    """))
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS "user_notifications_user_created_idx" '
+        'ON "user_notifications" (tenant_id, user_id, created_at DESC)'
+    ))
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS "user_notifications_unread_idx" '
+        'ON "user_notifications" (tenant_id, user_id) WHERE read_at IS NULL'
+    ))
+
+
+def downgrade() -> None:
+    """Drop user_notifications."""
+    op.execute(text('DROP TABLE IF EXISTS "user_notifications"'))
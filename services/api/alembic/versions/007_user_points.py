@@ -0,0 +1,77 @@
+"""Add user_points summary and user_badges
+
+Revision ID: 007_user_points
+Revises: 006_user_notifications
+Create Date: 2026-10-19
+
+One row per (tenant, user) with the running points total and level,
+updated in the same statement as each points_ledger insert, and one row
+per awarded badge. Existing ledgers are summarized here (re-run later
+with the gamification_recalculate task).
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '007_user_points'
+down_revision: Union[str, Sequence[str], None] = '006_user_notifications'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the tables, then summarize every tenant's ledger."""
+    conn = op.get_bind()
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "user_points" (
+            tenant_id TEXT NOT NULL REFERENCES "tenants"(id) ON DELETE CASCADE,
+            user_id TEXT NOT NULL,
+            total_points INTEGER NOT NULL DEFAULT 0,
+            level INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP(3) NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, user_id)
+        )
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "user_badges" (
+            tenant_id TEXT NOT NULL REFERENCES "tenants"(id) ON DELETE CASCADE,
+            user_id TEXT NOT NULL,
+            badge_id TEXT NOT NULL,
+            awarded_at TIMESTAMP(3) NOT NULL DEFAULT now(),
+            PRIMARY KEY (tenant_id, user_id, badge_id)
+        )
+    """))
+
+    rebuild = text("""
+        INSERT INTO "user_points" AS s (tenant_id, user_id, total_points, level, updated_at)
+        SELECT t.tenant_id, t.user_id, t.total,
+               COALESCE((
+                   SELECT max(l."levelNumber") FROM levels l
+                   WHERE l."tenantId" = t.tenant_id AND l."pointsRequired" <= t.total
+               ), 0),
+               :now
+        FROM (
+            SELECT pl."tenantId" AS tenant_id, pl."userId" AS user_id, sum(pl.points)::int AS total
+            FROM points_ledger pl
+            WHERE pl."tenantId" = :tenant_id
+            GROUP BY pl."tenantId", pl."userId"
+        ) t
+        ON CONFLICT (tenant_id, user_id) DO UPDATE SET
+            total_points = EXCLUDED.total_points,
+            level = EXCLUDED.level,
+            updated_at = EXCLUDED.updated_at
+    """)
+    now = datetime.utcnow()
+    tenant_ids = [row[0] for row in conn.execute(text('SELECT id FROM tenants'))]
+    for tenant_id in tenant_ids:
+        conn.execute(rebuild, {"tenant_id": tenant_id, "now": now})
+
+
+def downgrade() -> None:
+    """Drop user_badges and user_points."""
+    op.execute(text('DROP TABLE IF EXISTS "user_badges"'))
+    op.execute(text('DROP TABLE IF EXISTS "user_points"'))
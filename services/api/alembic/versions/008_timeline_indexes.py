@@ -0,0 +1,38 @@
+"""Add per-user and per-course feed indexes on timeline_events
+
+Revision ID: 008_timeline_indexes
+Revises: 007_user_points
+Create Date: 2026-10-19
+
+timeline_events (Prisma-managed) is only indexed by (tenantId, timestamp).
+Activity feeds page one user's or one course's events newest first with a
+(timestamp, id) keyset, so each gets its own index in that order.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '008_timeline_indexes'
+down_revision: Union[str, Sequence[str], None] = '007_user_points'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the feed indexes."""
+    op.execute(text(
+        'CREATE INDEX IF NOT EXISTS "timeline_events_user_feed_idx" ON "timeline_events" '
+        '("tenantId", "userId", timestamp DESC, id DESC) WHERE "userId" IS NOT NULL'
+    ))
+    op.execute(text(
+        'CREATE INDEX IF NOT EXISTS "timeline_events_course_feed_idx" ON "timeline_events" '
+        '("tenantId", "courseId", timestamp DESC, id DESC) WHERE "courseId" IS NOT NULL'
+    ))
+
+
+def downgrade() -> None:
+    """Drop the feed indexes."""
+    op.execute(text('DROP INDEX IF EXISTS "timeline_events_user_feed_idx"'))
+    op.execute(text('DROP INDEX IF EXISTS "timeline_events_course_feed_idx"'))
@@ -0,0 +1,38 @@
+"""Add certificate_pdfs index of rendered certificate files
+
+Revision ID: 009_certificate_pdfs
+Revises: 008_timeline_indexes
+Create Date: 2026-10-19
+
+Certificate PDFs are stored under their content hash, so each render
+records the issue's hash and file path here; issues without a row have
+not been rendered yet.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '009_certificate_pdfs'
+down_revision: Union[str, Sequence[str], None] = '008_timeline_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create certificate_pdfs."""
+    op.execute(text("""
+        CREATE TABLE IF NOT EXISTS "certificate_pdfs" (
+            issue_id TEXT PRIMARY KEY REFERENCES "certificate_issues"(id) ON DELETE CASCADE,
+            tenant_id TEXT NOT NULL,
+            pdf_key TEXT NOT NULL,
+            path TEXT NOT NULL,
+            rendered_at TIMESTAMP NOT NULL
+        )
+    """))
+
+
+def downgrade() -> None:
+    """Drop certificate_pdfs."""
+    op.execute(text('DROP TABLE IF EXISTS "certificate_pdfs"'))
@@ -0,0 +1,73 @@
+"""Add indexed report data-version watermarks
+
+Revision ID: 010_report_data_versions
+Revises: 009_certificate_pdfs
+Create Date: 2026-10-19
+
+The report cache key includes a per-table data version
+(app.reports.cache.data_version). It used to be max("updatedAt") plus
+count(*) over the tenant's rows, a full scan per POST
+/api/reports/generate. The new watermark is max("updatedAt"), read from
+a ("tenantId", "updatedAt") index, plus a per-(tenant, table) counter of
+hard-deleted rows, maintained by statement-level delete triggers.
+Tables that become reportable need the same index and trigger.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '010_report_data_versions'
+down_revision: Union[str, Sequence[str], None] = '009_certificate_pdfs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+REPORT_TABLES = ("users", "courses", "enrollments")
+
+
+def upgrade() -> None:
+    """Create the updatedAt indexes, the delete counters and their triggers."""
+    conn = op.get_bind()
+
+    for table in REPORT_TABLES:
+        conn.execute(text(
+            f'CREATE INDEX IF NOT EXISTS "{table}_tenant_updated_idx" ON "{table}" ("tenantId", "updatedAt")'
+        ))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS "report_delete_versions" (
+            tenant_id TEXT NOT NULL,
+            table_name TEXT NOT NULL,
+            version BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (tenant_id, table_name)
+        )
+    """))
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION report_count_deletes() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO "report_delete_versions" (tenant_id, table_name, version)
+            SELECT "tenantId", TG_TABLE_NAME, count(*) FROM old_rows GROUP BY "tenantId"
+            ON CONFLICT (tenant_id, table_name) DO UPDATE
+            SET version = "report_delete_versions".version + EXCLUDED.version;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """))
+    for table in REPORT_TABLES:
+        conn.execute(text(f"""
+            CREATE TRIGGER {table}_report_count_deletes
+                AFTER DELETE ON "{table}"
+                REFERENCING OLD TABLE AS old_rows
+                FOR EACH STATEMENT EXECUTE FUNCTION report_count_deletes()
+        """))
+
+
+def downgrade() -> None:
+    """Drop the triggers, the counters and the indexes."""
+    for table in REPORT_TABLES:
+        op.execute(text(f'DROP TRIGGER IF EXISTS {table}_report_count_deletes ON "{table}"'))
+    op.execute(text("DROP FUNCTION IF EXISTS report_count_deletes()"))
+    op.execute(text('DROP TABLE IF EXISTS "report_delete_versions"'))
+    for table in REPORT_TABLES:
+        op.execute(text(f'DROP INDEX IF EXISTS "{table}_tenant_updated_idx"'))
@@ -0,0 +1,94 @@
+"""Stop maintaining last-login activity buckets from a users trigger
+
+Revision ID: 011_activity_login_refresh
+Revises: 010_report_data_versions
+Create Date: 2026-10-19
+
+The users UPDATE trigger of 005_tenant_activity_daily moved each user's
+last_login_users count to today on sign-in, locking the tenant's bucket
+row for today on every login. The users trigger now only counts new
+users on INSERT/DELETE, and last_login_users is recounted by the
+report_refresh_login_buckets beat task (app.reports.activity.refresh_logins),
+which ranges over a ("lastLoginAt", "tenantId") index.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = '011_activity_login_refresh'
+down_revision: Union[str, Sequence[str], None] = '010_report_data_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLY_DELTAS = """
+    INSERT INTO "tenant_activity_daily" AS a (tenant_id, day, new_users, last_login_users)
+    SELECT tenant_id, day, sum(new_users), sum(last_login_users)
+    FROM deltas
+    GROUP BY tenant_id, day
+    ON CONFLICT (tenant_id, day) DO UPDATE SET
+        new_users = a.new_users + EXCLUDED.new_users,
+        last_login_users = a.last_login_users + EXCLUDED.last_login_users;
+"""
+
+
+def _deltas(alias: str, source: str, sign: int, columns: Sequence[str], where: str = "TRUE") -> str:
+    """Signed new_users/last_login_users delta rows for the given users columns."""
+    metrics = {"createdAt": (sign, 0), "lastLoginAt": (0, sign)}
+    return "\nUNION ALL\n".join(
+        f'SELECT {alias}."tenantId" AS tenant_id, {alias}."{column}"::date AS day, '
+        f'{metrics[column][0]} AS new_users, {metrics[column][1]} AS last_login_users '
+        f'FROM {source} WHERE {alias}."{column}" IS NOT NULL AND {where}'
+        for column in columns
+    )
+
+
+def _function_sql(columns: Sequence[str]) -> str:
+    changed = (
+        "(" + ", ".join(f'o."{c}"' for c in columns) + ") IS DISTINCT FROM ("
+        + ", ".join(f'n."{c}"' for c in columns) + ")"
+    )
+    joined = "old_rows o JOIN new_rows n ON n.id = o.id"
+    return f"""
+        CREATE OR REPLACE FUNCTION users_activity_daily_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH deltas AS ({_deltas("n", "new_rows n", 1, columns)})
+                {APPLY_DELTAS}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH deltas AS ({_deltas("o", "old_rows o", -1, columns)})
+                {APPLY_DELTAS}
+            ELSE
+                WITH deltas AS (
+                    {_deltas("o", joined, -1, columns, changed)}
+                    UNION ALL
+                    {_deltas("n", joined, 1, columns, changed)}
+                )
+                {APPLY_DELTAS}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    """Drop the users UPDATE trigger, count only new users, and index lastLoginAt."""
+    op.execute(text('DROP TRIGGER IF EXISTS users_activity_daily_update ON "users"'))
+    op.execute(text(_function_sql(["createdAt"])))
+    op.execute(text(
+        'CREATE INDEX IF NOT EXISTS "users_last_login_idx" ON "users" ("lastLoginAt", "tenantId")'
+    ))
+
+
+def downgrade() -> None:
+    """Restore the trigger-maintained last-login buckets."""
+    op.execute(text('DROP INDEX IF EXISTS "users_last_login_idx"'))
+    op.execute(text(_function_sql(["createdAt", "lastLoginAt"])))
+    op.execute(text("""
+        CREATE TRIGGER users_activity_daily_update
+            AFTER UPDATE ON "users"
+            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION users_activity_daily_apply()
+    """))
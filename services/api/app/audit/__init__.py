@@ -3,6 +3,7 @@
 from app.audit.logger import (
     log_audit,
     log_audit_background,
+    replay_audit_spool,
     AuditEntry,
     AuditEventType,
     AuditSeverity,
@@ -11,6 +12,7 @@ from app.audit.logger import (
 __all__ = [
     "log_audit",
     "log_audit_background",
+    "replay_audit_spool",
     "AuditEntry",
     "AuditEventType",
     "AuditSeverity",
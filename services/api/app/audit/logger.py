@@ -2,11 +2,12 @@
 Fail-Open Audit Logger
 
 Provides enterprise-grade audit logging with:
-- JSONB snapshots of before/after state
+- JSONB snapshots of before/after state (full or diff-only, size-capped)
 - Severity classification
 - Non-blocking writes (fire-and-forget)
 - OpenTelemetry-compatible correlation IDs
 - Fail-open design (never crashes the main request)
+- Disk spool fallback so events survive DB outages (see spool.py)
 
 This mirrors the Node.js audit-logger.ts implementation.
 """
@@ -14,7 +15,6 @@ This mirrors the Node.js audit-logger.ts implementation.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -24,6 +24,9 @@ from uuid import uuid4
 
 from sqlalchemy import text
 
+from app.audit.serialize import cap_metadata, diff_states
+from app.audit.spool import AuditSpool, replay_spool
+from app.config import get_settings
 from app.db.session import async_session_factory
 
 logger = logging.getLogger(__name__)
@@ -172,6 +175,7 @@ class AuditEntry:
     metadata: dict[str, Any] = field(default_factory=dict)
     before_state: Optional[dict[str, Any]] = None  # State before change
     after_state: Optional[dict[str, Any]] = None   # State after change
+    snapshot_mode: Optional[str] = None  # "full" or "diff" (defaults to settings)
     _severity: Optional[AuditSeverity] = None
     
     @property
@@ -186,7 +190,14 @@ class AuditEntry:
         self._severity = value
     
     def to_metadata_json(self) -> str:
-        """Serialize all metadata to JSON string for storage."""
+        """
+        Serialize all metadata to JSON string for storage.
+        
+        In "diff" snapshot mode only changed keys are stored (under "diff")
+        when both before and after states are present. Payloads larger than
+        `audit_metadata_max_bytes` are shrunk with truncation markers.
+        """
+        settings = get_settings()
         data = {
             "severity": self.severity.value,
             "correlationId": self.correlation_id,
@@ -199,12 +210,88 @@ class AuditEntry:
             data["resourceId"] = self.resource_id
         if self.target_user_id:
             data["targetUserId"] = self.target_user_id
-        if self.before_state:
-            data["before"] = self.before_state
-        if self.after_state:
-            data["after"] = self.after_state
         
-        return json.dumps(data, default=str)
+        mode = self.snapshot_mode or settings.audit_snapshot_mode
+        if mode == "diff" and self.before_state and self.after_state:
+            data["diff"] = diff_states(self.before_state, self.after_state)
+        else:
+            if self.before_state:
+                data["before"] = self.before_state
+            if self.after_state:
+                data["after"] = self.after_state
+        
+        return cap_metadata(data, settings.audit_metadata_max_bytes)
+
+
+# ============= Persistence =============
+
+_INSERT_AUDIT_SQL = text("""
+    INSERT INTO auth_audit_log (
+        id, tenant_id, event_type, user_id,
+        ip_address, user_agent, metadata, created_at
+    ) VALUES (
+        :id, :tenant_id, :event_type, :user_id,
+        :ip_address, :user_agent, CAST(:metadata AS jsonb), :created_at
+    )
+    ON CONFLICT (id, created_at) DO NOTHING
+""")
+
+_spool: Optional[AuditSpool] = None
+_pending_writes = 0
+
+
+def get_audit_spool() -> AuditSpool:
+    """Get the process-wide audit spool (created on first use)."""
+    global _spool
+    if _spool is None:
+        settings = get_settings()
+        _spool = AuditSpool(
+            settings.audit_spool_dir,
+            segment_bytes=settings.audit_spool_segment_bytes,
+            fsync_every=settings.audit_spool_fsync_every,
+        )
+    return _spool
+
+
+def _build_row(entry: AuditEntry) -> dict[str, Any]:
+    """Build the auth_audit_log row for an entry (id/timestamp fixed at log time)."""
+    return {
+        "id": str(uuid4()),
+        "tenant_id": entry.tenant_id,
+        "event_type": entry.event_type.value,
+        "user_id": entry.user_id,
+        "ip_address": entry.ip_address,
+        "user_agent": entry.user_agent,
+        "metadata": entry.to_metadata_json(),
+        "created_at": datetime.now(timezone.utc).replace(tzinfo=None),
+    }
+
+
+def _created_at(value: datetime | str) -> datetime:
+    """created_at is TIMESTAMP (no tz) holding UTC; spooled rows carry ISO strings."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+async def _insert_rows(rows: list[dict[str, Any]]) -> None:
+    """Insert audit rows in one transaction. Raises on failure."""
+    params = [{**row, "created_at": _created_at(row["created_at"])} for row in rows]
+    async with async_session_factory() as session:
+        await session.execute(_INSERT_AUDIT_SQL, params)
+        await session.commit()
+
+
+async def _spool_rows(rows: list[dict[str, Any]]) -> bool:
+    """Write rows to the disk spool. Returns False if even the spool fails."""
+    try:
+        await asyncio.to_thread(get_audit_spool().append_many, rows)
+        return True
+    except Exception as e:
+        logger.error(f"[AUDIT] Spool write failed, {len(rows)} event(s) lost: {e}")
+        return False
 
 
 async def log_audit(entry: AuditEntry) -> bool:
@@ -216,51 +303,43 @@ async def log_audit(entry: AuditEntry) -> bool:
     - Returns True on success, False on failure
     - Logs errors but doesn't propagate them
     
+    If the insert fails, the event is appended to the local disk spool and
+    replayed later by `replay_audit_spool`.
+    
     Args:
         entry: The audit entry to log
     
     Returns:
         True if logged successfully, False otherwise
     """
+    row = _build_row(entry)
     try:
-        async with async_session_factory() as session:
-            await session.execute(
-                text("""
-                    INSERT INTO auth_audit_log (
-                        id, tenant_id, event_type, user_id,
-                        ip_address, user_agent, metadata, created_at
-                    ) VALUES (
-                        :id, :tenant_id, :event_type, :user_id,
-                        :ip_address, :user_agent, :metadata::jsonb, :created_at
-                    )
-                """),
-                {
-                    "id": str(uuid4()),
-                    "tenant_id": entry.tenant_id,
-                    "event_type": entry.event_type.value,
-                    "user_id": entry.user_id,
-                    "ip_address": entry.ip_address,
-                    "user_agent": entry.user_agent,
-                    "metadata": entry.to_metadata_json(),
-                    "created_at": datetime.now(timezone.utc),
-                }
-            )
-            await session.commit()
-            return True
+        await _insert_rows([row])
+        return True
             
     except Exception as e:
         # Fail-open: log error but don't crash
         logger.warning(
-            f"[AUDIT] Failed to log event {entry.event_type.value}: {e}",
+            f"[AUDIT] Failed to log event {entry.event_type.value}, spooling: {e}",
             extra={
                 "event_type": entry.event_type.value,
                 "user_id": entry.user_id,
                 "error": str(e),
             }
         )
+        await _spool_rows([row])
         return False
 
 
+async def _log_audit_tracked(entry: AuditEntry) -> None:
+    """Run log_audit while counting it against the pending-write limit."""
+    global _pending_writes
+    try:
+        await log_audit(entry)
+    finally:
+        _pending_writes -= 1
+
+
 def log_audit_background(entry: AuditEntry) -> None:
     """
     Fire-and-forget audit logging.
@@ -269,14 +348,23 @@ def log_audit_background(entry: AuditEntry) -> None:
     the main request. This is the recommended way to log during
     API request handling.
     
+    When more than `audit_max_pending_writes` writes are in flight (DB slow
+    or down), the entry goes straight to the disk spool instead of piling
+    up another task and connection.
+    
     Args:
         entry: The audit entry to log
     """
+    global _pending_writes
     try:
         # Get the current event loop and create task
         loop = asyncio.get_event_loop()
         if loop.is_running():
-            asyncio.create_task(log_audit(entry))
+            if _pending_writes >= get_settings().audit_max_pending_writes:
+                asyncio.create_task(_spool_rows([_build_row(entry)]))
+                return
+            _pending_writes += 1
+            asyncio.create_task(_log_audit_tracked(entry))
         else:
             # Fallback for non-async contexts
             loop.run_until_complete(log_audit(entry))
@@ -288,6 +376,41 @@ def log_audit_background(entry: AuditEntry) -> None:
             logger.warning(f"[AUDIT] Background log failed: {e}")
 
 
+# ============= Spool Replay =============
+
+async def replay_audit_spool() -> int:
+    """
+    Drain the disk spool back into auth_audit_log.
+    
+    Safe to call at any time: stops at the first DB failure and leaves the
+    remaining segments for the next attempt.
+    
+    Returns:
+        Number of events replayed
+    """
+    spool = get_audit_spool()
+    if not spool.has_pending():
+        return 0
+    return await replay_spool(spool, _insert_rows)
+
+
+async def run_audit_spool_replayer(interval_seconds: Optional[float] = None) -> None:
+    """
+    Periodically replay the audit spool until cancelled.
+    
+    Started from the application lifespan; cancel the task on shutdown.
+    """
+    interval = interval_seconds or get_settings().audit_spool_replay_seconds
+    while True:
+        try:
+            await replay_audit_spool()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[AUDIT] Spool replay failed: {e}")
+        await asyncio.sleep(interval)
+
+
 # ============= Helper Functions =============
 
 def extract_client_ip(request) -> str:
@@ -362,6 +485,9 @@ __all__ = [
     "AuditSeverity",
     "log_audit",
     "log_audit_background",
+    "get_audit_spool",
+    "replay_audit_spool",
+    "run_audit_spool_replayer",
     "extract_client_ip",
     "extract_user_agent",
     "create_audit_entry_from_request",
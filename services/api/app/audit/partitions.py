@@ -0,0 +1,171 @@
+"""
+auth_audit_log Partition Management
+
+The audit table is range-partitioned by month on `created_at`
+(see alembic revision 002). This module creates upcoming partitions and
+enforces retention by detaching and dropping expired ones.
+
+Partition naming: `auth_audit_log_pYYYYMM`. Rows outside every monthly
+range land in `auth_audit_log_default`, which is never dropped.
+
+Optionally each month can be sub-partitioned by `HASH (tenant_id)` to
+spread large tenants across smaller tables (`tenant_hash_partitions > 0`).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Any
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "auth_audit_log"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+_PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def month_start(value: date | datetime) -> date:
+    """First day of the month containing `value`."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Shift a month-start date by `months` (may be negative)."""
+    index = value.year * 12 + (value.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding `month`."""
+    return f"{PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+
+
+def parse_partition_month(name: str) -> date | None:
+    """Inverse of partition_name; None for non-monthly partitions."""
+    match = _PARTITION_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def create_partition_sql(month: date, tenant_hash_partitions: int = 0) -> list[str]:
+    """DDL statements that create the partition for `month` (idempotent)."""
+    name = partition_name(month)
+    start = month.isoformat()
+    end = add_months(month, 1).isoformat()
+
+    if tenant_hash_partitions <= 0:
+        return [
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{PARENT_TABLE}" '
+            f"FOR VALUES FROM ('{start}') TO ('{end}')"
+        ]
+
+    statements = [
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{PARENT_TABLE}" '
+        f"FOR VALUES FROM ('{start}') TO ('{end}') PARTITION BY HASH (tenant_id)"
+    ]
+    for remainder in range(tenant_hash_partitions):
+        statements.append(
+            f'CREATE TABLE IF NOT EXISTS "{name}_h{remainder}" PARTITION OF "{name}" '
+            f"FOR VALUES WITH (MODULUS {tenant_hash_partitions}, REMAINDER {remainder})"
+        )
+    return statements
+
+
+async def list_partitions(conn: Any) -> list[str]:
+    """Names of the direct partitions of auth_audit_log."""
+    result = await conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+    """), {"parent": PARENT_TABLE})
+    return [row[0] for row in result]
+
+
+async def ensure_partitions(
+    conn: Any,
+    months_ahead: int = 3,
+    tenant_hash_partitions: int = 0,
+    now: datetime | None = None,
+) -> list[str]:
+    """
+    Create partitions for the current month and `months_ahead` future months.
+
+    Returns:
+        Names of partitions that were missing and have been created
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    existing = set(await list_partitions(conn))
+
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        for statement in create_partition_sql(month, tenant_hash_partitions):
+            await conn.execute(text(statement))
+        created.append(name)
+
+    if created:
+        logger.info(f"[AUDIT] Created partitions: {', '.join(created)}")
+    return created
+
+
+def expired_partitions(names: list[str], retain_months: int, now: datetime | None = None) -> list[str]:
+    """
+    Monthly partitions entirely older than the retention window.
+
+    The current month always counts as the first retained month.
+    """
+    cutoff = add_months(month_start(now or datetime.now(timezone.utc)), -(retain_months - 1))
+    return sorted(
+        name for name in names
+        if (month := parse_partition_month(name)) is not None and month < cutoff
+    )
+
+
+async def drop_expired_partitions(
+    conn: Any,
+    retain_months: int,
+    now: datetime | None = None,
+) -> list[str]:
+    """
+    Detach and drop monthly partitions older than `retain_months`.
+
+    Detaching first keeps the parent's lock short; the DROP then only
+    touches the standalone table.
+
+    Returns:
+        Names of dropped partitions
+    """
+    if retain_months < 1:
+        raise ValueError("retain_months must be at least 1")
+
+    dropped = []
+    for name in expired_partitions(await list_partitions(conn), retain_months, now):
+        await conn.execute(text(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"'))
+        await conn.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+        dropped.append(name)
+
+    if dropped:
+        logger.info(f"[AUDIT] Dropped expired partitions: {', '.join(dropped)}")
+    return dropped
+
+
+__all__ = [
+    "PARENT_TABLE",
+    "DEFAULT_PARTITION",
+    "partition_name",
+    "parse_partition_month",
+    "create_partition_sql",
+    "ensure_partitions",
+    "expired_partitions",
+    "drop_expired_partitions",
+]
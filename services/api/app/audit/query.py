@@ -0,0 +1,211 @@
+"""
+Audit Log Read API
+
+Filtered, keyset-paginated reads over the partitioned auth_audit_log.
+
+Every query is bounded by a created_at window so PostgreSQL prunes
+partitions, and filters map onto the (tenant_id, created_at),
+(event_type, created_at) and (user_id, created_at) indexes.
+
+Exports stream through a server-side cursor in fixed-size chunks, so
+memory stays flat regardless of the window size.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.audit.serialize import dumps
+from app.db.session import async_session_factory
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    import json
+
+    _loads = json.loads
+
+DEFAULT_WINDOW_DAYS = 30
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class AuditQuery:
+    """Filters for an audit log read."""
+    tenant_id: Optional[str]
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    event_types: list[str] = field(default_factory=list)
+    user_id: Optional[str] = None
+    resource_type: Optional[str] = None
+    resource_id: Optional[str] = None
+    limit: int = 50
+    cursor: Optional[str] = None
+
+    def window(self) -> tuple[datetime, datetime]:
+        """Resolved [start, end) window (defaults to the last 30 days)."""
+        end = self.end or datetime.now(timezone.utc)
+        start = self.start or end - timedelta(days=DEFAULT_WINDOW_DAYS)
+        return _naive_utc(start), _naive_utc(end)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """created_at is TIMESTAMP (no tz) holding UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    """Opaque keyset cursor for the row after which the next page starts."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), row_id
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def build_where(query: AuditQuery, use_cursor: bool = True) -> tuple[str, dict[str, Any]]:
+    """WHERE clause and bind params for a query."""
+    start, end = query.window()
+    clauses = ["created_at >= :start", "created_at < :end"]
+    params: dict[str, Any] = {"start": start, "end": end}
+
+    if query.tenant_id:
+        clauses.append("tenant_id = :tenant_id")
+        params["tenant_id"] = query.tenant_id
+    else:
+        clauses.append("tenant_id IS NULL")
+
+    if query.event_types:
+        clauses.append("event_type = ANY(:event_types)")
+        params["event_types"] = list(query.event_types)
+    if query.user_id:
+        clauses.append("user_id = :user_id")
+        params["user_id"] = query.user_id
+    if query.resource_type:
+        clauses.append("metadata->>'resourceType' = :resource_type")
+        params["resource_type"] = query.resource_type
+    if query.resource_id:
+        clauses.append("metadata->>'resourceId' = :resource_id")
+        params["resource_id"] = query.resource_id
+
+    if use_cursor and query.cursor:
+        cursor_at, cursor_id = decode_cursor(query.cursor)
+        clauses.append("(created_at, id) < (:cursor_at, :cursor_id)")
+        params["cursor_at"] = cursor_at
+        params["cursor_id"] = cursor_id
+
+    return " AND ".join(clauses), params
+
+
+_COLUMNS = "id, tenant_id, event_type, user_id, ip_address, user_agent, metadata, created_at"
+
+
+def _row_to_dict(row: Any) -> dict[str, Any]:
+    metadata = row[6]
+    if isinstance(metadata, (str, bytes)):
+        metadata = _loads(metadata)
+    return {
+        "id": row[0],
+        "tenantId": row[1],
+        "eventType": row[2],
+        "userId": row[3],
+        "ipAddress": row[4],
+        "userAgent": row[5],
+        "metadata": metadata,
+        "createdAt": row[7].isoformat() if row[7] else None,
+    }
+
+
+async def query_audit_log(
+    db: AsyncSession,
+    query: AuditQuery,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of audit events, newest first.
+
+    Returns:
+        (events, next_cursor) - next_cursor is None on the last page
+    """
+    limit = max(1, min(query.limit, MAX_PAGE_SIZE))
+    where, params = build_where(query)
+    params["limit"] = limit + 1
+
+    result = await db.execute(
+        text(f"""
+            SELECT {_COLUMNS}
+            FROM auth_audit_log
+            WHERE {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT :limit
+        """),
+        params,
+    )
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][7], rows[-1][0])
+
+    return [_row_to_dict(row) for row in rows], next_cursor
+
+
+async def stream_audit_log(
+    query: AuditQuery,
+    chunk_size: int = 1000,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Stream every matching event through a server-side cursor.
+
+    Opens its own session so it can outlive the request's dependency scope
+    (e.g. inside a StreamingResponse).
+
+    Yields:
+        Lists of at most `chunk_size` events, oldest first
+    """
+    where, params = build_where(query, use_cursor=False)
+    statement = text(f"""
+        SELECT {_COLUMNS}
+        FROM auth_audit_log
+        WHERE {where}
+        ORDER BY created_at, id
+    """).execution_options(yield_per=chunk_size)
+
+    async with async_session_factory() as session:
+        result = await session.stream(statement, params)
+        async for rows in result.partitions(chunk_size):
+            yield [_row_to_dict(row) for row in rows]
+
+
+async def export_audit_ndjson(query: AuditQuery, chunk_size: int = 1000) -> AsyncIterator[bytes]:
+    """Stream matching events as newline-delimited JSON, one chunk per yield."""
+    async for events in stream_audit_log(query, chunk_size):
+        yield "".join(dumps(event) + "\n" for event in events).encode("utf-8")
+
+
+__all__ = [
+    "AuditQuery",
+    "encode_cursor",
+    "decode_cursor",
+    "build_where",
+    "query_audit_log",
+    "stream_audit_log",
+    "export_audit_ndjson",
+]
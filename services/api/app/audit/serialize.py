@@ -0,0 +1,100 @@
+"""
+Audit Metadata Serialization
+
+Fast JSON encoding for audit metadata plus the compact-snapshot helpers:
+- orjson when available (native datetime/UUID/enum), stdlib json otherwise
+- Diff-only snapshots: store changed keys instead of full before/after
+- Size cap: oversized payloads are shrunk with explicit truncation markers
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+# Keys that hold bulky state and are shrunk first when over the size cap
+SNAPSHOT_KEYS = ("before", "after", "diff")
+
+# Keys that always survive truncation
+ESSENTIAL_KEYS = frozenset({"severity", "correlationId", "resourceType", "resourceId", "targetUserId"})
+
+
+def dumps(data: Any) -> str:
+    """Serialize to a JSON string (orjson fast path, stdlib fallback)."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, default=str)
+
+
+def diff_states(
+    before: Optional[dict[str, Any]],
+    after: Optional[dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Compute a compact diff between two snapshots.
+
+    Returns:
+        {"changed": {key: [old, new]}, "added": {key: new}, "removed": [key]}
+        with empty sections omitted
+    """
+    before = before or {}
+    after = after or {}
+
+    diff: dict[str, Any] = {}
+    changed = {
+        k: [before[k], after[k]]
+        for k in before.keys() & after.keys()
+        if before[k] != after[k]
+    }
+    added = {k: after[k] for k in after.keys() - before.keys()}
+    removed = sorted(before.keys() - after.keys())
+
+    if changed:
+        diff["changed"] = changed
+    if added:
+        diff["added"] = added
+    if removed:
+        diff["removed"] = removed
+    return diff
+
+
+def cap_metadata(data: dict[str, Any], max_bytes: int) -> str:
+    """
+    Serialize metadata, shrinking it until it fits in `max_bytes`.
+
+    1. Snapshot sections are replaced by {"_truncated": true, "keys": [...]}
+    2. If still too big, all non-essential keys are dropped
+
+    Truncated payloads carry `"truncated": {"originalBytes": n}`.
+    """
+    encoded = dumps(data)
+    original_bytes = len(encoded.encode("utf-8"))
+    if max_bytes <= 0 or original_bytes <= max_bytes:
+        return encoded
+
+    shrunk = dict(data)
+    for key in SNAPSHOT_KEYS:
+        value = shrunk.get(key)
+        if isinstance(value, dict):
+            shrunk[key] = {"_truncated": True, "keys": sorted(map(str, value.keys()))}
+    shrunk["truncated"] = {"originalBytes": original_bytes}
+
+    encoded = dumps(shrunk)
+    if len(encoded.encode("utf-8")) <= max_bytes:
+        return encoded
+
+    minimal = {k: v for k, v in data.items() if k in ESSENTIAL_KEYS}
+    minimal["truncated"] = {"originalBytes": original_bytes, "droppedKeys": sorted(data.keys() - ESSENTIAL_KEYS)}
+    return dumps(minimal)
+
+
+__all__ = [
+    "dumps",
+    "diff_states",
+    "cap_metadata",
+]
@@ -0,0 +1,288 @@
+"""
+Disk-Spooled Audit Fallback
+
+When the database rejects an audit insert (outage, pool exhaustion) or the
+number of in-flight background writes exceeds its limit, the audit row is
+appended to a local spool instead of being dropped.
+
+Spool layout:
+- Segmented JSONL files (`audit-<epoch_ms>-<pid>-<seq>.jsonl`) in one
+  directory, shared by every API worker process
+- Only a process's newest segment is open for appends; it is sealed once
+  it grows past `segment_bytes`
+- fsync is batched: every `fsync_every` records or `fsync_interval` seconds
+
+A process holds an exclusive flock on its open segment until it seals it.
+A replayer (in any process) drains segments back into `auth_audit_log`
+once the DB is healthy, taking the same lock without blocking first: a
+segment another process is still appending to is skipped, and the lock is
+held until the segment is deleted, so two replayers never drain the same
+file. Segments left by a dead process are unlocked and get replayed.
+Rows keep the id and timestamp generated at log time, so replays are
+idempotent (`ON CONFLICT (id, created_at) DO NOTHING`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+from app.audit.serialize import dumps
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "audit-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class AuditSpool:
+    """
+    Append-only, segmented JSONL spool for audit rows.
+
+    Thread-safe: appends may come from worker threads (asyncio.to_thread)
+    while the replayer seals and drains segments.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        segment_bytes: int = 16 * 1024 * 1024,
+        fsync_every: int = 64,
+        fsync_interval: float = 1.0,
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._file = None
+        self._path: Optional[Path] = None
+        self._size = 0
+        self._seq = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ----- Writing -----
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Append one audit row to the active segment."""
+        self.append_many([row])
+
+    def append_many(self, rows: list[dict[str, Any]]) -> None:
+        """Append a batch of audit rows with a single (batched) fsync decision."""
+        if not rows:
+            return
+
+        payload = "".join(dumps(row) + "\n" for row in rows).encode("utf-8")
+
+        with self._lock:
+            if self._pid != os.getpid():
+                self._forget_inherited_segment()
+            if self._file is None or self._size >= self.segment_bytes:
+                self._open_segment()
+
+            self._file.write(payload)
+            self._file.flush()
+            self._size += len(payload)
+            self._unsynced += len(rows)
+
+            if (
+                self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._fsync()
+
+    def sync(self) -> None:
+        """Force pending appends to disk."""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._fsync()
+
+    def seal(self) -> None:
+        """Close the active segment so the replayer can pick it up."""
+        with self._lock:
+            self._close_segment()
+
+    def close(self) -> None:
+        """Flush and close the spool (call on shutdown)."""
+        self.seal()
+
+    def _open_segment(self) -> None:
+        self._close_segment()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        while True:
+            self._seq += 1
+            path = self.directory / (
+                f"{SEGMENT_PREFIX}{int(time.time() * 1000):013d}-{self._pid}-{self._seq:06d}{SEGMENT_SUFFIX}"
+            )
+            file = open(path, "ab")
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            # A replayer may have locked and deleted the empty file first
+            if _is_same_file(file, path):
+                break
+            file.close()
+        self._file = file
+        self._path = path
+        self._size = 0
+
+    def _forget_inherited_segment(self) -> None:
+        """After fork: leave the parent's segment (and its lock) to the parent."""
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._path = None
+        self._size = 0
+        self._unsynced = 0
+        self._pid = os.getpid()
+
+    def _close_segment(self) -> None:
+        if self._file is None:
+            return
+        if self._unsynced:
+            self._fsync()
+        self._file.close()
+        self._file = None
+        self._path = None
+        self._size = 0
+
+    def _fsync(self) -> None:
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ----- Reading -----
+
+    def pending_segments(self) -> list[Path]:
+        """Sealed segments waiting for replay, oldest first."""
+        if not self.directory.exists():
+            return []
+        with self._lock:
+            active = self._path
+        return sorted(
+            p for p in self.directory.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+            if p != active
+        )
+
+    def has_pending(self) -> bool:
+        """True if anything is spooled (sealed or in the active segment)."""
+        with self._lock:
+            if self._size:
+                return True
+        return bool(self.pending_segments())
+
+    @staticmethod
+    @contextmanager
+    def claim_segment(path: Path) -> Iterator[bool]:
+        """
+        Exclusively lock a segment for replay, without blocking.
+
+        Yields False if the segment is gone or another process holds it
+        (still appending, or replaying it). Delete the segment before
+        leaving the block so no one appends to it afterwards.
+        """
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            yield False
+            return
+        try:
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            yield _is_same_file(file, path)
+        finally:
+            file.close()
+
+    @staticmethod
+    def read_segment(path: Path) -> Iterator[dict[str, Any]]:
+        """Yield rows from a segment, skipping a torn trailing line."""
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(f"[AUDIT] Skipping torn record at end of {path.name}")
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"[AUDIT] Skipping corrupt record in {path.name}")
+
+
+def _is_same_file(file: Any, path: Path) -> bool:
+    """True if `path` still names the open `file` (it was not deleted)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(file.fileno())
+    return (stat.st_dev, stat.st_ino) == (opened.st_dev, opened.st_ino)
+
+
+async def replay_spool(
+    spool: AuditSpool,
+    insert_rows: Callable[[list[dict[str, Any]]], Any],
+    batch_size: int = 500,
+) -> int:
+    """
+    Drain sealed spool segments through `insert_rows`.
+
+    Segments are deleted only after every batch in them was inserted.
+    Segments locked by another process are skipped. Stops at the first
+    failure so the remaining segments are retried later.
+
+    Args:
+        spool: The spool to drain
+        insert_rows: Async callable that inserts a list of audit rows
+        batch_size: Rows per insert call
+
+    Returns:
+        Number of rows replayed
+    """
+    # Seal the active segment so its rows become eligible for replay
+    await asyncio.to_thread(spool.seal)
+
+    replayed = 0
+    failed = False
+    for path in spool.pending_segments():
+        with spool.claim_segment(path) as claimed:
+            if not claimed:
+                continue
+            batch: list[dict[str, Any]] = []
+            try:
+                for row in spool.read_segment(path):
+                    batch.append(row)
+                    if len(batch) >= batch_size:
+                        await insert_rows(batch)
+                        replayed += len(batch)
+                        batch = []
+                if batch:
+                    await insert_rows(batch)
+                    replayed += len(batch)
+            except Exception as e:
+                logger.warning(f"[AUDIT] Spool replay paused at {path.name}: {e}")
+                failed = True
+            else:
+                path.unlink(missing_ok=True)
+        if failed:
+            break
+
+    if replayed:
+        logger.info(f"[AUDIT] Replayed {replayed} spooled audit events")
+    return replayed
+
+
+__all__ = [
+    "AuditSpool",
+    "replay_spool",
+]
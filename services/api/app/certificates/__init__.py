@@ -0,0 +1,18 @@
+"""Certificate package."""
+
+from app.certificates.eligibility import evaluate_eligibility, issue_certificates
+from app.certificates.files import pdf_path, pdf_paths, record_pdfs, unrendered_issues
+from app.certificates.pdf import PdfRenderPool, get_render_pool
+from app.certificates.render import render_certificate_html
+
+__all__ = [
+    "PdfRenderPool",
+    "evaluate_eligibility",
+    "get_render_pool",
+    "issue_certificates",
+    "pdf_path",
+    "pdf_paths",
+    "record_pdfs",
+    "render_certificate_html",
+    "unrendered_issues",
+]
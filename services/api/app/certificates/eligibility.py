@@ -0,0 +1,138 @@
+"""
+Certificate Eligibility
+
+Issues the certificates a batch of learners has earned with set-based SQL
+instead of a lookup per (user, course):
+
+- course: COMPLETED enrollments of courses with a certificateTemplateId
+- path: COMPLETED learning_path_enrollments of paths with a certificateId
+
+Each page is one INSERT ... SELECT that anti-joins certificate_issues, so
+it both evaluates eligibility and issues the missing certificates. Rows
+issued by a page are no longer eligible, so the next page simply repeats
+the statement until it returns fewer than a page.
+
+Issue ids are derived from (tenant, user, course/path) in SQL, so two
+evaluations racing over the same learners issue each certificate once
+(ON CONFLICT on the primary key).
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Literal, Optional, Sequence
+
+from sqlalchemy import text
+
+Scope = Literal["course", "path"]
+
+COURSE_ISSUE_SQL = """
+INSERT INTO certificate_issues (id, "tenantId", "userId", "courseId", "templateId", "issuedAt", "lastIssuedDate")
+SELECT md5('course:' || e."tenantId" || ':' || e."userId" || ':' || e."courseId")::uuid::text,
+       e."tenantId", e."userId", e."courseId", c."certificateTemplateId", :now, :now
+FROM enrollments e
+JOIN courses c ON c."tenantId" = e."tenantId" AND c.id = e."courseId" AND c."deletedAt" IS NULL
+JOIN certificate_templates t ON t."tenantId" = c."tenantId" AND t.id = c."certificateTemplateId"
+WHERE e."tenantId" = :tenant_id
+  AND e.status = 'COMPLETED'
+  AND e."deletedAt" IS NULL
+  AND (CAST(:target_ids AS text[]) IS NULL OR e."courseId" = ANY(CAST(:target_ids AS text[])))
+  AND (CAST(:user_ids AS text[]) IS NULL OR e."userId" = ANY(CAST(:user_ids AS text[])))
+  AND NOT EXISTS (
+      SELECT 1 FROM certificate_issues ci
+      WHERE ci."tenantId" = e."tenantId" AND ci."userId" = e."userId" AND ci."courseId" = e."courseId"
+  )
+ORDER BY e."courseId", e."userId"
+LIMIT :limit
+ON CONFLICT (id) DO NOTHING
+RETURNING id, "userId", "courseId"
+"""
+
+PATH_ISSUE_SQL = """
+INSERT INTO certificate_issues (id, "tenantId", "userId", "pathId", "templateId", "issuedAt", "lastIssuedDate")
+SELECT md5('path:' || pe."tenantId" || ':' || pe."userId" || ':' || pe."pathId")::uuid::text,
+       pe."tenantId", pe."userId", pe."pathId", lp."certificateId", :now, :now
+FROM learning_path_enrollments pe
+JOIN learning_paths lp ON lp."tenantId" = pe."tenantId" AND lp.id = pe."pathId" AND lp."deletedAt" IS NULL
+JOIN certificate_templates t ON t."tenantId" = lp."tenantId" AND t.id = lp."certificateId"
+WHERE pe."tenantId" = :tenant_id
+  AND pe.status = 'COMPLETED'
+  AND (CAST(:target_ids AS text[]) IS NULL OR pe."pathId" = ANY(CAST(:target_ids AS text[])))
+  AND (CAST(:user_ids AS text[]) IS NULL OR pe."userId" = ANY(CAST(:user_ids AS text[])))
+  AND NOT EXISTS (
+      SELECT 1 FROM certificate_issues ci
+      WHERE ci."tenantId" = pe."tenantId" AND ci."userId" = pe."userId" AND ci."pathId" = pe."pathId"
+  )
+ORDER BY pe."pathId", pe."userId"
+LIMIT :limit
+ON CONFLICT (id) DO NOTHING
+RETURNING id, "userId", "pathId"
+"""
+
+ISSUE_SQL = {"course": COURSE_ISSUE_SQL, "path": PATH_ISSUE_SQL}
+
+
+async def issue_certificates(
+    conn: Any,
+    tenant_id: str,
+    scope: Scope,
+    target_ids: Optional[Sequence[str]] = None,
+    user_ids: Optional[Sequence[str]] = None,
+    limit: int = 1000,
+    now: Optional[datetime] = None,
+) -> list[tuple[str, str, str]]:
+    """
+    Issue up to `limit` missing certificates in one statement.
+
+    Args:
+        scope: "course" or "path"
+        target_ids: Courses/paths to evaluate (None: all of the tenant's)
+        user_ids: Learners to evaluate (None: everyone)
+
+    Returns:
+        (issue id, user id, course/path id) of the certificates issued
+    """
+    result = await conn.execute(
+        text(ISSUE_SQL[scope]),
+        {
+            "tenant_id": tenant_id,
+            "target_ids": list(target_ids) if target_ids is not None else None,
+            "user_ids": list(user_ids) if user_ids is not None else None,
+            "limit": limit,
+            "now": (now or datetime.now(timezone.utc)).replace(tzinfo=None),
+        },
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def evaluate_eligibility(
+    engine: Any,
+    tenant_id: str,
+    scope: Scope,
+    target_ids: Optional[Sequence[str]] = None,
+    user_ids: Optional[Sequence[str]] = None,
+    batch_size: int = 1000,
+    on_batch: Optional[Callable[[list[tuple[str, str, str]]], Awaitable[None]]] = None,
+) -> int:
+    """
+    Issue every missing certificate of a scope, one committed page at a time.
+
+    Args:
+        on_batch: Awaited with each committed page of issued certificates
+
+    Returns:
+        Number of certificates issued
+    """
+    issued = 0
+    while True:
+        async with engine.begin() as conn:
+            page = await issue_certificates(conn, tenant_id, scope, target_ids, user_ids, batch_size)
+        issued += len(page)
+        if page and on_batch is not None:
+            await on_batch(page)
+        if len(page) < batch_size:
+            return issued
+
+
+__all__ = [
+    "evaluate_eligibility",
+    "issue_certificates",
+]
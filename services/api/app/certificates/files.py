@@ -0,0 +1,119 @@
+"""
+Certificate PDF Index
+
+PDF files are content-addressed (app.certificates.pdf), so the file of an
+issue cannot be found from the issue alone without rendering its HTML
+again. Every render records the issue's content hash and path in
+certificate_pdfs (alembic/versions/009_certificate_pdfs.py):
+
+    certificate_pdfs (issue_id PK, tenant_id, pdf_key, path, rendered_at)
+
+A re-render after a template or data change overwrites the row with the
+new file. Issues with no row have not been rendered yet; rendering is
+queued only after the issue is committed, so `unrendered_issues` lets the
+certificate tasks re-queue issues whose render was never queued.
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+
+PDFS_TABLE = "certificate_pdfs"
+
+RECORD_SQL = f"""
+INSERT INTO "{PDFS_TABLE}" (issue_id, tenant_id, pdf_key, path, rendered_at)
+SELECT i.issue_id, :tenant_id, i.pdf_key, i.path, :now
+FROM unnest(CAST(:issue_ids AS text[]), CAST(:keys AS text[]), CAST(:paths AS text[])) AS i(issue_id, pdf_key, path)
+ON CONFLICT (issue_id) DO UPDATE
+SET pdf_key = EXCLUDED.pdf_key, path = EXCLUDED.path, rendered_at = EXCLUDED.rendered_at
+"""
+
+LOOKUP_SQL = f"""
+SELECT issue_id, path FROM "{PDFS_TABLE}" WHERE tenant_id = :tenant_id AND issue_id = ANY(CAST(:issue_ids AS text[]))
+"""
+
+# Issues of some courses or paths (and learners) without a recorded PDF, keyset-paged by id
+UNRENDERED_SQL = f"""
+SELECT ci.id FROM certificate_issues ci
+WHERE ci."tenantId" = :tenant_id
+  AND ci."{{column}}" = ANY(CAST(:target_ids AS text[]))
+  AND (CAST(:user_ids AS text[]) IS NULL OR ci."userId" = ANY(CAST(:user_ids AS text[])))
+  AND ci.id > :after
+  AND NOT EXISTS (SELECT 1 FROM "{PDFS_TABLE}" p WHERE p.issue_id = ci.id)
+ORDER BY ci.id
+LIMIT :limit
+"""
+
+_SCOPE_COLUMNS = {"course": "courseId", "path": "pathId"}
+
+
+def _key(path: str) -> str:
+    """Content hash of a PDF path ({dir}/{tenant}/{key[:2]}/{key}.pdf)."""
+    return os.path.basename(path).removesuffix(".pdf")
+
+
+async def record_pdfs(conn: Any, tenant_id: str, paths: Mapping[str, str], now: datetime) -> None:
+    """Record the rendered PDF of each issue (issue id -> path)."""
+    if not paths:
+        return
+    issue_ids = list(paths)
+    await conn.execute(text(RECORD_SQL), {
+        "tenant_id": tenant_id,
+        "issue_ids": issue_ids,
+        "keys": [_key(paths[issue_id]) for issue_id in issue_ids],
+        "paths": [paths[issue_id] for issue_id in issue_ids],
+        "now": now,
+    })
+
+
+async def pdf_paths(conn: Any, tenant_id: str, issue_ids: Sequence[str]) -> dict[str, str]:
+    """PDF path of each rendered issue among `issue_ids`."""
+    if not issue_ids:
+        return {}
+    result = await conn.execute(text(LOOKUP_SQL), {"tenant_id": tenant_id, "issue_ids": list(issue_ids)})
+    return dict(result.all())
+
+
+async def pdf_path(conn: Any, tenant_id: str, issue_id: str) -> Optional[str]:
+    return (await pdf_paths(conn, tenant_id, [issue_id])).get(issue_id)
+
+
+async def unrendered_issues(
+    conn: Any,
+    tenant_id: str,
+    scope: str,
+    target_ids: Sequence[str],
+    user_ids: Optional[Sequence[str]] = None,
+    after: str = "",
+    limit: int = 1000,
+) -> list[str]:
+    """
+    Ids of issues of the given courses/paths that have no recorded PDF.
+
+    Args:
+        scope: "course" or "path"
+        user_ids: Limit to these learners (None: everyone)
+        after: Issue id of the previous page's last row
+    """
+    result = await conn.execute(
+        text(UNRENDERED_SQL.format(column=_SCOPE_COLUMNS[scope])),
+        {
+            "tenant_id": tenant_id,
+            "target_ids": list(target_ids),
+            "user_ids": list(user_ids) if user_ids is not None else None,
+            "after": after,
+            "limit": limit,
+        },
+    )
+    return [row[0] for row in result.all()]
+
+
+__all__ = [
+    "PDFS_TABLE",
+    "pdf_path",
+    "pdf_paths",
+    "record_pdfs",
+    "unrendered_issues",
+]
@@ -0,0 +1,168 @@
+"""
+Certificate PDF Rendering Pool
+
+HTML to PDF conversion is CPU-bound and its startup (interpreter, WeasyPrint
+import, font discovery) costs more than a typical certificate. Each worker
+keeps one warm pool of CERTIFICATE_RENDER_WORKERS processes: every process
+imports the renderer and renders a warm-up page once, then serves batches.
+
+Outputs are content-addressed: the file name is the hash of the renderer
+version and the rendered HTML, which is a function of the template version
+and the issue's tag data. A document whose hash already has a file is not
+rendered again, and identical documents in a batch are rendered once.
+
+    {CERTIFICATE_STORAGE_DIR}/{tenant}/{hash[:2]}/{hash}.pdf
+
+The pool uses spawned processes, so the certificate queue gets its own
+Celery worker with the threads or solo pool, and the render pool provides
+the parallelism (see "Running Workers" in the README). Prefork children are
+daemonic and cannot start processes: a certificate task that lands in one
+renders inline instead, on a renderer warmed once per child.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Mapping, Optional
+
+from app.config import get_settings
+
+# Part of the content address: bump when output for the same HTML changes
+RENDERER_VERSION = "weasyprint-1"
+
+WARMUP_HTML = "<html><body><p>Certificate</p></body></html>"
+
+Renderer = Callable[[str], bytes]
+
+_renderer: Optional[Renderer] = None
+
+
+def html_to_pdf(html: str) -> bytes:
+    from weasyprint import HTML
+
+    return HTML(string=html).write_pdf()
+
+
+def _init_worker(renderer: Renderer) -> None:
+    global _renderer
+    _renderer = renderer
+    renderer(WARMUP_HTML)
+
+
+def _render_to(job: tuple[str, str]) -> str:
+    """Render one document in a pool process and write it atomically."""
+    html, path = job
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_renderer(html))
+    os.replace(tmp_path, path)
+    return path
+
+
+def pdf_key(html: str) -> str:
+    return hashlib.sha256(f"{RENDERER_VERSION}\0{html}".encode()).hexdigest()
+
+
+@dataclass
+class RenderResult:
+    paths: dict[str, str] = field(default_factory=dict)  # document id -> PDF path
+    rendered: int = 0
+    reused: int = 0
+
+
+class PdfRenderPool:
+    """
+    Warm renderer processes writing to content-addressed storage.
+
+    With workers=0 documents are rendered inline in the calling process.
+    """
+
+    def __init__(self, workers: int, storage_dir: str, renderer: Renderer = html_to_pdf):
+        self.workers = workers
+        self.storage_dir = storage_dir
+        self._renderer = renderer
+        self._executor = None
+        if workers:
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(renderer,),
+            )
+
+    def path_for(self, tenant_id: str, html: str) -> str:
+        key = pdf_key(html)
+        return os.path.join(self.storage_dir, tenant_id, key[:2], f"{key}.pdf")
+
+    def render(self, tenant_id: str, documents: Mapping[str, str]) -> RenderResult:
+        """
+        Write the PDFs of a batch of documents.
+
+        Args:
+            documents: HTML by document (certificate issue) id
+        """
+        result = RenderResult()
+        pending: dict[str, str] = {}  # path -> html
+        for document_id, html in documents.items():
+            path = self.path_for(tenant_id, html)
+            result.paths[document_id] = path
+            if path not in pending and not os.path.exists(path):
+                pending[path] = html
+
+        jobs = [(html, path) for path, html in pending.items()]
+        if self._executor is None:
+            if jobs and _renderer is not self._renderer:
+                _init_worker(self._renderer)
+            for job in jobs:
+                _render_to(job)
+        else:
+            chunksize = max(1, len(jobs) // (self.workers * 4))
+            for _ in self._executor.map(_render_to, jobs, chunksize=chunksize):
+                pass
+        result.rendered = len(pending)
+        result.reused = len(documents) - len(pending)
+        return result
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+_pool_lock = threading.Lock()
+
+
+@lru_cache
+def _build_render_pool() -> PdfRenderPool:
+    settings = get_settings()
+    if multiprocessing.current_process().daemon:
+        return PdfRenderPool(0, settings.certificate_storage_dir)
+    return PdfRenderPool(settings.certificate_render_workers or os.cpu_count() or 1, settings.certificate_storage_dir)
+
+
+def get_render_pool() -> PdfRenderPool:
+    """The worker process's render pool (started on first use; inline in daemonic processes)."""
+    with _pool_lock:
+        return _build_render_pool()
+
+
+def reset_render_pool() -> None:
+    """Drop the pool, e.g. after a renderer process died (BrokenProcessPool)."""
+    with _pool_lock:
+        if _build_render_pool.cache_info().currsize:
+            _build_render_pool().close()
+        _build_render_pool.cache_clear()
+
+
+__all__ = [
+    "PdfRenderPool",
+    "RenderResult",
+    "get_render_pool",
+    "html_to_pdf",
+    "pdf_key",
+    "reset_render_pool",
+]
@@ -0,0 +1,79 @@
+"""
+Certificate Rendering
+
+Renders the HTML of a batch of certificate issues: one query for the
+issues, cached compiled templates (app.rendering.templates) and one
+smart-tag query for the whole batch, then a join per certificate.
+
+Besides the shared smart tags, certificates get issue_date/issueDate,
+expiry_date/expiryDate and certificate_id/certificateId.
+"""
+
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.rendering.smart_tags import RenderContext, resolve_smart_tags
+from app.rendering.templates import load_templates
+
+DATE_FORMAT = "%B %d, %Y"
+
+
+def _issue_values(issue: Any) -> dict[str, Optional[str]]:
+    issued = issue["issuedAt"].strftime(DATE_FORMAT) if issue["issuedAt"] else None
+    expires = issue["expiresAt"].strftime(DATE_FORMAT) if issue["expiresAt"] else None
+    return {
+        "issue_date": issued,
+        "issueDate": issued,
+        "expiry_date": expires,
+        "expiryDate": expires,
+        "certificate_id": issue["id"],
+        "certificateId": issue["id"],
+    }
+
+
+async def render_certificate_html(
+    conn: Any,
+    tenant_id: str,
+    issue_ids: Sequence[str],
+    base_url: str,
+) -> dict[str, str]:
+    """
+    HTML by certificate issue id.
+
+    Issues that do not exist for the tenant, or whose template is gone,
+    are left out.
+    """
+    result = await conn.execute(
+        text(
+            'SELECT id, "userId", "courseId", "pathId", "templateId", "issuedAt", "expiresAt" '
+            'FROM certificate_issues WHERE "tenantId" = :tenant_id AND id = ANY(:ids)'
+        ),
+        {"tenant_id": tenant_id, "ids": list(issue_ids)},
+    )
+    issues = result.mappings().all()
+    templates = await load_templates(conn, "certificate", tenant_id, [issue["templateId"] for issue in issues])
+    issues = [issue for issue in issues if issue["templateId"] in templates]
+    if not issues:
+        return {}
+
+    tags = frozenset().union(*(templates[issue["templateId"]].tags for issue in issues))
+    contexts = [
+        RenderContext(
+            user_id=issue["userId"],
+            course_id=issue["courseId"],
+            path_id=issue["pathId"],
+            values=_issue_values(issue),
+        )
+        for issue in issues
+    ]
+    values = await resolve_smart_tags(conn, tenant_id, contexts, tags, base_url)
+    return {
+        issue["id"]: templates[issue["templateId"]].fields["htmlBody"].render(issue_values)
+        for issue, issue_values in zip(issues, values)
+    }
+
+
+__all__ = [
+    "render_certificate_html",
+]
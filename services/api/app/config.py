@@ -41,7 +41,74 @@ class Settings(BaseSettings):
     cookie_secure: bool = False  # Set True in production
     cookie_samesite: Literal["lax", "strict", "none"] = "lax"
     cookie_httponly: bool = True
-
+    
+    # Audit log disk spool (fallback when auth_audit_log inserts fail)
+    audit_spool_dir: str = "var/audit-spool"
+    audit_spool_segment_bytes: int = 16 * 1024 * 1024
+    audit_spool_fsync_every: int = 64
+    audit_spool_replay_seconds: int = 30
+    audit_max_pending_writes: int = 1000
+    
+    # Audit metadata: "diff" stores only changed keys instead of before/after
+    audit_snapshot_mode: Literal["full", "diff"] = "full"
+    audit_metadata_max_bytes: int = 32 * 1024
+    
+    # auth_audit_log partitions (monthly)
+    audit_retention_months: int = 13
+    audit_partitions_ahead: int = 3
+    audit_tenant_hash_partitions: int = 0
+    
+    # Materialized report rollups (refreshed by Celery beat)
+    dashboard_stats_refresh_seconds: int = 300
+    activity_refresh_days: int = 3
+    activity_login_refresh_seconds: int = 900
+    
+    # Generated report files (local storage)
+    report_storage_dir: str = "var/reports"
+    report_chunk_size: int = 5000
+    report_cache_ttl_seconds: int = 3600  # keep <= Celery result_expires
+    report_artifact_retention_seconds: int = 7200  # files deleted after; keep >= cache TTL and result_expires
+    
+    # Bulk CSV imports
+    import_batch_size: int = 2000
+    import_hash_workers: int = 4
+    import_results_dir: str = "var/imports"
+    
+    # POST /api/enrollments/bulk
+    enrollment_bulk_chunk_size: int = 1000  # rows per INSERT statement
+    enrollment_bulk_max_pairs: int = 50000  # users x courses per request
+    
+    # Public URL of the web app (links in emails and certificates)
+    app_base_url: str = "http://localhost:3000"
+    
+    # Outgoing email
+    email_transport: Literal["stub", "smtp"] = "stub"  # stub only logs
+    email_from: str = "no-reply@localhost"
+    email_batch_size: int = 500  # recipients per send_email_batch task
+    email_max_attempts: int = 3  # per recipient, across batch retries
+    smtp_host: str = "localhost"
+    smtp_port: int = 587
+    smtp_username: str | None = None
+    smtp_password: str | None = None
+    smtp_starttls: bool = True
+    smtp_timeout_seconds: int = 30
+    
+    # In-app notifications
+    notification_batch_size: int = 1000  # rows per notify_batch task / INSERT
+    
+    # Certificates
+    certificate_issue_batch_size: int = 1000  # certificates issued per INSERT
+    certificate_render_batch_size: int = 50  # issues per certificate_generate_pdfs task
+    certificate_render_workers: int = 0  # PDF renderer processes per worker; 0 = one per core
+    certificate_storage_dir: str = "var/certificates"
+    
+    # Gamification
+    gamification_badge_check_delay_seconds: int = 10  # awards in this window share one badge check
+    
+    # Activity timeline (Redis-buffered, written in batches)
+    timeline_flush_batch_size: int = 500  # events per INSERT
+    timeline_flush_seconds: float = 5.0  # Celery beat flush of a partial batch
+    timeline_flush_max_batches: int = 50  # batches per timeline_flush task
     
     @property
     def is_production(self) -> bool:
@@ -0,0 +1,34 @@
+"""
+Redis Clients
+
+Shared Redis connections (REDIS_URL) for caches and job state.
+
+The API uses the asyncio client. Celery tasks use the blocking client:
+each task runs its coroutines on a fresh event loop (see app.jobs.runtime),
+so an asyncio connection pool cannot outlive a single task.
+"""
+
+from functools import lru_cache
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import get_settings
+
+
+@lru_cache
+def get_redis() -> aioredis.Redis:
+    """Asyncio Redis client for request handlers."""
+    return aioredis.from_url(get_settings().redis_url, decode_responses=True)
+
+
+@lru_cache
+def get_sync_redis() -> redis.Redis:
+    """Blocking Redis client for Celery tasks."""
+    return redis.Redis.from_url(get_settings().redis_url, decode_responses=True)
+
+
+__all__ = [
+    "get_redis",
+    "get_sync_redis",
+]
@@ -0,0 +1,181 @@
+"""
+Precompiled Row Serializers
+
+Each serializer is declared once per response shape as a list of
+(output key, model column[, converter]) pairs and compiled into:
+- `columns`: the column projection, usable directly in select()
+- `row(tuple)`: builds the response dict from a row tuple
+- `entity(obj)`: builds the same dict from an ORM instance
+
+Values are passed through untouched (datetimes, enums, UUIDs) and encoded
+natively by ORJSONResponse; converters are only needed for types orjson
+cannot encode the way the API expects (e.g. Decimal scores -> float).
+"""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from app.db.models import Branch, Course, Enrollment, User
+
+
+class RowSerializer:
+    """Compiled mapping from a row tuple to a response dict."""
+
+    __slots__ = ("keys", "columns", "_converters", "_getter")
+
+    def __init__(self, *fields: tuple):
+        self.keys: tuple[str, ...] = tuple(f[0] for f in fields)
+        self.columns: tuple[Any, ...] = tuple(f[1] for f in fields)
+        self._converters: tuple[tuple[int, Callable[[Any], Any]], ...] = tuple(
+            (i, f[2]) for i, f in enumerate(fields) if len(f) > 2 and f[2] is not None
+        )
+        self._getter = attrgetter(*(column.key for column in self.columns))
+
+    def row(self, values: Sequence[Any]) -> dict[str, Any]:
+        """Build the response dict from a row tuple in `columns` order."""
+        if self._converters:
+            values = list(values)
+            for index, convert in self._converters:
+                value = values[index]
+                if value is not None:
+                    values[index] = convert(value)
+        return dict(zip(self.keys, values))
+
+    def rows(self, rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+        """Serialize many row tuples."""
+        row = self.row
+        return [row(values) for values in rows]
+
+    def entity(self, obj: Any) -> Optional[dict[str, Any]]:
+        """Build the response dict from an ORM instance (None passes through)."""
+        if obj is None:
+            return None
+        values = self._getter(obj)
+        if len(self.keys) == 1:
+            values = (values,)
+        return self.row(values)
+
+    def entities(self, objs: Iterable[Any]) -> list[dict[str, Any]]:
+        """Serialize many ORM instances."""
+        entity = self.entity
+        return [entity(obj) for obj in objs]
+
+
+# ============= Course =============
+
+COURSE_LIST = RowSerializer(
+    ("id", Course.id),
+    ("code", Course.code),
+    ("title", Course.title),
+    ("description", Course.description),
+    ("status", Course.status),
+    ("isActive", Course.is_active),
+    ("hiddenFromCatalog", Course.hidden_from_catalog),
+    ("thumbnail_url", Course.thumbnail_url),
+    ("categoryId", Course.category_id),
+    ("createdAt", Course.created_at),
+)
+
+COURSE_DETAIL = RowSerializer(
+    ("id", Course.id),
+    ("code", Course.code),
+    ("title", Course.title),
+    ("description", Course.description),
+    ("status", Course.status),
+    ("isActive", Course.is_active),
+    ("hiddenFromCatalog", Course.hidden_from_catalog),
+    ("thumbnail_url", Course.thumbnail_url),
+    ("categoryId", Course.category_id),
+    ("instructorId", Course.instructor_id),
+    ("createdAt", Course.created_at),
+    ("updatedAt", Course.updated_at),
+)
+
+COURSE_SUMMARY = RowSerializer(
+    ("id", Course.id),
+    ("code", Course.code),
+    ("title", Course.title),
+    ("description", Course.description),
+    ("thumbnail_url", Course.thumbnail_url),
+    ("status", Course.status),
+)
+
+
+# ============= User =============
+
+USER_LIST = RowSerializer(
+    ("id", User.id),
+    ("username", User.username),
+    ("email", User.email),
+    ("firstName", User.first_name),
+    ("lastName", User.last_name),
+    ("status", User.status),
+    ("role", User.role),
+    ("isActive", User.is_active),
+    ("nodeId", User.node_id),
+    ("createdAt", User.created_at),
+)
+
+USER_DETAIL = RowSerializer(
+    ("id", User.id),
+    ("username", User.username),
+    ("email", User.email),
+    ("firstName", User.first_name),
+    ("lastName", User.last_name),
+    ("bio", User.bio),
+    ("timezone", User.timezone),
+    ("language", User.language),
+    ("status", User.status),
+    ("role", User.role),
+    ("isActive", User.is_active),
+    ("isVerified", User.is_verified),
+    ("nodeId", User.node_id),
+    ("createdAt", User.created_at),
+    ("lastLoginAt", User.last_login_at),
+)
+
+
+# ============= Branch =============
+
+BRANCH_DETAIL = RowSerializer(
+    ("id", Branch.id),
+    ("tenantId", Branch.tenant_id),
+    ("name", Branch.name),
+    ("slug", Branch.slug),
+    ("title", Branch.title),
+    ("description", Branch.description),
+    ("isActive", Branch.is_active),
+    ("defaultLanguage", Branch.default_language),
+    ("settings", Branch.settings),
+    ("createdAt", Branch.created_at),
+    ("updatedAt", Branch.updated_at),
+)
+
+
+# ============= Enrollment =============
+
+ENROLLMENT_LIST = RowSerializer(
+    ("id", Enrollment.id),
+    ("userId", Enrollment.user_id),
+    ("courseId", Enrollment.course_id),
+    ("status", Enrollment.status),
+    ("progress", Enrollment.progress),
+    ("score", Enrollment.score, float),
+    ("startedAt", Enrollment.started_at),
+    ("completedAt", Enrollment.completed_at),
+    ("createdAt", Enrollment.created_at),
+)
+
+
+__all__ = [
+    "RowSerializer",
+    "COURSE_LIST",
+    "COURSE_DETAIL",
+    "COURSE_SUMMARY",
+    "USER_LIST",
+    "USER_DETAIL",
+    "BRANCH_DETAIL",
+    "ENROLLMENT_LIST",
+]
@@ -64,6 +64,17 @@ class NodeScopeError(AppError):
         )
 
 
+class ForbiddenError(AppError):
+    """Access to a specific resource denied."""
+    
+    def __init__(self, message: str = "Access denied"):
+        super().__init__(
+            message=message,
+            error_code="FORBIDDEN",
+            status_code=403,
+        )
+
+
 class NotFoundError(AppError):
     """Resource not found error."""
     
@@ -0,0 +1,25 @@
+"""Gamification package."""
+
+from app.gamification.leaderboard import (
+    leaderboard_key,
+    leaderboard_settings,
+    rebuild_leaderboards,
+    top_scores,
+    update_score,
+    user_rank,
+)
+from app.gamification.ledger import PointsSummary, award_points, check_badges, get_points, rebuild_points
+
+__all__ = [
+    "PointsSummary",
+    "award_points",
+    "check_badges",
+    "get_points",
+    "leaderboard_key",
+    "leaderboard_settings",
+    "rebuild_leaderboards",
+    "rebuild_points",
+    "top_scores",
+    "update_score",
+    "user_rank",
+]
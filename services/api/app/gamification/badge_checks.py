@@ -0,0 +1,49 @@
+"""
+Badge Check Coalescing
+
+A learner finishing many units in a short time earns many point awards,
+but their badges only need evaluating once the burst is over. Awards do
+not queue a badge check each; the first award sets a per-user pending
+marker in Redis and queues one check GAMIFICATION_BADGE_CHECK_DELAY_SECONDS
+later, and awards that find the marker set queue nothing:
+
+- gamification:badge-check:<tenant>:<user>  set NX by the first award
+
+The check clears the marker before it reads the user's total, so an award
+committed while a check runs schedules a new one rather than being
+missed. The marker expires on its own if the queued check is lost.
+"""
+
+from typing import Any
+
+PENDING_KEY = "gamification:badge-check:{tenant_id}:{user_id}"
+
+# Marker lifetime beyond the delay, should the queued check never run
+PENDING_GRACE_SECONDS = 300
+
+
+def pending_key(tenant_id: str, user_id: str) -> str:
+    return PENDING_KEY.format(tenant_id=tenant_id, user_id=user_id)
+
+
+def mark_check_pending(redis: Any, tenant_id: str, user_id: str, delay_seconds: int) -> bool:
+    """
+    Set the user's pending marker (blocking client).
+
+    Returns:
+        True if the caller should queue the check, False if one is pending
+    """
+    return bool(redis.set(
+        pending_key(tenant_id, user_id), 1, nx=True, ex=delay_seconds + PENDING_GRACE_SECONDS,
+    ))
+
+
+def clear_check_pending(redis: Any, tenant_id: str, user_id: str) -> None:
+    redis.delete(pending_key(tenant_id, user_id))
+
+
+__all__ = [
+    "clear_check_pending",
+    "mark_check_pending",
+    "pending_key",
+]
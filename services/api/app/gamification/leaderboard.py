@@ -0,0 +1,175 @@
+"""
+Leaderboards
+
+Points leaderboards live in Redis sorted sets, one per tenant and one per
+tenant branch (the user's node):
+
+- leaderboard:<tenant>:all
+- leaderboard:<tenant>:branch:<branch id>
+
+Members are user ids scored with their running total from user_points
+(app.gamification.ledger). Awards set the absolute total, not an
+increment, with ZADD GT: two awards for one user can reach Redis in either
+order, and GT keeps the higher (newer) total, so retries and reordered
+updates cannot move a score backwards. A total that really falls (a
+negative award or ledger correction) therefore only shows after the next
+rebuild. Top-N is a ZREVRANGE and "my rank" a ZREVRANK, both O(log n).
+
+Boards are served only while gamification and the leaderboard are
+enabled in gamification_settings; a branch's row overrides the tenant-wide
+one (branchId NULL), and a tenant without settings gets the defaults
+(both on).
+
+The sets are derived data: rebuild_leaderboards reseeds a tenant from
+user_points (the ledger's per-user sums) into fresh keys and swaps them
+in, which also drops users who moved branch or were deleted. An award
+landing mid-rebuild may be reverted to the snapshot until that user's
+next award.
+"""
+
+import uuid
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text
+
+KEY = "leaderboard:{tenant_id}:{scope}"
+
+REBUILD_PAGE_SIZE = 5000
+REBUILD_TTL_SECONDS = 3600  # staging keys of an interrupted rebuild
+
+BRANCH_SQL = """
+SELECT node_id FROM users WHERE "tenantId" = :tenant_id AND id = :user_id
+"""
+
+SEED_SQL = """
+SELECT s.user_id, s.total_points, u.node_id
+FROM user_points s
+JOIN users u ON u."tenantId" = s.tenant_id AND u.id = s.user_id AND u."deletedAt" IS NULL
+WHERE s.tenant_id = :tenant_id AND s.user_id > :after
+ORDER BY s.user_id
+LIMIT :limit
+"""
+
+SETTINGS_SQL = """
+SELECT enabled, "leaderboardEnabled" FROM gamification_settings
+WHERE "tenantId" = :tenant_id AND ("branchId" IS NULL OR "branchId" = :branch_id)
+ORDER BY "branchId" IS NULL
+LIMIT 1
+"""
+
+PROFILES_SQL = """
+SELECT id, "firstName", "lastName", avatar FROM users WHERE "tenantId" = :tenant_id AND id = ANY(:ids)
+"""
+
+
+def leaderboard_key(tenant_id: str, branch_id: Optional[str] = None) -> str:
+    return KEY.format(tenant_id=tenant_id, scope=f"branch:{branch_id}" if branch_id else "all")
+
+
+async def user_branch(conn: Any, tenant_id: str, user_id: str) -> Optional[str]:
+    result = await conn.execute(text(BRANCH_SQL), {"tenant_id": tenant_id, "user_id": user_id})
+    return result.scalar()
+
+
+async def leaderboard_settings(conn: Any, tenant_id: str, branch_id: Optional[str]) -> tuple[bool, bool]:
+    """(gamification enabled, leaderboard enabled) for the tenant board or a branch's."""
+    result = await conn.execute(text(SETTINGS_SQL), {"tenant_id": tenant_id, "branch_id": branch_id})
+    row = result.first()
+    return (bool(row[0]), bool(row[1])) if row is not None else (True, True)
+
+
+def update_score(redis: Any, tenant_id: str, branch_id: Optional[str], user_id: str, total_points: int) -> None:
+    """Raise a user's score on the tenant board and their branch's to `total_points` (blocking client)."""
+    pipe = redis.pipeline(transaction=False)
+    pipe.zadd(leaderboard_key(tenant_id), {user_id: total_points}, gt=True)
+    if branch_id:
+        pipe.zadd(leaderboard_key(tenant_id, branch_id), {user_id: total_points}, gt=True)
+    pipe.execute()
+
+
+async def top_scores(redis: Any, tenant_id: str, branch_id: Optional[str], limit: int) -> list[tuple[str, int]]:
+    """(user id, points) of the top `limit` users, best first."""
+    entries = await redis.zrevrange(leaderboard_key(tenant_id, branch_id), 0, limit - 1, withscores=True)
+    return [(user_id, int(score)) for user_id, score in entries]
+
+
+async def user_rank(redis: Any, tenant_id: str, branch_id: Optional[str], user_id: str) -> dict[str, Any]:
+    """1-based rank (None if unranked), points and board size for one user."""
+    key = leaderboard_key(tenant_id, branch_id)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.zrevrank(key, user_id)
+        pipe.zscore(key, user_id)
+        pipe.zcard(key)
+        rank, score, total = await pipe.execute()
+    return {
+        "rank": rank + 1 if rank is not None else None,
+        "points": int(score) if score is not None else 0,
+        "total": total,
+    }
+
+
+async def user_profiles(conn: Any, tenant_id: str, user_ids: Sequence[str]) -> dict[str, dict[str, Any]]:
+    if not user_ids:
+        return {}
+    result = await conn.execute(text(PROFILES_SQL), {"tenant_id": tenant_id, "ids": list(user_ids)})
+    return {
+        row[0]: {"firstName": row[1], "lastName": row[2], "avatar": row[3]}
+        for row in result.all()
+    }
+
+
+async def rebuild_leaderboards(conn: Any, redis: Any, tenant_id: str, page_size: int = REBUILD_PAGE_SIZE) -> int:
+    """
+    Reseed a tenant's boards from user_points and swap them in.
+
+    Args:
+        conn: AsyncConnection
+        redis: Blocking Redis client
+
+    Returns:
+        Users ranked
+    """
+    staging = f"leaderboard-rebuild:{uuid.uuid4().hex}:"
+    built: set[str] = set()
+    after, ranked = "", 0
+
+    while True:
+        result = await conn.execute(text(SEED_SQL), {"tenant_id": tenant_id, "after": after, "limit": page_size})
+        rows = result.all()
+        if not rows:
+            break
+        boards: dict[str, dict[str, int]] = {}
+        for user_id, points, branch_id in rows:
+            boards.setdefault(leaderboard_key(tenant_id), {})[user_id] = points
+            if branch_id:
+                boards.setdefault(leaderboard_key(tenant_id, branch_id), {})[user_id] = points
+        pipe = redis.pipeline(transaction=False)
+        for key, scores in boards.items():
+            pipe.zadd(staging + key, scores)
+            pipe.expire(staging + key, REBUILD_TTL_SECONDS)
+        pipe.execute()
+        built.update(boards)
+        ranked += len(rows)
+        after = rows[-1][0]
+
+    stale = set(redis.scan_iter(match=KEY.format(tenant_id=tenant_id, scope="*"))) - built
+    pipe = redis.pipeline(transaction=True)
+    for key in built:
+        pipe.rename(staging + key, key)
+        pipe.persist(key)
+    if stale:
+        pipe.delete(*stale)
+    pipe.execute()
+    return ranked
+
+
+__all__ = [
+    "leaderboard_key",
+    "leaderboard_settings",
+    "rebuild_leaderboards",
+    "top_scores",
+    "update_score",
+    "user_branch",
+    "user_profiles",
+    "user_rank",
+]
@@ -0,0 +1,216 @@
+"""
+Points Ledger
+
+points_ledger stays the append-only record of every award; `user_points`
+keeps each user's running total and level next to it so badge checks and
+leaderboards read one row instead of SUM(points) over the user's history.
+
+- award_points inserts the ledger row and upserts the summary in a single
+  statement (a data-modifying CTE), so the two can never disagree. The
+  ledger id is derived from the award's idempotency key (the Celery task
+  id), so a retried award is a no-op rather than a double credit.
+- The level is the highest `levels` row whose pointsRequired the new
+  total reaches, resolved in the same statement.
+- check_badges awards, with one INSERT ... SELECT, every badge whose
+  criteria {"type": "points", "threshold": N} the summary total reaches.
+- rebuild_points recomputes summaries from the ledger for a tenant (or
+  some of its users) with one GROUP BY; run it after editing levels or
+  correcting ledger rows (gamification_recalculate).
+
+An award committing between the rebuild's snapshot and its upsert would
+be overwritten by the stale sum, so the two are serialized per tenant
+with a transaction-level advisory lock: every award holds it shared (taken
+inside its statement, so awards never wait on each other), and the rebuild
+takes it exclusively before summing. The rebuild therefore sees every
+committed award, and awards arriving meanwhile add to the rebuilt total.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import text
+
+POINTS_TABLE = "user_points"
+BADGES_TABLE = "user_badges"
+
+# Highest level reached by `total` (0 below the first level)
+_LEVEL_SQL = """
+COALESCE((
+    SELECT max(l."levelNumber") FROM levels l
+    WHERE l."tenantId" = {tenant} AND l."pointsRequired" <= {total}
+), 0)
+"""
+
+# Per-tenant advisory lock key shared by awards and rebuilds
+_LOCK_KEY = "hashtext('user_points'), hashtext(:tenant_id)"
+
+AWARD_SQL = f"""
+WITH guard AS (
+    SELECT pg_advisory_xact_lock_shared({_LOCK_KEY})
+),
+entry AS (
+    INSERT INTO points_ledger (id, "tenantId", "userId", points, reason, "createdAt")
+    SELECT :id, :tenant_id, :user_id, :points, :reason, :now FROM guard
+    ON CONFLICT (id) DO NOTHING
+    RETURNING "tenantId", "userId", points
+)
+INSERT INTO "{POINTS_TABLE}" AS s (tenant_id, user_id, total_points, level, updated_at)
+SELECT e."tenantId", e."userId", e.points, {_LEVEL_SQL.format(tenant='e."tenantId"', total='e.points')}, :now
+FROM entry e
+ON CONFLICT (tenant_id, user_id) DO UPDATE SET
+    total_points = s.total_points + EXCLUDED.total_points,
+    level = {_LEVEL_SQL.format(tenant='s.tenant_id', total='s.total_points + EXCLUDED.total_points')},
+    updated_at = EXCLUDED.updated_at
+RETURNING total_points, level
+"""
+
+READ_SQL = f"""
+SELECT total_points, level FROM "{POINTS_TABLE}" WHERE tenant_id = :tenant_id AND user_id = :user_id
+"""
+
+CHECK_BADGES_SQL = f"""
+INSERT INTO "{BADGES_TABLE}" (tenant_id, user_id, badge_id, awarded_at)
+SELECT s.tenant_id, s.user_id, b.id, :now
+FROM "{POINTS_TABLE}" s
+JOIN badges b
+    ON b."tenantId" = s.tenant_id
+   AND b.criteria ->> 'type' = 'points'
+   AND jsonb_typeof(b.criteria -> 'threshold') = 'number'
+   AND (b.criteria ->> 'threshold')::numeric <= s.total_points
+WHERE s.tenant_id = :tenant_id
+  AND (CAST(:user_ids AS text[]) IS NULL OR s.user_id = ANY(CAST(:user_ids AS text[])))
+ON CONFLICT DO NOTHING
+RETURNING user_id, badge_id
+"""
+
+REBUILD_LOCK_SQL = f"""
+SELECT pg_advisory_xact_lock({_LOCK_KEY})
+"""
+
+REBUILD_SQL = f"""
+INSERT INTO "{POINTS_TABLE}" AS s (tenant_id, user_id, total_points, level, updated_at)
+SELECT t.tenant_id, t.user_id, t.total, {_LEVEL_SQL.format(tenant='t.tenant_id', total='t.total')}, :now
+FROM (
+    SELECT pl."tenantId" AS tenant_id, pl."userId" AS user_id, sum(pl.points)::int AS total
+    FROM points_ledger pl
+    WHERE pl."tenantId" = :tenant_id
+      AND (CAST(:user_ids AS text[]) IS NULL OR pl."userId" = ANY(CAST(:user_ids AS text[])))
+    GROUP BY pl."tenantId", pl."userId"
+) t
+ON CONFLICT (tenant_id, user_id) DO UPDATE SET
+    total_points = EXCLUDED.total_points,
+    level = EXCLUDED.level,
+    updated_at = EXCLUDED.updated_at
+"""
+
+# Summaries of users whose ledger rows are all gone
+PRUNE_SQL = f"""
+DELETE FROM "{POINTS_TABLE}" s
+WHERE s.tenant_id = :tenant_id
+  AND (CAST(:user_ids AS text[]) IS NULL OR s.user_id = ANY(CAST(:user_ids AS text[])))
+  AND NOT EXISTS (SELECT 1 FROM points_ledger pl WHERE pl."tenantId" = s.tenant_id AND pl."userId" = s.user_id)
+"""
+
+
+@dataclass(frozen=True)
+class PointsSummary:
+    total_points: int
+    level: int
+
+
+def ledger_entry_id(award_key: Optional[str]) -> str:
+    """Ledger id of an award; retries of the same award share it."""
+    if award_key is None:
+        return str(uuid.uuid4())
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"lms:points:{award_key}"))
+
+
+async def award_points(
+    conn: Any,
+    tenant_id: str,
+    user_id: str,
+    points: int,
+    reason: str,
+    now: datetime,
+    award_key: Optional[str] = None,
+) -> Optional[PointsSummary]:
+    """
+    Append a ledger entry and update the user's summary atomically.
+
+    Args:
+        award_key: Idempotency key of the award (e.g. the task id)
+
+    Returns:
+        The new summary, or None if this award was already recorded
+    """
+    result = await conn.execute(
+        text(AWARD_SQL),
+        {
+            "id": ledger_entry_id(award_key),
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "points": points,
+            "reason": reason,
+            "now": now,
+        },
+    )
+    row = result.first()
+    return PointsSummary(*row) if row is not None else None
+
+
+async def get_points(conn: Any, tenant_id: str, user_id: str) -> PointsSummary:
+    result = await conn.execute(text(READ_SQL), {"tenant_id": tenant_id, "user_id": user_id})
+    row = result.first()
+    return PointsSummary(*row) if row is not None else PointsSummary(0, 0)
+
+
+async def check_badges(
+    conn: Any,
+    tenant_id: str,
+    user_ids: Optional[Sequence[str]],
+    now: datetime,
+) -> list[tuple[str, str]]:
+    """
+    Award the points badges the users' totals reach (None: every user).
+
+    Returns:
+        (user id, badge id) of the newly awarded badges
+    """
+    result = await conn.execute(
+        text(CHECK_BADGES_SQL),
+        {"tenant_id": tenant_id, "user_ids": list(user_ids) if user_ids is not None else None, "now": now},
+    )
+    return [tuple(row) for row in result.all()]
+
+
+async def rebuild_points(
+    conn: Any,
+    tenant_id: str,
+    user_ids: Optional[Sequence[str]],
+    now: datetime,
+) -> int:
+    """
+    Recompute summaries from the ledger (None: every user of the tenant).
+
+    Must run in a transaction: the tenant's awards wait for it to commit.
+
+    Returns:
+        Summaries written
+    """
+    params = {"tenant_id": tenant_id, "user_ids": list(user_ids) if user_ids is not None else None, "now": now}
+    await conn.execute(text(REBUILD_LOCK_SQL), {"tenant_id": tenant_id})
+    result = await conn.execute(text(REBUILD_SQL), params)
+    await conn.execute(text(PRUNE_SQL), params)
+    return result.rowcount
+
+
+__all__ = [
+    "PointsSummary",
+    "award_points",
+    "check_badges",
+    "get_points",
+    "ledger_entry_id",
+    "rebuild_points",
+]
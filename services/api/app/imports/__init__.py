@@ -0,0 +1,10 @@
+"""Bulk import package."""
+
+from app.imports.common import ImportStats
+from app.imports.users import UserImportOptions, import_users_file
+
+__all__ = [
+    "ImportStats",
+    "UserImportOptions",
+    "import_users_file",
+]
@@ -0,0 +1,216 @@
+"""
+Bulk Import Helpers
+
+Shared plumbing for the CSV import tasks:
+
+- `read_batches` streams a CSV file in fixed-size batches of
+  (row number, row dict) with normalized headers, optionally resuming
+  after a checkpointed row; the file is never loaded whole
+- `ImportStats` accumulates counts and row errors, and round-trips
+  through a Redis checkpoint saved after every committed batch
+- `ErrorFile` appends failed rows to a per-job CSV error report that
+  survives resumes (it is cut back to its checkpointed size)
+- `update_import_job` records status and counts on the import_jobs row
+
+Row numbers count data rows from 1 (the header is row 0), matching what
+users see when they open the file in a spreadsheet minus the header.
+"""
+
+import csv
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence
+
+import orjson
+from sqlalchemy import text
+
+# Row errors kept in the checkpoint and on import_jobs.errors; counts are exact
+MAX_REPORTED_ERRORS = 1000
+
+CHECKPOINT_KEY = "import:checkpoint:{job_id}"
+CHECKPOINT_TTL_SECONDS = 7 * 24 * 60 * 60
+
+
+def normalize_header(name: str) -> str:
+    """`First Name`, `first_name` and `firstName` all become `firstname`."""
+    return "".join(ch for ch in name.strip().lower() if ch.isalnum())
+
+
+def count_rows(path: str) -> int:
+    """Approximate number of data rows (line count minus the header)."""
+    lines = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        while block := f.read(1024 * 1024):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1
+    return max(lines - 1, 0)
+
+
+def read_batches(
+    path: str,
+    batch_size: int,
+    start_row: int = 0,
+) -> Iterator[list[tuple[int, dict[str, str]]]]:
+    """
+    Stream a CSV file in batches.
+
+    Args:
+        path: CSV file with a header row (UTF-8, optional BOM)
+        batch_size: Rows per batch
+        start_row: Skip data rows up to and including this number (resume)
+
+    Yields:
+        Lists of (row number, {normalized header: stripped value}); blank
+        lines are dropped but still counted
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [normalize_header(name) for name in next(reader, [])]
+        batch: list[tuple[int, dict[str, str]]] = []
+        for number, cells in enumerate(reader, start=1):
+            if number <= start_row or not any(cell.strip() for cell in cells):
+                continue
+            batch.append((number, {name: value.strip() for name, value in zip(header, cells)}))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+@dataclass
+class ImportStats:
+    """Progress of an import; `last_row` is the last row of the last committed batch."""
+    last_row: int = 0
+    success: int = 0
+    failed: int = 0
+    skipped: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    # Size of the error report file as of the last committed batch
+    error_file_bytes: int = 0
+
+    @property
+    def processed(self) -> int:
+        return self.success + self.failed + self.skipped
+
+    def fail(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "last_row": self.last_row,
+            "success": self.success,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "error_file_bytes": self.error_file_bytes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ImportStats":
+        fields = ("last_row", "success", "failed", "skipped", "errors", "error_file_bytes")
+        return cls(**{key: data[key] for key in fields if key in data})
+
+
+class ErrorFile:
+    """
+    Per-row error report (CSV: row, the identifying input columns, error).
+
+    Opened at the checkpointed size, so rows written by a batch that never
+    committed are dropped when the job resumes.
+    """
+
+    def __init__(self, path: str, columns: Sequence[str], resume_bytes: int = 0):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fresh = resume_bytes == 0 or not os.path.exists(path)
+        self._file = open(path, "w" if fresh else "r+", newline="", encoding="utf-8")
+        if fresh:
+            csv.writer(self._file).writerow(["row", *columns, "error"])
+        else:
+            self._file.seek(resume_bytes)
+            self._file.truncate()
+        self._writer = csv.writer(self._file)
+
+    def write(self, errors: Iterable[tuple[int, Sequence[Any], str]]) -> int:
+        """Append (row, values, error) entries; returns the file size after flushing."""
+        self._writer.writerows([row, *values, message] for row, values, message in errors)
+        self._file.flush()
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def load_checkpoint(redis: Any, job_id: str) -> Optional[ImportStats]:
+    """Stats of a previous attempt of this job, if it committed any batch."""
+    data = redis.get(CHECKPOINT_KEY.format(job_id=job_id))
+    return ImportStats.from_dict(orjson.loads(data)) if data else None
+
+
+def save_checkpoint(redis: Any, job_id: str, stats: ImportStats) -> None:
+    redis.set(CHECKPOINT_KEY.format(job_id=job_id), orjson.dumps(stats.to_dict()), ex=CHECKPOINT_TTL_SECONDS)
+
+
+def clear_checkpoint(redis: Any, job_id: str) -> None:
+    redis.delete(CHECKPOINT_KEY.format(job_id=job_id))
+
+
+def final_status(stats: ImportStats) -> str:
+    """COMPLETED, PARTIAL (some rows failed) or FAILED (nothing imported)."""
+    if stats.failed == 0:
+        return "COMPLETED"
+    return "PARTIAL" if stats.success or stats.skipped else "FAILED"
+
+
+async def update_import_job(
+    conn: Any,
+    job_id: str,
+    tenant_id: str,
+    status: str,
+    stats: Optional[ImportStats] = None,
+    total_rows: Optional[int] = None,
+    completed_at: Optional[datetime] = None,
+) -> None:
+    """Record an import job's status (and counts, once known) on import_jobs."""
+    stats = stats or ImportStats()
+    await conn.execute(
+        text(
+            'UPDATE import_jobs SET status = :status, '
+            '"totalRows" = COALESCE(:total_rows, "totalRows"), '
+            '"successRows" = :success, "errorRows" = :failed, '
+            'errors = CAST(:errors AS jsonb), "completedAt" = :completed_at '
+            'WHERE id = :id AND "tenantId" = :tenant_id'
+        ),
+        {
+            "id": job_id,
+            "tenant_id": tenant_id,
+            "status": status,
+            "total_rows": total_rows,
+            "success": stats.success,
+            "failed": stats.failed,
+            "errors": orjson.dumps(stats.errors).decode() if stats.errors else None,
+            "completed_at": completed_at,
+        },
+    )
+
+
+__all__ = [
+    "ErrorFile",
+    "ImportStats",
+    "MAX_REPORTED_ERRORS",
+    "clear_checkpoint",
+    "count_rows",
+    "final_status",
+    "load_checkpoint",
+    "normalize_header",
+    "read_batches",
+    "save_checkpoint",
+    "update_import_job",
+]
@@ -0,0 +1,295 @@
+"""
+Set-based Enrollment Import
+
+Enrolls users in courses from a CSV file (columns: email, courseCode) in
+batches. Where the interactive POST /api/enrollments does a course
+lookup, an existence check and an insert per enrollment, each batch here
+does:
+
+1. One joined lookup: the batch's (email, code) pairs are unnested and
+   LEFT JOINed to users, courses and enrollments, resolving both ids, the
+   course status and any existing enrollment at once
+2. Set-wise filtering of unknown users/courses, unpublished courses,
+   existing enrollments and duplicate pairs in the file
+3. One INSERT ... SELECT FROM unnest(...) ON CONFLICT DO NOTHING
+
+Failed rows go to a per-row error report file, and each committed batch
+gets ENROLLMENT_CREATE audit records per course (split so each fits the
+audit metadata cap) instead of one per enrollment.
+
+Enrollment ids are derived from (import job, row number), so a resumed
+job recognises the rows it already committed (see app.imports.users).
+The insert and audit helpers are shared with POST /api/enrollments/bulk.
+"""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.audit import AuditEntry, AuditEventType
+from app.audit.serialize import dumps
+from app.config import get_settings
+from app.imports.common import ErrorFile, ImportStats, read_batches
+
+ERROR_COLUMNS = ("email", "courseCode")
+
+LOOKUP_SQL = """
+SELECT i.row, u.id AS user_id, c.id AS course_id, c.status AS course_status, e.id AS enrollment_id
+FROM unnest(CAST(:rows AS int[]), CAST(:emails AS text[]), CAST(:codes AS text[])) AS i(row, email, code)
+LEFT JOIN users u ON u."tenantId" = :tenant_id AND u.email = i.email AND u."deletedAt" IS NULL
+LEFT JOIN courses c ON c."tenantId" = :tenant_id AND c.code = i.code AND c."deletedAt" IS NULL
+LEFT JOIN enrollments e ON e."tenantId" = :tenant_id AND e."userId" = u.id AND e."courseId" = c.id
+"""
+
+INSERT_SQL = """
+INSERT INTO enrollments (id, "tenantId", "userId", "courseId", status, progress, "createdAt", "updatedAt")
+SELECT i.id, :tenant_id, i.user_id, i.course_id, 'NOT_STARTED'::"EnrollmentStatus", 0, :now, :now
+FROM unnest(CAST(:ids AS text[]), CAST(:user_ids AS text[]), CAST(:course_ids AS text[])) AS i(id, user_id, course_id)
+ON CONFLICT ("tenantId", "userId", "courseId") DO NOTHING
+RETURNING id, "userId", "courseId"
+"""
+
+
+@dataclass
+class EnrollmentRow:
+    row: int
+    id: str
+    email: str
+    course_code: str
+    user_id: Optional[str] = None
+    course_id: Optional[str] = None
+
+    @property
+    def values(self) -> tuple[str, str]:
+        return self.email, self.course_code
+
+
+def import_enrollment_id(job_id: str, row: int) -> str:
+    """Deterministic id for the enrollment created from a row of an import job."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"lms:import:{job_id}:enrollments:{row}"))
+
+
+def parse_rows(
+    job_id: str,
+    rows: Sequence[tuple[int, Mapping[str, str]]],
+) -> tuple[list[EnrollmentRow], list[tuple[int, tuple[str, str], str]]]:
+    """Required-field validation for a parsed batch."""
+    valid: list[EnrollmentRow] = []
+    errors: list[tuple[int, tuple[str, str], str]] = []
+    for number, data in rows:
+        email = data.get("email") or data.get("useremail") or ""
+        code = data.get("coursecode") or data.get("code") or ""
+        if not email or not code:
+            errors.append((number, (email, code), "Missing email or course code"))
+            continue
+        valid.append(EnrollmentRow(number, import_enrollment_id(job_id, number), email, code))
+    return valid, errors
+
+
+def classify_lookup(
+    rows: Sequence[EnrollmentRow],
+    found: Mapping[int, Mapping[str, Any]],
+    seen: set[tuple[str, str]],
+) -> tuple[list[EnrollmentRow], list[EnrollmentRow], list[tuple[int, tuple[str, str], str]]]:
+    """
+    Filter a batch using its joined lookup.
+
+    Args:
+        found: Lookup rows by row number
+        seen: (user id, course id) pairs of earlier rows, updated in place
+
+    Returns:
+        (rows to insert, rows already imported by this job, errors)
+    """
+    to_insert: list[EnrollmentRow] = []
+    imported: list[EnrollmentRow] = []
+    errors: list[tuple[int, tuple[str, str], str]] = []
+    for row in rows:
+        match = found.get(row.row) or {}
+        row.user_id, row.course_id = match.get("user_id"), match.get("course_id")
+        if row.user_id is None:
+            errors.append((row.row, row.values, f"Unknown user: {row.email}"))
+        elif row.course_id is None:
+            errors.append((row.row, row.values, f"Unknown course: {row.course_code}"))
+        elif match.get("enrollment_id") == row.id:
+            imported.append(row)
+        elif match.get("course_status") != "PUBLISHED":
+            errors.append((row.row, row.values, "Cannot enroll in unpublished course"))
+        elif match.get("enrollment_id") is not None:
+            errors.append((row.row, row.values, "Already enrolled in this course"))
+        elif (row.user_id, row.course_id) in seen:
+            errors.append((row.row, row.values, "Duplicate enrollment in file"))
+        else:
+            seen.add((row.user_id, row.course_id))
+            to_insert.append(row)
+    return to_insert, imported, errors
+
+
+async def lookup_rows(conn: Any, tenant_id: str, rows: Sequence[EnrollmentRow]) -> dict[int, Mapping[str, Any]]:
+    """Resolve users, courses and existing enrollments for a batch in one query."""
+    result = await conn.execute(
+        text(LOOKUP_SQL),
+        {
+            "tenant_id": tenant_id,
+            "rows": [row.row for row in rows],
+            "emails": [row.email for row in rows],
+            "codes": [row.course_code for row in rows],
+        },
+    )
+    return {match["row"]: match for match in result.mappings().all()}
+
+
+async def insert_enrollments(
+    conn: Any,
+    tenant_id: str,
+    pairs: Sequence[tuple[str, str, str]],
+    now: datetime,
+) -> list[tuple[str, str, str]]:
+    """
+    Insert (id, user id, course id) enrollments in one statement.
+
+    Returns:
+        The (id, user id, course id) rows actually inserted; pairs that were
+        enrolled concurrently are skipped by ON CONFLICT
+    """
+    if not pairs:
+        return []
+    result = await conn.execute(
+        text(INSERT_SQL),
+        {
+            "tenant_id": tenant_id,
+            "now": now,
+            "ids": [pair[0] for pair in pairs],
+            "user_ids": [pair[1] for pair in pairs],
+            "course_ids": [pair[2] for pair in pairs],
+        },
+    )
+    return [tuple(row) for row in result.all()]
+
+
+def batch_audit_entries(
+    tenant_id: str,
+    actor_id: str,
+    inserted: Sequence[tuple[str, str, str]],
+    metadata: Optional[Mapping[str, Any]] = None,
+) -> list[AuditEntry]:
+    """
+    ENROLLMENT_CREATE records for a batch: user ids by course.
+
+    Each course gets its own records, with its user ids split so every
+    record stays under `audit_metadata_max_bytes` and is never truncated.
+    """
+    max_bytes = get_settings().audit_metadata_max_bytes
+    by_course: dict[str, list[str]] = {}
+    for _, user_id, course_id in inserted:
+        by_course.setdefault(course_id, []).append(user_id)
+
+    def entry(course_id: str, user_ids: list[str]) -> AuditEntry:
+        return AuditEntry(
+            event_type=AuditEventType.ENROLLMENT_CREATE,
+            tenant_id=tenant_id,
+            user_id=actor_id,
+            resource_type="Enrollment",
+            metadata={"bulk": True, "count": len(user_ids), **(metadata or {})},
+            after_state={course_id: user_ids},
+        )
+
+    entries = []
+    for course_id, user_ids in by_course.items():
+        if max_bytes <= 0:
+            entries.append(entry(course_id, user_ids))
+            continue
+        # Room left for ids once the rest of the record is serialized (slack for the count)
+        budget = max_bytes - len(entry(course_id, []).to_metadata_json().encode("utf-8")) - 16
+        part: list[str] = []
+        size = 0
+        for user_id in user_ids:
+            cost = len(dumps(user_id).encode("utf-8")) + 1
+            if part and size + cost > budget:
+                entries.append(entry(course_id, part))
+                part, size = [], 0
+            part.append(user_id)
+            size += cost
+        entries.append(entry(course_id, part))
+    return entries
+
+
+async def import_enrollments_file(
+    engine: Any,
+    job_id: str,
+    file_path: str,
+    tenant_id: str,
+    actor_id: str,
+    batch_size: int,
+    error_file: ErrorFile,
+    audit: Callable[[AuditEntry], Any],
+    stats: Optional[ImportStats] = None,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """
+    Import an enrollment CSV, committing one transaction per batch.
+
+    Args:
+        engine: AsyncEngine
+        actor_id: User who started the import (audit actor)
+        error_file: Per-row error report
+        audit: Awaitable audit logger (log_audit)
+        stats: Checkpoint of a previous attempt to resume from
+        on_batch: Called with the running stats after each committed batch
+    """
+    stats = stats or ImportStats()
+    seen: set[tuple[str, str]] = set()
+
+    for batch in read_batches(file_path, batch_size, start_row=stats.last_row):
+        rows, errors = parse_rows(job_id, batch)
+        inserted: list[tuple[str, str, str]] = []
+
+        if rows:
+            async with engine.begin() as conn:
+                found = await lookup_rows(conn, tenant_id, rows)
+                rows, imported, conflicts = classify_lookup(rows, found, seen)
+                inserted = await insert_enrollments(
+                    conn,
+                    tenant_id,
+                    [(row.id, row.user_id, row.course_id) for row in rows],
+                    datetime.now(timezone.utc).replace(tzinfo=None),
+                )
+            errors += conflicts
+            inserted_ids = {enrollment[0] for enrollment in inserted}
+            errors += [
+                (row.row, row.values, "Already enrolled in this course")
+                for row in rows
+                if row.id not in inserted_ids
+            ]
+            stats.success += len(imported) + len(inserted)
+
+        for entry in batch_audit_entries(
+            tenant_id, actor_id, inserted, {"importJobId": job_id, "rows": [batch[0][0], batch[-1][0]]}
+        ):
+            await audit(entry)
+
+        errors.sort()
+        for number, _, message in errors:
+            stats.fail(number, message)
+        stats.error_file_bytes = error_file.write(errors)
+        stats.last_row = batch[-1][0]
+        if on_batch:
+            on_batch(stats)
+
+    return stats
+
+
+__all__ = [
+    "ERROR_COLUMNS",
+    "EnrollmentRow",
+    "batch_audit_entries",
+    "classify_lookup",
+    "import_enrollment_id",
+    "import_enrollments_file",
+    "insert_enrollments",
+    "lookup_rows",
+    "parse_rows",
+]
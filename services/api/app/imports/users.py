@@ -0,0 +1,351 @@
+"""
+Streaming User Import
+
+Imports users from a CSV file (columns: email, username, firstName,
+lastName, password, role, nodeId; header case and separators are ignored)
+in batches of IMPORT_BATCH_SIZE rows. Per batch:
+
+1. Validate rows in memory: required fields, email shape, role, password
+   policy, and duplicates earlier in the file
+2. Resolve conflicts with one set-based query for all of the batch's
+   emails and usernames (and one for its branch ids)
+3. Hash the supplied passwords on a thread pool; bcrypt releases the GIL,
+   so this scales with cores inside a Celery worker process (whose
+   daemonic prefork children cannot start a process pool). Rows without a
+   password get no hash and sign in through the password reset flow
+4. COPY the rows into a temporary staging table, then insert new users
+   with INSERT ... SELECT ... ON CONFLICT DO NOTHING, update existing ones
+   (update_existing) and add their role rows, in one transaction
+
+New users get ids derived from (import job, row number). After a crash
+the job resumes after the last checkpointed batch; rows of a batch that
+committed before its checkpoint was saved are recognised by their id and
+counted as imported rather than reported as duplicates.
+"""
+
+import asyncio
+import re
+import uuid
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.auth.password import hash_password, validate_password_policy
+from app.db.models import RoleKey
+from app.imports.common import ImportStats, read_batches
+
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+ROLES = frozenset(role.value for role in RoleKey)
+
+STAGE_COLUMNS = (
+    "id", "existing_id", "email", "username", "first_name", "last_name",
+    "password_hash", "role", "node_id", "role_id",
+)
+
+CREATE_STAGE_SQL = """
+CREATE TEMP TABLE import_users_stage (
+    id text, existing_id text, email text, username text, first_name text, last_name text,
+    password_hash text, role text, node_id text, role_id text
+) ON COMMIT DROP
+"""
+
+INSERT_USERS_SQL = """
+INSERT INTO users (
+    id, "tenantId", email, username, "firstName", "lastName", "passwordHash",
+    "activeRole", role, status, node_id, "createdAt", "updatedAt"
+)
+SELECT s.id, :tenant_id, s.email, s.username, s.first_name, s.last_name, s.password_hash,
+       s.role::"RoleKey", s.role::"RoleKey", 'ACTIVE'::"UserStatus", s.node_id, :now, :now
+FROM import_users_stage s
+WHERE s.existing_id IS NULL
+ON CONFLICT DO NOTHING
+RETURNING id
+"""
+
+UPDATE_USERS_SQL = """
+UPDATE users u SET
+    "firstName" = COALESCE(NULLIF(s.first_name, ''), u."firstName"),
+    "lastName" = COALESCE(NULLIF(s.last_name, ''), u."lastName"),
+    "passwordHash" = COALESCE(s.password_hash, u."passwordHash"),
+    "activeRole" = s.role::"RoleKey",
+    role = s.role::"RoleKey",
+    node_id = COALESCE(s.node_id, u.node_id),
+    "updatedAt" = :now
+FROM import_users_stage s
+WHERE u.id = s.existing_id AND u."tenantId" = :tenant_id
+RETURNING u.id
+"""
+
+INSERT_ROLES_SQL = """
+INSERT INTO user_roles (id, "tenantId", "userId", "roleKey", "createdAt")
+SELECT s.role_id, :tenant_id, u.id, s.role::"RoleKey", :now
+FROM import_users_stage s
+JOIN users u ON u.id = COALESCE(s.existing_id, s.id) AND u."tenantId" = :tenant_id
+ON CONFLICT DO NOTHING
+"""
+
+
+@dataclass(frozen=True)
+class UserImportOptions:
+    skip_existing: bool = False
+    update_existing: bool = False
+    default_role: str = RoleKey.LEARNER.value
+    default_node_id: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, options: Optional[Mapping[str, Any]]) -> "UserImportOptions":
+        """Accepts snake_case or the web app's camelCase keys."""
+        options = options or {}
+
+        def get(snake: str, camel: str, default: Any = None) -> Any:
+            return options.get(snake, options.get(camel, default))
+
+        return cls(
+            skip_existing=bool(get("skip_existing", "skipExisting", False)),
+            update_existing=bool(get("update_existing", "updateExisting", False)),
+            default_role=(get("default_role", "defaultRoleId") or RoleKey.LEARNER.value).upper(),
+            default_node_id=get("default_node_id", "defaultNodeId"),
+        )
+
+
+@dataclass
+class UserRow:
+    row: int
+    id: str
+    email: str
+    username: str
+    first_name: str
+    last_name: str
+    password: Optional[str]
+    role: str
+    node_id: Optional[str]
+    existing_id: Optional[str] = None
+    password_hash: Optional[str] = None
+
+    def stage_record(self) -> tuple:
+        return (
+            self.id, self.existing_id, self.email, self.username, self.first_name, self.last_name,
+            self.password_hash, self.role, self.node_id, str(uuid.uuid4()),
+        )
+
+
+def import_user_id(job_id: str, row: int) -> str:
+    """Deterministic id for the user created from a row of an import job."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"lms:import:{job_id}:users:{row}"))
+
+
+def validate_rows(
+    job_id: str,
+    rows: Sequence[tuple[int, Mapping[str, str]]],
+    options: UserImportOptions,
+    seen: dict[str, set[str]],
+) -> tuple[list[UserRow], list[tuple[int, str]]]:
+    """
+    Validate a batch of parsed rows without touching the database.
+
+    Args:
+        seen: Lowercased emails/usernames of earlier rows, updated in place
+
+    Returns:
+        (valid rows, (row number, error) pairs)
+    """
+    valid: list[UserRow] = []
+    errors: list[tuple[int, str]] = []
+    for number, data in rows:
+        email = data.get("email", "")
+        username = data.get("username", "")
+        role = (data.get("role") or options.default_role).upper()
+        password = data.get("password") or None
+
+        if not email or not username:
+            errors.append((number, "Missing email or username"))
+            continue
+        if not EMAIL_RE.match(email):
+            errors.append((number, f"Invalid email: {email}"))
+            continue
+        if role not in ROLES:
+            errors.append((number, f"Invalid role: {role}"))
+            continue
+        if password is not None:
+            ok, message = validate_password_policy(password)
+            if not ok:
+                errors.append((number, message))
+                continue
+        if email.lower() in seen["emails"] or username.lower() in seen["usernames"]:
+            errors.append((number, "Duplicate email or username in file"))
+            continue
+
+        seen["emails"].add(email.lower())
+        seen["usernames"].add(username.lower())
+        valid.append(UserRow(
+            row=number,
+            id=import_user_id(job_id, number),
+            email=email,
+            username=username,
+            first_name=data.get("firstname", ""),
+            last_name=data.get("lastname", ""),
+            password=password,
+            role=role,
+            node_id=data.get("nodeid") or options.default_node_id,
+        ))
+    return valid, errors
+
+
+async def resolve_existing(
+    conn: Any,
+    tenant_id: str,
+    rows: Sequence[UserRow],
+    options: UserImportOptions,
+) -> tuple[list[UserRow], list[UserRow], list[tuple[int, str]], int]:
+    """
+    Match a batch against existing users and branches (two queries).
+
+    Returns:
+        (rows to write, rows already imported by this job, errors, skipped count)
+    """
+    existing = await conn.execute(
+        text(
+            'SELECT id, email, username FROM users WHERE "tenantId" = :tenant_id '
+            'AND (email = ANY(:emails) OR username = ANY(:usernames))'
+        ),
+        {"tenant_id": tenant_id, "emails": [r.email for r in rows], "usernames": [r.username for r in rows]},
+    )
+    by_email: dict[str, str] = {}
+    by_username: dict[str, str] = {}
+    for user in existing.mappings().all():
+        by_email[user["email"]] = user["id"]
+        by_username[user["username"]] = user["id"]
+
+    node_ids = sorted({r.node_id for r in rows if r.node_id})
+    valid_nodes: set[str] = set()
+    if node_ids:
+        nodes = await conn.execute(
+            text('SELECT id FROM branches WHERE "tenantId" = :tenant_id AND id = ANY(:ids)'),
+            {"tenant_id": tenant_id, "ids": node_ids},
+        )
+        valid_nodes = {node[0] for node in nodes.all()}
+
+    to_write: list[UserRow] = []
+    imported: list[UserRow] = []
+    errors: list[tuple[int, str]] = []
+    skipped = 0
+    for row in rows:
+        matches = {user_id for user_id in (by_email.get(row.email), by_username.get(row.username)) if user_id}
+        if row.node_id and row.node_id not in valid_nodes:
+            errors.append((row.row, f"Unknown branch: {row.node_id}"))
+        elif not matches:
+            to_write.append(row)
+        elif matches == {row.id}:
+            imported.append(row)
+        elif len(matches) > 1:
+            errors.append((row.row, "Email and username belong to different users"))
+        elif options.skip_existing:
+            skipped += 1
+        elif options.update_existing:
+            row.existing_id = matches.pop()
+            to_write.append(row)
+        else:
+            errors.append((row.row, "User with email/username already exists"))
+    return to_write, imported, errors, skipped
+
+
+async def hash_passwords(rows: Sequence[UserRow], executor: Optional[Executor]) -> None:
+    """Hash the supplied passwords in parallel on `executor`."""
+    loop = asyncio.get_running_loop()
+    pending = [row for row in rows if row.password]
+    hashes = await asyncio.gather(*(loop.run_in_executor(executor, hash_password, row.password) for row in pending))
+    for row, password_hash in zip(pending, hashes):
+        row.password_hash = password_hash
+
+
+async def write_users(conn: Any, tenant_id: str, rows: Sequence[UserRow], now: datetime) -> set[str]:
+    """
+    COPY a batch into staging and apply it to users/user_roles.
+
+    Must run inside a transaction (the staging table is dropped on commit).
+
+    Returns:
+        Ids of the users inserted or updated; rows missing from it lost a
+        race with a concurrent insert of the same email/username
+    """
+    await conn.execute(text(CREATE_STAGE_SQL))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "import_users_stage",
+        records=[row.stage_record() for row in rows],
+        columns=list(STAGE_COLUMNS),
+    )
+
+    params = {"tenant_id": tenant_id, "now": now}
+    written = {row[0] for row in (await conn.execute(text(INSERT_USERS_SQL), params)).all()}
+    if any(row.existing_id for row in rows):
+        written |= {row[0] for row in (await conn.execute(text(UPDATE_USERS_SQL), params)).all()}
+    await conn.execute(text(INSERT_ROLES_SQL), params)
+    return written
+
+
+async def import_users_file(
+    engine: Any,
+    job_id: str,
+    file_path: str,
+    tenant_id: str,
+    options: UserImportOptions,
+    batch_size: int,
+    executor: Optional[Executor] = None,
+    stats: Optional[ImportStats] = None,
+    on_batch: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """
+    Import a user CSV, committing one transaction per batch.
+
+    Args:
+        engine: AsyncEngine
+        stats: Checkpoint of a previous attempt to resume from
+        on_batch: Called with the running stats after each committed batch
+            (checkpointing and progress)
+    """
+    stats = stats or ImportStats()
+    seen: dict[str, set[str]] = {"emails": set(), "usernames": set()}
+
+    for batch in read_batches(file_path, batch_size, start_row=stats.last_row):
+        rows, errors = validate_rows(job_id, batch, options, seen)
+
+        if rows:
+            async with engine.connect() as conn:
+                rows, imported, conflicts, skipped = await resolve_existing(conn, tenant_id, rows, options)
+            errors += conflicts
+            stats.success += len(imported)
+            stats.skipped += skipped
+
+        if rows:
+            await hash_passwords(rows, executor)
+            async with engine.begin() as conn:
+                written = await write_users(conn, tenant_id, rows, datetime.now(timezone.utc).replace(tzinfo=None))
+            stats.success += len(written)
+            errors += [
+                (row.row, "User with email/username already exists")
+                for row in rows
+                if (row.existing_id or row.id) not in written
+            ]
+
+        for number, message in sorted(errors):
+            stats.fail(number, message)
+        stats.last_row = batch[-1][0]
+        if on_batch:
+            on_batch(stats)
+
+    return stats
+
+
+__all__ = [
+    "UserImportOptions",
+    "UserRow",
+    "import_user_id",
+    "import_users_file",
+    "resolve_existing",
+    "validate_rows",
+    "write_users",
+]
@@ -6,9 +6,11 @@ This module creates and configures the Celery application with:
 - Redis as broker and result backend
 - 8 task queues matching the BullMQ structure
 - Retry policies and result expiration
+- Celery beat schedule for periodic maintenance
 """
 
 from celery import Celery
+from celery.schedules import crontab
 
 from app.config import get_settings
 
@@ -74,6 +76,34 @@ celery_app.conf.update(
             "rate_limit": "100/s",  # Global rate limit
         }
     },
+    
+    # Periodic tasks (run `celery -A app.jobs beat`)
+    beat_schedule={
+        "audit-maintain-partitions": {
+            "task": "app.jobs.tasks.audit_maintain_partitions",
+            "schedule": crontab(hour=2, minute=15),
+        },
+        "reports-refresh-dashboard-stats": {
+            "task": "app.jobs.tasks.report_refresh_dashboard_stats",
+            "schedule": float(settings.dashboard_stats_refresh_seconds),
+        },
+        "reports-refresh-activity-buckets": {
+            "task": "app.jobs.tasks.report_refresh_activity_buckets",
+            "schedule": crontab(hour=0, minute=20),
+        },
+        "reports-refresh-login-buckets": {
+            "task": "app.jobs.tasks.report_refresh_login_buckets",
+            "schedule": float(settings.activity_login_refresh_seconds),
+        },
+        "reports-evict-artifacts": {
+            "task": "app.jobs.tasks.report_evict_artifacts",
+            "schedule": crontab(minute=40),
+        },
+        "timeline-flush": {
+            "task": "app.jobs.tasks.timeline_flush",
+            "schedule": float(settings.timeline_flush_seconds),
+        },
+    },
 )
 
 # ============= Queue Definitions =============
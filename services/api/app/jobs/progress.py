@@ -0,0 +1,82 @@
+"""
+Task Progress Reporting
+
+Long-running tasks publish incremental progress through Celery's
+`update_state`, which stores a PROGRESS state with this meta in the result
+backend:
+
+    {"stage": "writing", "processed": 25000, "total": 100000,
+     "rate": 8120.4, "etaSeconds": 9.2, "elapsedSeconds": 3.1}
+
+`total` and `etaSeconds` are null when the total is unknown (e.g. a report
+streamed from a cursor). Updates are throttled to one backend write per
+`min_interval` seconds, so callers can report after every batch.
+"""
+
+import time
+from typing import Any, Optional
+
+PROGRESS_STATE = "PROGRESS"
+
+
+class ProgressReporter:
+    """Throttled `update_state` publisher for a bound Celery task."""
+
+    def __init__(
+        self,
+        task: Any,
+        total: Optional[int] = None,
+        stage: Optional[str] = None,
+        min_interval: float = 1.0,
+    ):
+        self.task = task
+        self.total = total
+        self.stage = stage
+        self.min_interval = min_interval
+        self.processed = 0
+        self._started = time.monotonic()
+        self._last_sent = 0.0
+
+    def meta(self) -> dict[str, Any]:
+        """Current progress meta."""
+        elapsed = time.monotonic() - self._started
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if self.total is not None and rate > 0:
+            eta = round(max(self.total - self.processed, 0) / rate, 1)
+        return {
+            "stage": self.stage,
+            "processed": self.processed,
+            "total": self.total,
+            "rate": round(rate, 1),
+            "etaSeconds": eta,
+            "elapsedSeconds": round(elapsed, 1),
+        }
+
+    def update(
+        self,
+        processed: int,
+        total: Optional[int] = None,
+        stage: Optional[str] = None,
+        force: bool = False,
+    ) -> None:
+        """Record progress and publish it if the throttle interval has passed."""
+        self.processed = processed
+        if total is not None:
+            self.total = total
+        if stage is not None:
+            self.stage = stage
+
+        now = time.monotonic()
+        if not force and now - self._last_sent < self.min_interval:
+            return
+        self._last_sent = now
+        # Eager or direct calls have no task id to store state under
+        if self.task.request.id:
+            self.task.update_state(state=PROGRESS_STATE, meta=self.meta())
+
+
+__all__ = [
+    "PROGRESS_STATE",
+    "ProgressReporter",
+]
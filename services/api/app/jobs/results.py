@@ -0,0 +1,95 @@
+"""
+Task Result Lookup
+
+Reads Celery task state straight from the Redis result backend with the
+API's asyncio Redis client, so request handlers never block on Celery's
+synchronous AsyncResult. Batches of tasks are read with one MGET.
+
+With `result_extended` enabled the stored meta also carries the task's
+kwargs, which is how the API checks who a task belongs to.
+"""
+
+from typing import Any, Optional, Sequence
+
+import orjson
+
+from app.jobs.progress import PROGRESS_STATE
+
+# Key layout of Celery's Redis result backend
+TASK_META_KEY = "celery-task-meta-{task_id}"
+
+READY_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+
+
+async def get_task_meta(redis: Any, task_id: str) -> Optional[dict[str, Any]]:
+    """
+    Stored state of a task.
+
+    Returns the backend's meta dict (status, result, date_done, ...) or
+    None if the task is unknown, still queued, or its result expired.
+    """
+    meta = await redis.get(TASK_META_KEY.format(task_id=task_id))
+    if meta is None:
+        return None
+    return orjson.loads(meta)
+
+
+async def get_task_metas(redis: Any, task_ids: Sequence[str]) -> list[Optional[dict[str, Any]]]:
+    """Stored state of several tasks in one round trip, in input order."""
+    if not task_ids:
+        return []
+    metas = await redis.mget([TASK_META_KEY.format(task_id=task_id) for task_id in task_ids])
+    return [orjson.loads(meta) if meta is not None else None for meta in metas]
+
+
+def task_owner(meta: Optional[dict[str, Any]]) -> tuple[Optional[str], Optional[str]]:
+    """(tenant_id, user_id) a task was queued for, from its stored kwargs."""
+    if not meta:
+        return None, None
+    kwargs = meta.get("kwargs") or {}
+    result = meta.get("result") if isinstance(meta.get("result"), dict) else {}
+    return kwargs.get("tenant_id") or result.get("tenant_id"), kwargs.get("user_id")
+
+
+def format_task_status(task_id: str, meta: Optional[dict[str, Any]]) -> dict[str, Any]:
+    """
+    API view of a task's state.
+
+    Unknown ids report PENDING, like Celery's AsyncResult: a queued task
+    has no stored state until a worker picks it up.
+    """
+    if meta is None:
+        return {
+            "taskId": task_id,
+            "status": "PENDING",
+            "ready": False,
+            "progress": None,
+            "result": None,
+            "error": None,
+            "finishedAt": None,
+        }
+
+    status = meta.get("status", "PENDING")
+    result = meta.get("result")
+    if status == "SUCCESS" and isinstance(result, dict):
+        # Server-side file locations stay internal
+        result = {key: value for key, value in result.items() if key != "path"}
+    return {
+        "taskId": task_id,
+        "status": status,
+        "ready": status in READY_STATES,
+        "progress": result if status == PROGRESS_STATE else None,
+        "result": result if status == "SUCCESS" else None,
+        # Exception type only: messages may carry internals
+        "error": result.get("exc_type") if status == "FAILURE" and isinstance(result, dict) else None,
+        "finishedAt": meta.get("date_done"),
+    }
+
+
+__all__ = [
+    "READY_STATES",
+    "format_task_status",
+    "get_task_meta",
+    "get_task_metas",
+    "task_owner",
+]
@@ -0,0 +1,32 @@
+"""
+Async Runtime Helpers for Celery Tasks
+
+Celery tasks are synchronous, while the data layer is async SQLAlchemy.
+`run_async` runs a coroutine to completion on a fresh event loop and then
+disposes the engine's pooled connections, which are bound to that loop and
+cannot be reused by the next task.
+"""
+
+import asyncio
+from typing import Any, Awaitable, TypeVar
+
+from app.db.session import engine
+
+T = TypeVar("T")
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """Run a coroutine from a Celery task and return its result."""
+
+    async def _runner() -> T:
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_runner())
+
+
+__all__ = [
+    "run_async",
+]
@@ -12,11 +12,12 @@ Tasks are grouped by:
 - Email: Transactional and notification emails
 - Notification: In-app and push notifications
 - Certificate: Generation and eligibility checks
-- Report: Data exports and scheduled reports
+- Report: Data exports, scheduled reports and rollup refreshes
 - Import: Bulk user/data imports
 - Gamification: Points, badges, levels
 - Timeline: Activity feed events
 - Automation: Rule-based automation execution
+- Audit: auth_audit_log partition maintenance
 """
 
 from celery import shared_task
@@ -56,10 +57,18 @@ def send_email(
         to: Recipient email address
         subject: Email subject
         tenant_id: Tenant ID for template customization
-        template_data: Data to populate template
-        template_id: Optional custom template ID
-        user_id: Optional user ID for tracking
+        template_data: Bodies (text/body, html) and placeholder/tag values
+        template_id: Optional stored notification template; its compiled
+            form is cached per worker and its smart tags resolved for `to`
+        user_id: Optional user ID for tracking and smart tags
     """
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.mail import get_transport, render_bulk
+    from app.mail.delivery import RenderedEmail, build_message, render_stored
+    from app.rendering import RenderContext
+    
     logger.info(f"[EMAIL] Sending {email_type} to {to}", extra={
         "email_type": email_type,
         "to": to,
@@ -67,20 +76,25 @@ def send_email(
         "attempt": self.request.retries + 1,
     })
     
+    settings = get_settings()
+    
+    async def _render_stored():
+        async with engine.connect() as conn:
+            return await render_stored(
+                conn, tenant_id, template_id, {to: RenderContext(user_id=user_id, email=to)},
+                template_data or {}, settings.app_base_url,
+            )
+    
     try:
-        # TODO: Integrate with actual email service (SendGrid, SES, etc.)
-        # For now, just simulate success
+        rendered = run_async(_render_stored()) if template_id else None
+        if rendered is None:
+            rendered = render_bulk(subject, template_data or {})
+        elif not isinstance(rendered, RenderedEmail):
+            rendered = rendered[to]
         
-        if email_type == "welcome":
-            logger.info(f"[EMAIL] Welcome email to {to}")
-        elif email_type == "password_reset":
-            logger.info(f"[EMAIL] Password reset email to {to}")
-        elif email_type == "notification":
-            logger.info(f"[EMAIL] Notification email to {to}: {subject}")
-        elif email_type == "certificate_ready":
-            logger.info(f"[EMAIL] Certificate ready email to {to}")
-        elif email_type == "enrollment":
-            logger.info(f"[EMAIL] Enrollment confirmation to {to}")
+        get_transport().send(build_message(
+            settings.email_from, to, rendered, headers={"X-Email-Type": email_type, "X-Tenant-Id": tenant_id},
+        ))
         
         return {
             "success": True,
@@ -106,23 +120,129 @@ def send_bulk_email(
     template_data: Dict[str, Any],
     tenant_id: str,
 ):
-    """Send bulk email to multiple recipients."""
-    logger.info(f"[EMAIL] Sending bulk email to {len(recipients)} recipients")
-    
-    results = []
-    for recipient in recipients:
-        # Queue individual emails for better retry handling
-        result = send_email.delay(
-            email_type="notification",
-            to=recipient,
+    """
+    Send bulk email to multiple recipients.
+    
+    Queues one send_email_batch task per EMAIL_BATCH_SIZE recipients
+    rather than one send_email task per recipient.
+    """
+    from app.config import get_settings
+    from app.mail import chunked
+    
+    batch_size = get_settings().email_batch_size
+    logger.info(f"[EMAIL] Sending bulk email to {len(recipients)} recipients in batches of {batch_size}")
+    
+    batches = [
+        send_email_batch.delay(
+            recipients=list(batch),
             subject=subject,
-            tenant_id=tenant_id,
-            template_data=template_data,
             template_id=template_id,
+            template_data=template_data,
+            tenant_id=tenant_id,
+        ).id
+        for batch in chunked(recipients, batch_size)
+    ]
+    
+    return {"queued": len(recipients), "batches": batches}
+
+
+@shared_task(
+    bind=True,
+    name="app.jobs.tasks.send_email_batch",
+    queue="email",
+    max_retries=None,  # bounded per recipient by EMAIL_MAX_ATTEMPTS
+    time_limit=600,  # 10 minute limit; an unreachable server aborts the batch well before
+)
+def send_email_batch(
+    self,
+    recipients: List[str],
+    subject: str,
+    template_id: Optional[str],
+    template_data: Dict[str, Any],
+    tenant_id: str,
+    attempts: Optional[Dict[str, int]] = None,
+    sent: int = 0,
+    failed: Optional[List[Dict[str, Any]]] = None,
+):
+    """
+    Send one rendered email to a batch of recipients.
+    
+    The message is rendered once (per recipient only for stored templates
+    with per-user smart tags) and sent over the worker's pooled
+    transport. Recipients that fail transiently are retried together with
+    backoff, each up to EMAIL_MAX_ATTEMPTS; the retry carries only those
+    recipients plus the running counts. When the server cannot be reached
+    the batch stops at once and all unsent recipients are retried.
+    
+    Args:
+        recipients: Addresses still to send to
+        subject: Email subject
+        template_id: Stored notification template, if any (else the bodies
+            in template_data are used)
+        template_data: Bodies (text/body, html) and placeholder/tag values
+        tenant_id: Tenant ID
+        attempts: Attempts so far per recipient (set on retries)
+        sent: Recipients delivered by earlier attempts
+        failed: Recipients given up on by earlier attempts
+    """
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.mail import deliver, get_transport, render_bulk
+    from app.mail.delivery import render_stored
+    from app.rendering import RenderContext
+    
+    settings = get_settings()
+    attempts = dict(attempts or {})
+    failed = list(failed or [])
+    
+    async def _render_stored():
+        async with engine.connect() as conn:
+            return await render_stored(
+                conn, tenant_id, template_id, {to: RenderContext(email=to) for to in recipients},
+                template_data, settings.app_base_url,
+            )
+    
+    rendered = run_async(_render_stored()) if template_id else None
+    if rendered is None:
+        rendered = render_bulk(subject, template_data)
+    headers = {"X-Tenant-Id": tenant_id}
+    if template_id:
+        headers["X-Template-Id"] = template_id
+    result = deliver(get_transport(), settings.email_from, recipients, rendered, headers=headers)
+    sent += len(result.sent)
+    
+    for to, error in result.permanent.items():
+        failed.append({"to": to, "error": error, "attempts": attempts.get(to, 0) + 1})
+    retry: Dict[str, int] = {}
+    for to, error in result.transient.items():
+        attempts[to] = attempts.get(to, 0) + 1
+        if attempts[to] >= settings.email_max_attempts:
+            failed.append({"to": to, "error": error, "attempts": attempts[to]})
+        else:
+            retry[to] = attempts[to]
+    
+    logger.info(
+        f"[EMAIL] Batch: {len(result.sent)} sent, {len(retry)} to retry, "
+        f"{len(failed)} failed (attempt {self.request.retries + 1})"
+    )
+    
+    if retry:
+        raise self.retry(
+            kwargs={
+                "recipients": list(retry),
+                "subject": subject,
+                "template_id": template_id,
+                "template_data": template_data,
+                "tenant_id": tenant_id,
+                "attempts": retry,
+                "sent": sent,
+                "failed": failed,
+            },
+            countdown=min(5 * 2 ** self.request.retries, 600),
         )
-        results.append({"to": recipient, "task_id": result.id})
     
-    return {"queued": len(results), "results": results}
+    return {"success": not failed, "sent": sent, "failed": failed}
 
 
 # ============= Notification Tasks =============
@@ -147,6 +267,8 @@ def notify_user(
     """
     Create an in-app notification for a user.
     
+    Prefer notify_batch for more than one recipient.
+    
     Args:
         notification_type: Type (in_app, push, email)
         recipient_id: User ID to notify
@@ -159,8 +281,15 @@ def notify_user(
     logger.info(f"[NOTIFICATION] {notification_type} to {recipient_id}: {title}")
     
     try:
-        # TODO: Create notification record in database
-        # TODO: Send push notification if type is 'push'
+        notify_batch([{
+            "notification_type": notification_type,
+            "recipient_id": recipient_id,
+            "tenant_id": tenant_id,
+            "title": title,
+            "body": body,
+            "link": link,
+            "metadata": metadata,
+        }])
         
         return {
             "success": True,
@@ -179,16 +308,187 @@ def notify_user(
     queue="notification",
 )
 def notify_batch(notifications: List[Dict[str, Any]]):
-    """Send batch notifications."""
-    results = []
-    for notif in notifications:
-        result = notify_user.delay(**notif)
-        results.append(result.id)
-    return {"queued": len(results)}
+    """
+    Send batch notifications.
+    
+    Lists longer than NOTIFICATION_BATCH_SIZE are split into one task per
+    batch. A batch is written with one INSERT per tenant, then push/email
+    side effects are coalesced per recipient (see app.notifications.fanout).
+    
+    Args:
+        notifications: notify_user keyword arguments, one dict per notification
+    """
+    from datetime import datetime, timezone
+    
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.mail import chunked
+    from app.notifications.fanout import (
+        OutgoingNotification,
+        coalesce_side_effects,
+        group_by_tenant,
+        group_identical,
+        recipient_emails,
+        write_notifications,
+    )
+    
+    settings = get_settings()
+    if len(notifications) > settings.notification_batch_size:
+        batches = [notify_batch.delay(list(batch)).id for batch in chunked(notifications, settings.notification_batch_size)]
+        logger.info(f"[NOTIFICATION] Split {len(notifications)} notifications into {len(batches)} batches")
+        return {"queued": len(notifications), "batches": batches}
+    
+    by_tenant = group_by_tenant(OutgoingNotification.from_dict(n) for n in notifications)
+    side_effects = {tenant_id: coalesce_side_effects(items) for tenant_id, items in by_tenant.items()}
+    
+    async def _write():
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        async with engine.begin() as conn:
+            for tenant_id, items in by_tenant.items():
+                await write_notifications(conn, tenant_id, items, now)
+        emails = {}
+        async with engine.connect() as conn:
+            for tenant_id, messages in side_effects.items():
+                if messages["email"]:
+                    emails[tenant_id] = await recipient_emails(conn, tenant_id, [m.recipient_id for m in messages["email"]])
+        return emails
+    
+    emails = run_async(_write())
+    
+    pushed = emailed = 0
+    for tenant_id, messages in side_effects.items():
+        # No push provider is configured; coalesced pushes are only counted
+        pushed += len(messages["push"])
+        addresses = emails.get(tenant_id, {})
+        for (subject, body), recipient_ids in group_identical(messages["email"]).items():
+            recipients = [addresses[r] for r in recipient_ids if r in addresses]
+            for batch in chunked(recipients, settings.email_batch_size):
+                send_email_batch.delay(
+                    recipients=list(batch),
+                    subject=subject,
+                    template_id=None,
+                    template_data={"body": body},
+                    tenant_id=tenant_id,
+                )
+            emailed += len(recipients)
+    
+    logger.info(f"[NOTIFICATION] Wrote {len(notifications)} notifications ({pushed} push, {emailed} email)")
+    return {"written": len(notifications), "push": pushed, "email": emailed}
+
+
+@shared_task(
+    name="app.jobs.tasks.notify_course",
+    queue="notification",
+    max_retries=2,
+)
+def notify_course(
+    tenant_id: str,
+    course_id: str,
+    title: str,
+    body: str,
+    link: Optional[str] = None,
+    notification_type: str = "in_app",
+    metadata: Optional[Dict[str, Any]] = None,
+):
+    """
+    Notify every learner enrolled in a course (announcements).
+    
+    Pages through the enrollments by user id and queues one notify_batch
+    task per NOTIFICATION_BATCH_SIZE recipients.
+    """
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.notifications.fanout import course_recipients_page
+    
+    page_size = get_settings().notification_batch_size
+    
+    async def _fan_out():
+        batches = []
+        recipients = 0
+        after = None
+        async with engine.connect() as conn:
+            while page := await course_recipients_page(conn, tenant_id, course_id, after, page_size):
+                batches.append(notify_batch.delay([
+                    {
+                        "notification_type": notification_type,
+                        "recipient_id": user_id,
+                        "tenant_id": tenant_id,
+                        "title": title,
+                        "body": body,
+                        "link": link,
+                        "metadata": metadata,
+                    }
+                    for user_id in page
+                ]).id)
+                recipients += len(page)
+                after = page[-1]
+        return recipients, batches
+    
+    recipients, batches = run_async(_fan_out())
+    logger.info(f"[NOTIFICATION] Course {course_id}: {recipients} recipients in {len(batches)} batches")
+    return {"recipients": recipients, "batches": batches}
 
 
 # ============= Certificate Tasks =============
 
+def _issue_and_queue(
+    tenant_id: str,
+    scope: str,
+    target_ids: Optional[List[str]],
+    user_ids: Optional[List[str]],
+    recover: bool = False,
+) -> tuple[int, List[str]]:
+    """
+    Issue a scope's missing certificates and queue their rendering in batches.
+    
+    Issues are committed before their render is queued, so a failed queue
+    (or a worker lost in between) leaves them unrendered and no longer
+    eligible. With `recover`, the scope's issues without a recorded PDF are
+    queued too.
+    """
+    from app.certificates import evaluate_eligibility, unrendered_issues
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.mail import chunked
+    
+    settings = get_settings()
+    render_tasks: List[str] = []
+    queued: set = set()
+    
+    async def _queue(issue_ids):
+        for batch in chunked(issue_ids, settings.certificate_render_batch_size):
+            render_tasks.append(certificate_generate_pdfs.delay(list(batch), tenant_id).id)
+        queued.update(issue_ids)
+    
+    async def _on_batch(page):
+        await _queue([issue_id for issue_id, _, _ in page])
+    
+    async def _issue():
+        issued = await evaluate_eligibility(
+            engine, tenant_id, scope, target_ids, user_ids,
+            batch_size=settings.certificate_issue_batch_size, on_batch=_on_batch,
+        )
+        if recover and target_ids:
+            page_size = settings.certificate_issue_batch_size
+            after = ""
+            async with engine.connect() as conn:
+                while True:
+                    page = await unrendered_issues(conn, tenant_id, scope, target_ids, user_ids, after, page_size)
+                    pending = [issue_id for issue_id in page if issue_id not in queued]
+                    if pending:
+                        logger.info(f"[CERTIFICATE] Re-queueing {len(pending)} unrendered {scope} certificates")
+                        await _queue(pending)
+                    if len(page) < page_size:
+                        break
+                    after = page[-1]
+        return issued
+    
+    return run_async(_issue()), render_tasks
+
+
 @shared_task(
     bind=True,
     name="app.jobs.tasks.certificate_check_eligibility",
@@ -204,23 +504,22 @@ def certificate_check_eligibility(
     """
     Check if user is eligible for a certificate.
     
-    If eligible, queues PDF generation.
+    Issues the certificate if the enrollment is completed, the course has a
+    certificate template and none was issued yet, then queues rendering.
     """
     logger.info(f"[CERTIFICATE] Checking eligibility for user={user_id} course={course_id}")
     
     try:
-        # TODO: Query enrollment status and completion
-        # TODO: Check certificate template exists for course
-        
-        is_eligible = False  # Placeholder
+        # A retry also queues the render the failed attempt may not have
+        issued, _ = _issue_and_queue(
+            tenant_id, "course", [course_id], [user_id], recover=self.request.retries > 0,
+        )
         
-        if is_eligible:
+        if issued:
             logger.info(f"[CERTIFICATE] User {user_id} eligible for certificate")
-            # Queue PDF generation
-            # certificate_generate_pdf.delay(...)
         
         return {
-            "eligible": is_eligible,
+            "eligible": bool(issued),
             "user_id": user_id,
             "course_id": course_id,
         }
@@ -230,6 +529,117 @@ def certificate_check_eligibility(
         raise self.retry(exc=exc)
 
 
+@shared_task(
+    bind=True,
+    name="app.jobs.tasks.certificate_evaluate",
+    queue="certificate",
+    max_retries=3,
+)
+def certificate_evaluate(
+    self,
+    tenant_id: str,
+    course_ids: Optional[List[str]] = None,
+    path_ids: Optional[List[str]] = None,
+    user_ids: Optional[List[str]] = None,
+):
+    """
+    Issue every certificate earned in a batch of courses and/or learning paths.
+    
+    Eligibility is evaluated set-wise (see app.certificates.eligibility), a
+    page of CERTIFICATE_ISSUE_BATCH_SIZE issues per statement, and rendering
+    is queued CERTIFICATE_RENDER_BATCH_SIZE issues per task. Re-running is
+    safe: issued certificates are no longer eligible, and issues of the
+    courses/paths that still have no PDF are queued for rendering again.
+    
+    Args:
+        tenant_id: Tenant ID
+        course_ids: Courses to evaluate
+        path_ids: Learning paths to evaluate
+        user_ids: Limit evaluation to these learners (default: everyone)
+    """
+    logger.info(f"[CERTIFICATE] Evaluating courses={course_ids} paths={path_ids} tenant={tenant_id}")
+    
+    try:
+        issued, render_tasks = 0, []
+        for scope, target_ids in (("course", course_ids), ("path", path_ids)):
+            if target_ids:
+                count, batches = _issue_and_queue(tenant_id, scope, target_ids, user_ids, recover=True)
+                issued += count
+                render_tasks += batches
+        
+        logger.info(f"[CERTIFICATE] Issued {issued} certificates in {len(render_tasks)} render batches")
+        return {"issued": issued, "render_tasks": render_tasks}
+        
+    except Exception as exc:
+        logger.exception(f"[CERTIFICATE] Eligibility evaluation failed")
+        raise self.retry(exc=exc)
+
+
+def _render_certificates(issue_ids: List[str], tenant_id: str):
+    """Render a batch of issues to PDFs on the worker's render pool and record their paths."""
+    from concurrent.futures.process import BrokenProcessPool
+    from datetime import datetime, timezone
+    
+    from app.config import get_settings
+    from app.certificates import get_render_pool, record_pdfs, render_certificate_html
+    from app.certificates.pdf import reset_render_pool
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    
+    async def _render():
+        async with engine.connect() as conn:
+            return await render_certificate_html(conn, tenant_id, issue_ids, get_settings().app_base_url)
+    
+    html = run_async(_render())
+    try:
+        result = get_render_pool().render(tenant_id, html)
+    except BrokenProcessPool:
+        reset_render_pool()  # the retry starts a fresh pool
+        raise
+    
+    async def _record():
+        async with engine.begin() as conn:
+            await record_pdfs(conn, tenant_id, result.paths, datetime.now(timezone.utc).replace(tzinfo=None))
+    
+    run_async(_record())
+    return result
+
+
+@shared_task(
+    bind=True,
+    name="app.jobs.tasks.certificate_generate_pdfs",
+    queue="certificate",
+    max_retries=3,
+)
+def certificate_generate_pdfs(
+    self,
+    certificate_issue_ids: List[str],
+    tenant_id: str,
+):
+    """
+    Generate the PDF certificates of a batch of issues.
+    
+    The batch's HTML is rendered with one issue query and one smart-tag
+    query (see app.certificates.render), then converted on the worker's
+    warm renderer pool; documents whose content hash already has a PDF are
+    not rendered again (see app.certificates.pdf). Each issue's PDF path is
+    recorded in certificate_pdfs (see app.certificates.files).
+    """
+    logger.info(f"[CERTIFICATE] Generating {len(certificate_issue_ids)} PDFs tenant={tenant_id}")
+    
+    try:
+        result = _render_certificates(certificate_issue_ids, tenant_id)
+        missing = [issue_id for issue_id in certificate_issue_ids if issue_id not in result.paths]
+        if missing:
+            logger.warning(f"[CERTIFICATE] Issues or templates not found: {missing}")
+        
+        return {"rendered": result.rendered, "reused": result.reused, "missing": missing, "files": result.paths}
+        
+    except Exception as exc:
+        logger.exception(f"[CERTIFICATE] PDF batch generation failed")
+        raise self.retry(exc=exc)
+
+
 @shared_task(
     bind=True,
     name="app.jobs.tasks.certificate_generate_pdf",
@@ -246,21 +656,21 @@ def certificate_generate_pdf(
     """
     Generate PDF certificate.
     
-    Uses the certificate template and user data to generate PDF.
+    Single-issue form of certificate_generate_pdfs. The issue's PDF path is
+    recorded in certificate_pdfs (see app.certificates.files).
     """
     logger.info(f"[CERTIFICATE] Generating PDF for issue={certificate_issue_id}")
     
     try:
-        # TODO: Fetch certificate issue record
-        # TODO: Load template
-        # TODO: Generate PDF (WeasyPrint, Puppeteer, etc.)
-        # TODO: Upload to S3
-        # TODO: Update certificate issue with PDF URL
+        path = _render_certificates([certificate_issue_id], tenant_id).paths.get(certificate_issue_id)
+        if path is None:
+            logger.warning(f"[CERTIFICATE] Issue {certificate_issue_id} or its template not found")
+            return {"success": False, "certificate_issue_id": certificate_issue_id, "reason": "Not found"}
         
         return {
             "success": True,
             "certificate_issue_id": certificate_issue_id,
-            "pdf_url": None,  # TODO: Return actual URL
+            "pdf_path": path,
         }
         
     except Exception as exc:
@@ -276,6 +686,7 @@ def certificate_generate_pdf(
     queue="import",
     max_retries=1,  # Imports should not auto-retry
     time_limit=1800,  # 30 minute limit for large imports
+    soft_time_limit=1740,
 )
 def import_users(
     self,
@@ -288,71 +699,332 @@ def import_users(
     """
     Process bulk user import from CSV.
     
+    Streams the file in batches (see app.imports.users), checkpointing
+    after every committed batch so a redelivered or re-queued job resumes
+    where it stopped. Publishes PROGRESS state with rows processed and ETA.
+    
     Args:
         import_job_id: ID of the ImportJob record
         file_path: Path to uploaded CSV file
         tenant_id: Tenant ID
         user_id: User who initiated import
-        options: Import options (skip_existing, update_existing, etc.)
+        options: Import options (skip_existing, update_existing, default_role, default_node_id)
     """
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timezone
+    
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.imports.common import (
+        clear_checkpoint,
+        count_rows,
+        final_status,
+        load_checkpoint,
+        save_checkpoint,
+        update_import_job,
+    )
+    from app.imports.users import UserImportOptions, import_users_file
+    from app.jobs.progress import ProgressReporter
+    from app.jobs.runtime import run_async
+    
     logger.info(f"[IMPORT] Processing user import job={import_job_id}")
     
-    options = options or {}
-    success_count = 0
-    failure_count = 0
-    errors = []
+    settings = get_settings()
+    redis = get_sync_redis()
+    checkpoint = load_checkpoint(redis, import_job_id)
+    if checkpoint:
+        logger.info(f"[IMPORT] Resuming job {import_job_id} after row {checkpoint.last_row}")
+    
+    total_rows = count_rows(file_path)
+    progress = ProgressReporter(self, total=total_rows, stage="importing")
+    
+    def on_batch(stats):
+        save_checkpoint(redis, import_job_id, stats)
+        progress.update(stats.last_row)
+    
+    async def _import():
+        async with engine.begin() as conn:
+            await update_import_job(conn, import_job_id, tenant_id, "PROCESSING", checkpoint, total_rows)
+        with ThreadPoolExecutor(max_workers=settings.import_hash_workers) as executor:
+            stats = await import_users_file(
+                engine,
+                import_job_id,
+                file_path,
+                tenant_id,
+                UserImportOptions.from_dict(options),
+                batch_size=settings.import_batch_size,
+                executor=executor,
+                stats=checkpoint,
+                on_batch=on_batch,
+            )
+        async with engine.begin() as conn:
+            await update_import_job(
+                conn, import_job_id, tenant_id, final_status(stats), stats, total_rows,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+        return stats
+    
+    async def _mark_failed():
+        async with engine.begin() as conn:
+            await update_import_job(
+                conn, import_job_id, tenant_id, "FAILED", load_checkpoint(redis, import_job_id), total_rows,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
     
     try:
-        # TODO: Update job status to PROCESSING
-        # TODO: Read and parse CSV file
-        # TODO: Validate each row
-        # TODO: Insert/update users
-        # TODO: Update job status to COMPLETED/PARTIAL/FAILED
-        
-        return {
-            "success": True,
-            "import_job_id": import_job_id,
-            "processed": success_count + failure_count,
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "errors": errors,
-        }
-        
+        stats = run_async(_import())
     except Exception as exc:
         logger.exception(f"[IMPORT] Import job {import_job_id} failed")
-        # TODO: Update job status to FAILED
+        try:
+            run_async(_mark_failed())
+        except Exception:
+            logger.exception(f"[IMPORT] Could not mark import job {import_job_id} as failed")
         raise
+    
+    clear_checkpoint(redis, import_job_id)
+    logger.info(
+        f"[IMPORT] Job {import_job_id}: {stats.success} imported, {stats.skipped} skipped, {stats.failed} failed"
+    )
+    
+    return {
+        "success": True,
+        "import_job_id": import_job_id,
+        "processed": stats.processed,
+        "success_count": stats.success,
+        "skipped_count": stats.skipped,
+        "failure_count": stats.failed,
+        "errors": stats.errors,
+    }
 
 
 @shared_task(
+    bind=True,
     name="app.jobs.tasks.import_enrollments",
     queue="import",
     max_retries=1,
     time_limit=1800,
+    soft_time_limit=1740,
 )
 def import_enrollments(
+    self,
     import_job_id: str,
     file_path: str,
     tenant_id: str,
     user_id: str,
     options: Optional[Dict[str, Any]] = None,
 ):
-    """Process bulk enrollment import from CSV."""
+    """
+    Process bulk enrollment import from CSV.
+    
+    Streams the file in batches (see app.imports.enrollments): one joined
+    lookup and one insert per batch, one audit record per committed batch,
+    and failed rows written to a per-row error report. Checkpoints and
+    progress work as in import_users.
+    
+    Args:
+        import_job_id: ID of the ImportJob record
+        file_path: Path to uploaded CSV file (columns: email, courseCode)
+        tenant_id: Tenant ID
+        user_id: User who initiated import
+        options: Unused; accepted for parity with import_users
+    """
+    import os
+    from datetime import datetime, timezone
+    
+    from app.audit import log_audit
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.imports.common import (
+        ErrorFile,
+        clear_checkpoint,
+        count_rows,
+        final_status,
+        load_checkpoint,
+        save_checkpoint,
+        update_import_job,
+    )
+    from app.imports.enrollments import ERROR_COLUMNS, import_enrollments_file
+    from app.jobs.progress import ProgressReporter
+    from app.jobs.runtime import run_async
+    
     logger.info(f"[IMPORT] Processing enrollment import job={import_job_id}")
     
-    # TODO: Similar to import_users
+    settings = get_settings()
+    redis = get_sync_redis()
+    checkpoint = load_checkpoint(redis, import_job_id)
+    if checkpoint:
+        logger.info(f"[IMPORT] Resuming job {import_job_id} after row {checkpoint.last_row}")
     
-    return {"success": True, "import_job_id": import_job_id}
+    total_rows = count_rows(file_path)
+    progress = ProgressReporter(self, total=total_rows, stage="importing")
+    error_path = os.path.join(settings.import_results_dir, tenant_id, f"{import_job_id}-errors.csv")
+    
+    def on_batch(stats):
+        save_checkpoint(redis, import_job_id, stats)
+        progress.update(stats.last_row)
+    
+    async def _import():
+        async with engine.begin() as conn:
+            await update_import_job(conn, import_job_id, tenant_id, "PROCESSING", checkpoint, total_rows)
+        error_file = ErrorFile(error_path, ERROR_COLUMNS, checkpoint.error_file_bytes if checkpoint else 0)
+        try:
+            stats = await import_enrollments_file(
+                engine,
+                import_job_id,
+                file_path,
+                tenant_id,
+                user_id,
+                batch_size=settings.import_batch_size,
+                error_file=error_file,
+                audit=log_audit,
+                stats=checkpoint,
+                on_batch=on_batch,
+            )
+        finally:
+            error_file.close()
+        async with engine.begin() as conn:
+            await update_import_job(
+                conn, import_job_id, tenant_id, final_status(stats), stats, total_rows,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+        return stats
+    
+    async def _mark_failed():
+        async with engine.begin() as conn:
+            await update_import_job(
+                conn, import_job_id, tenant_id, "FAILED", load_checkpoint(redis, import_job_id), total_rows,
+                completed_at=datetime.now(timezone.utc).replace(tzinfo=None),
+            )
+    
+    try:
+        stats = run_async(_import())
+    except Exception as exc:
+        logger.exception(f"[IMPORT] Import job {import_job_id} failed")
+        try:
+            run_async(_mark_failed())
+        except Exception:
+            logger.exception(f"[IMPORT] Could not mark import job {import_job_id} as failed")
+        raise
+    
+    clear_checkpoint(redis, import_job_id)
+    logger.info(f"[IMPORT] Job {import_job_id}: {stats.success} enrolled, {stats.failed} failed")
+    
+    return {
+        "success": True,
+        "import_job_id": import_job_id,
+        "processed": stats.processed,
+        "success_count": stats.success,
+        "failure_count": stats.failed,
+        "errors": stats.errors,
+        "error_file": error_path if stats.failed else None,
+    }
+
+
+# ============= Enrollment Tasks =============
+
+@shared_task(
+    name="app.jobs.tasks.enrollments_created",
+    queue="default",
+    max_retries=1,
+)
+def enrollments_created(
+    tenant_id: str,
+    actor_id: str,
+    enrollments: List[List[str]],
+):
+    """
+    Downstream work for a batch of new enrollments, as one job.
+    
+    Replaces a notification and a timeline event task per enrollment:
+    course titles are loaded in one query and the follow-up tasks run in
+    this worker rather than being queued one by one. No badge check runs:
+    badges depend only on points, and enrolling awards none.
+    
+    Args:
+        tenant_id: Tenant ID
+        actor_id: User who created the enrollments
+        enrollments: [enrollment id, user id, course id] triples
+    """
+    from sqlalchemy import text
+    
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.timeline import timeline_event
+    
+    logger.info(f"[ENROLLMENT] Fan-out for {len(enrollments)} enrollment(s) by {actor_id}")
+    
+    async def _course_titles():
+        course_ids = sorted({course_id for _, _, course_id in enrollments})
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                text('SELECT id, title FROM courses WHERE "tenantId" = :tenant_id AND id = ANY(:ids)'),
+                {"tenant_id": tenant_id, "ids": course_ids},
+            )
+            return dict(result.all())
+    
+    titles = run_async(_course_titles())
+    
+    notify_batch([
+        {
+            "notification_type": "in_app",
+            "recipient_id": user_id,
+            "tenant_id": tenant_id,
+            "title": "New enrollment",
+            "body": f"You have been enrolled in {titles.get(course_id, 'a course')}",
+            "link": f"/courses/{course_id}",
+            "metadata": {"enrollmentId": enrollment_id, "courseId": course_id},
+        }
+        for enrollment_id, user_id, course_id in enrollments
+    ])
+    record_timeline_events([
+        timeline_event(
+            tenant_id,
+            "ENROLLMENT_CREATED",
+            user_id=user_id,
+            course_id=course_id,
+            details={"enrollmentId": enrollment_id},
+        )
+        for enrollment_id, user_id, course_id in enrollments
+    ])
+    users = len({user_id for _, user_id, _ in enrollments})
+    
+    return {"success": True, "enrollments": len(enrollments), "users": users}
 
 
 # ============= Gamification Tasks =============
 
+def _schedule_badge_check(user_id: str, tenant_id: str) -> None:
+    """Queue one delayed badge check per burst of awards (see app.gamification.badge_checks)."""
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.gamification.badge_checks import clear_check_pending, mark_check_pending
+    
+    delay = get_settings().gamification_badge_check_delay_seconds
+    redis = get_sync_redis()
+    try:
+        if not mark_check_pending(redis, tenant_id, user_id, delay):
+            return
+    except Exception:
+        logger.warning("[GAMIFICATION] Pending marker unavailable, checking badges now", exc_info=True)
+        gamification_check_badges.delay(user_id, tenant_id)
+        return
+    try:
+        gamification_check_badges.apply_async((user_id, tenant_id), countdown=delay)
+    except Exception:
+        clear_check_pending(redis, tenant_id, user_id)
+        raise
+
+
 @shared_task(
+    bind=True,
     name="app.jobs.tasks.gamification_award_points",
     queue="gamification",
     max_retries=3,
 )
 def gamification_award_points(
+    self,
     user_id: str,
     tenant_id: str,
     action: str,
@@ -362,6 +1034,12 @@ def gamification_award_points(
     """
     Award points to a user.
     
+    The ledger entry and the user's running total/level (user_points) are
+    written in one statement; a retry of the same task is not credited
+    twice (see app.gamification.ledger). The new total is then set on the
+    user's tenant and branch leaderboards, and a badge check is scheduled
+    unless one is already pending for the user.
+    
     Args:
         user_id: User to award points to
         tenant_id: Tenant ID
@@ -369,20 +1047,44 @@ def gamification_award_points(
         points: Number of points to award
         metadata: Additional context
     """
+    from datetime import datetime, timezone
+    
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.gamification import award_points, update_score
+    from app.gamification.leaderboard import user_branch
+    from app.jobs.runtime import run_async
+    
     logger.info(f"[GAMIFICATION] Awarding {points} points to {user_id} for {action}")
     
+    async def _award():
+        async with engine.begin() as conn:
+            summary = await award_points(
+                conn, tenant_id, user_id, points, action,
+                datetime.now(timezone.utc).replace(tzinfo=None), award_key=self.request.id,
+            )
+            branch_id = await user_branch(conn, tenant_id, user_id) if summary is not None else None
+        return summary, branch_id
+    
     try:
-        # TODO: Insert into points_ledger
-        # TODO: Trigger badge check
+        summary, branch_id = run_async(_award())
         
-        # Queue badge check
-        gamification_check_badges.delay(user_id, tenant_id)
+        if summary is not None:
+            try:
+                update_score(get_sync_redis(), tenant_id, branch_id, user_id, summary.total_points)
+            except Exception:
+                # Leaderboards are derived; gamification_rebuild_leaderboards repairs them
+                logger.warning(f"[GAMIFICATION] Leaderboard update failed for {user_id}", exc_info=True)
+            
+            _schedule_badge_check(user_id, tenant_id)
         
         return {
             "success": True,
             "user_id": user_id,
             "points": points,
             "action": action,
+            "total_points": summary.total_points if summary else None,
+            "level": summary.level if summary else None,
         }
         
     except Exception as exc:
@@ -396,18 +1098,38 @@ def gamification_award_points(
     max_retries=3,
 )
 def gamification_check_badges(user_id: str, tenant_id: str):
-    """Check and award badges based on user's achievements."""
+    """
+    Check and award badges based on user's achievements.
+    
+    Queued once per burst of point awards (see _schedule_badge_check).
+    """
+    from datetime import datetime, timezone
+    
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.gamification import check_badges
+    from app.gamification.badge_checks import clear_check_pending
+    from app.jobs.runtime import run_async
+    
     logger.info(f"[GAMIFICATION] Checking badges for {user_id}")
     
+    async def _check():
+        async with engine.begin() as conn:
+            return await check_badges(conn, tenant_id, [user_id], datetime.now(timezone.utc).replace(tzinfo=None))
+    
+    try:
+        # Awards from now on schedule a new check (the marker also expires)
+        clear_check_pending(get_sync_redis(), tenant_id, user_id)
+    except Exception:
+        logger.warning(f"[GAMIFICATION] Could not clear pending badge check for {user_id}", exc_info=True)
+    
     try:
-        # TODO: Query user's total points
-        # TODO: Query badge thresholds
-        # TODO: Award any newly qualified badges
+        awarded = run_async(_check())
         
         return {
             "success": True,
             "user_id": user_id,
-            "badges_awarded": [],
+            "badges_awarded": [badge_id for _, badge_id in awarded],
         }
         
     except Exception as exc:
@@ -419,19 +1141,87 @@ def gamification_check_badges(user_id: str, tenant_id: str):
     name="app.jobs.tasks.gamification_recalculate",
     queue="gamification",
 )
-def gamification_recalculate(user_id: str, tenant_id: str):
-    """Recalculate all gamification data for a user."""
-    logger.info(f"[GAMIFICATION] Recalculating for {user_id}")
+def gamification_recalculate(user_id: Optional[str], tenant_id: str):
+    """
+    Recalculate all gamification data for a user (None: the whole tenant).
+    
+    Rebuilds running totals and levels from points_ledger with one grouped
+    statement, then rechecks badge eligibility against them.
+    """
+    from datetime import datetime, timezone
+    
+    from app.db.session import engine
+    from app.gamification import check_badges, rebuild_points
+    from app.jobs.runtime import run_async
+    
+    logger.info(f"[GAMIFICATION] Recalculating for {user_id or f'tenant {tenant_id}'}")
+    user_ids = [user_id] if user_id else None
     
-    # TODO: Recalculate total points
-    # TODO: Recheck all badge eligibility
-    # TODO: Update user level
+    async def _recalculate():
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        async with engine.begin() as conn:
+            users = await rebuild_points(conn, tenant_id, user_ids, now)
+            awarded = await check_badges(conn, tenant_id, user_ids, now)
+        return users, awarded
     
-    return {"success": True, "user_id": user_id}
+    users, awarded = run_async(_recalculate())
+    
+    return {"success": True, "user_id": user_id, "users": users, "badges_awarded": len(awarded)}
+
+
+@shared_task(
+    name="app.jobs.tasks.gamification_rebuild_leaderboards",
+    queue="gamification",
+)
+def gamification_rebuild_leaderboards(tenant_id: str):
+    """Reseed a tenant's Redis leaderboards from the points summaries."""
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.gamification import rebuild_leaderboards
+    from app.jobs.runtime import run_async
+    
+    logger.info(f"[GAMIFICATION] Rebuilding leaderboards for tenant {tenant_id}")
+    
+    async def _rebuild():
+        async with engine.connect() as conn:
+            return await rebuild_leaderboards(conn, get_sync_redis(), tenant_id)
+    
+    ranked = run_async(_rebuild())
+    
+    return {"success": True, "tenant_id": tenant_id, "ranked": ranked}
 
 
 # ============= Timeline Tasks =============
 
+def record_timeline_events(events: List[Dict[str, Any]]) -> None:
+    """Buffer timeline events for batched writing (see app.timeline.buffer)."""
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.timeline import buffer_events, flush_due
+    
+    if not events:
+        return
+    try:
+        length = buffer_events(get_sync_redis(), events)
+    except Exception:
+        logger.warning("[TIMELINE] Buffer unavailable, writing events directly", exc_info=True)
+        _write_timeline_events(events)
+        return
+    if flush_due(length, len(events), get_settings().timeline_flush_batch_size):
+        timeline_flush.delay()
+
+
+def _write_timeline_events(events: List[Dict[str, Any]]) -> int:
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.timeline import write_batch
+    
+    written, rejected = run_async(write_batch(engine, events))
+    if rejected:
+        logger.warning(f"[TIMELINE] Dropped {len(rejected)} event(s) rejected by the database")
+    return written
+
+
 @shared_task(
     name="app.jobs.tasks.timeline_add_event",
     queue="timeline",
@@ -448,6 +1238,10 @@ def timeline_add_event(
     """
     Add an event to user's timeline.
     
+    The event is buffered and written by timeline_flush with others; new
+    callers should record events with record_timeline_events (or push them
+    to the buffer from request handlers) instead of queueing this task.
+    
     Args:
         user_id: User whose timeline to update
         tenant_id: Tenant ID
@@ -456,28 +1250,100 @@ def timeline_add_event(
         enrollment_id: Related enrollment ID
         details: Additional event details
     """
+    from app.timeline import timeline_event
+    
     if not tenant_id:
         logger.warning(f"[TIMELINE] Skipping event {event_type} - missing tenant_id")
         return {"success": False, "reason": "Missing tenant_id"}
     
-    logger.info(f"[TIMELINE] Adding {event_type} for {user_id}")
+    if enrollment_id:
+        details = {**(details or {}), "enrollmentId": enrollment_id}
+    event = timeline_event(tenant_id, event_type, user_id=user_id, course_id=course_id, details=details)
+    record_timeline_events([event])
     
-    try:
-        # TODO: Insert timeline_event record
-        
-        return {
-            "success": True,
-            "user_id": user_id,
-            "event_type": event_type,
-        }
-        
-    except Exception as exc:
-        logger.exception(f"[TIMELINE] Failed to add event")
-        raise
+    return {
+        "success": True,
+        "user_id": user_id,
+        "event_type": event_type,
+        "event_id": event["id"],
+    }
+
+
+@shared_task(
+    name="app.jobs.tasks.timeline_flush",
+    queue="timeline",
+    max_retries=0,
+)
+def timeline_flush(max_batches: Optional[int] = None):
+    """
+    Write buffered timeline events, one INSERT per batch.
+    
+    Queued when a producer fills a batch and run by Celery beat every
+    TIMELINE_FLUSH_SECONDS. A batch that cannot be written (database
+    unavailable) is returned to the buffer for the next flush; events the
+    database rejects are moved to the dead-letter list.
+    
+    Args:
+        max_batches: Batches to write before returning (default: TIMELINE_FLUSH_MAX_BATCHES)
+    """
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.timeline import dead_letter, return_batch, take_batch, write_batch
+    
+    settings = get_settings()
+    redis = get_sync_redis()
+    max_batches = max_batches or settings.timeline_flush_max_batches
+    
+    async def _flush():
+        written = rejected = batches = 0
+        while batches < max_batches:
+            events = take_batch(redis, settings.timeline_flush_batch_size)
+            if not events:
+                break
+            try:
+                batch_written, batch_rejected = await write_batch(engine, events)
+            except Exception:
+                return_batch(redis, events)
+                raise
+            if batch_rejected:
+                dead_letter(redis, batch_rejected)
+                logger.warning(f"[TIMELINE] Dead-lettered {len(batch_rejected)} rejected event(s)")
+            written += batch_written
+            rejected += len(batch_rejected)
+            batches += 1
+        return written, rejected, batches
+    
+    written, rejected, batches = run_async(_flush())
+    if batches:
+        logger.info(f"[TIMELINE] Flushed {written} event(s) in {batches} batch(es)")
+    
+    return {"success": True, "written": written, "rejected": rejected, "batches": batches}
 
 
 # ============= Report Tasks =============
 
+def _email_report(report_id: str, tenant_id: str, recipients: List[str], download_url: str, rows: int) -> None:
+    """Queue the report-ready email; a queueing failure does not fail the generated report."""
+    from app.config import get_settings
+    from app.mail import chunked
+    
+    settings = get_settings()
+    body = f"Your report {report_id} is ready ({rows} rows). Download it at {settings.app_base_url}{download_url}"
+    try:
+        for batch in chunked(recipients, settings.email_batch_size):
+            send_email_batch.delay(
+                recipients=list(batch),
+                subject=f"Report ready: {report_id}",
+                template_id=None,
+                template_data={"body": body},
+                tenant_id=tenant_id,
+            )
+    except Exception:
+        logger.exception(f"[REPORT] Could not queue report email for {report_id}")
+
+
 @shared_task(
     bind=True,
     name="app.jobs.tasks.report_generate",
@@ -493,37 +1359,90 @@ def report_generate(
     format: str = "xlsx",
     filters: Optional[Dict[str, Any]] = None,
     recipients: Optional[List[str]] = None,
+    cache_key: Optional[str] = None,
 ):
     """
     Generate a report.
     
+    Compiles the report's ruleset and streams the rows from a server-side
+    cursor into a file under REPORT_STORAGE_DIR, chunk by chunk, publishing
+    the running row count as PROGRESS state.
+    
     Args:
-        report_id: Report definition ID
+        report_id: Report definition ID or built-in report type
         tenant_id: Tenant ID
         user_id: User requesting report
-        format: Output format (csv, xlsx, pdf)
+        format: Output format (csv, xlsx, jsonl)
         filters: Report filters
-        recipients: Email recipients for scheduled reports
+        recipients: Addresses emailed a download link once the file is
+            written (one send_email_batch per EMAIL_BATCH_SIZE)
+        cache_key: Artifact cache key claimed by the caller; the file is
+            stored under it and the result published to the report cache
     """
+    from app.config import get_settings
+    from app.db.redis import get_sync_redis
+    from app.db.session import engine
+    from app.jobs.progress import ProgressReporter
+    from app.jobs.runtime import run_async
+    from app.reports.cache import publish, release
+    from app.reports.engine import artifact_path, generate_report, load_ruleset
+    
     logger.info(f"[REPORT] Generating report={report_id} as {format}")
+    progress = ProgressReporter(self, stage="writing")
+    
+    async def _generate():
+        async with engine.connect() as conn:
+            ruleset = await load_ruleset(conn, report_id, tenant_id)
+            path = artifact_path(tenant_id, cache_key or self.request.id or report_id, format)
+            return await generate_report(
+                conn, ruleset, tenant_id, format, path, filters, on_progress=progress.update
+            )
     
     try:
-        # TODO: Load report definition
-        # TODO: Execute query with filters
-        # TODO: Format output
-        # TODO: Save to S3
-        # TODO: Email recipients if specified
-        
+        artifact = run_async(_generate())
+    except ValueError as exc:
+        # Invalid ruleset or format: retrying will not help
+        logger.warning(f"[REPORT] Report {report_id} rejected: {exc}")
+        if cache_key:
+            release(get_sync_redis(), cache_key)
         return {
-            "success": True,
+            "success": False,
             "report_id": report_id,
-            "format": format,
-            "download_url": None,  # TODO: Return actual URL
+            "error": str(exc),
         }
-        
     except Exception as exc:
         logger.exception(f"[REPORT] Report generation failed")
+        if cache_key and self.request.retries >= self.max_retries:
+            release(get_sync_redis(), cache_key)
         raise self.retry(exc=exc, countdown=30)
+    
+    logger.info(
+        f"[REPORT] Report {report_id}: {artifact.rows} rows, {artifact.bytes} bytes in {artifact.seconds:.1f}s"
+    )
+    
+    download_url = f"/api/reports/{self.request.id}/download" if self.request.id else None
+    if recipients and download_url:
+        _email_report(report_id, tenant_id, recipients, download_url, artifact.rows)
+    
+    result = {
+        "success": True,
+        "report_id": report_id,
+        "tenant_id": tenant_id,
+        "format": artifact.format,
+        "rows": artifact.rows,
+        "bytes": artifact.bytes,
+        "content_type": artifact.content_type,
+        "path": artifact.path,
+        "download_url": download_url,
+    }
+    if cache_key:
+        publish(
+            get_sync_redis(),
+            cache_key,
+            {**result, "task_id": self.request.id},
+            get_settings().report_cache_ttl_seconds,
+        )
+    return result
 
 
 @shared_task(
@@ -546,6 +1465,124 @@ def report_export(
     )
 
 
+@shared_task(
+    name="app.jobs.tasks.report_refresh_dashboard_stats",
+    queue="report",
+    max_retries=2,
+)
+def report_refresh_dashboard_stats(tenant_id: Optional[str] = None):
+    """
+    Refresh the materialized dashboard statistics.
+    
+    Recomputes tenant_dashboard_stats for every tenant (or just one) in a
+    single set-based statement. Scheduled via Celery beat.
+    """
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.reports.dashboard import refresh_dashboard_stats
+    
+    async def _refresh():
+        async with engine.begin() as conn:
+            return await refresh_dashboard_stats(conn, tenant_id)
+    
+    rows = run_async(_refresh())
+    logger.info(f"[REPORT] Refreshed dashboard stats for {len(rows)} tenant(s)")
+    
+    return {
+        "success": True,
+        "tenants": len(rows),
+    }
+
+
+@shared_task(
+    name="app.jobs.tasks.report_evict_artifacts",
+    queue="report",
+    max_retries=0,
+)
+def report_evict_artifacts():
+    """
+    Delete generated report files older than REPORT_ARTIFACT_RETENTION_SECONDS.
+    
+    By then neither the report cache nor the task result references them.
+    Scheduled hourly via Celery beat.
+    """
+    from app.config import get_settings
+    from app.reports.cache import evict_artifacts
+    
+    settings = get_settings()
+    deleted = evict_artifacts(settings.report_storage_dir, settings.report_artifact_retention_seconds)
+    logger.info(f"[REPORT] Evicted {deleted} report artifact(s)")
+    
+    return {"success": True, "deleted": deleted}
+
+
+@shared_task(
+    name="app.jobs.tasks.report_refresh_activity_buckets",
+    queue="report",
+    max_retries=2,
+)
+def report_refresh_activity_buckets(days: Optional[int] = None, tenant_id: Optional[str] = None):
+    """
+    Recompute the trailing days of tenant_activity_daily from source rows.
+    
+    The buckets are kept current by triggers; this nightly pass corrects
+    any drift for the last `days` days (including today).
+    """
+    from datetime import datetime, timedelta, timezone
+    
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.reports.activity import recompute_activity
+    
+    days = days or get_settings().activity_refresh_days
+    end_day = datetime.now(timezone.utc).date() + timedelta(days=1)
+    start_day = end_day - timedelta(days=days)
+    
+    async def _refresh():
+        async with engine.begin() as conn:
+            return await recompute_activity(conn, start_day, end_day, tenant_id)
+    
+    rows = run_async(_refresh())
+    logger.info(f"[REPORT] Recomputed {rows} activity bucket(s) since {start_day}")
+    
+    return {
+        "success": True,
+        "buckets": rows,
+        "since": start_day.isoformat(),
+    }
+
+
+@shared_task(
+    name="app.jobs.tasks.report_refresh_login_buckets",
+    queue="report",
+    max_retries=2,
+)
+def report_refresh_login_buckets(tenant_id: Optional[str] = None):
+    """
+    Recount last-login users in tenant_activity_daily from users."lastLoginAt".
+    
+    Logins are not trigger-maintained (a trigger would lock the tenant's
+    bucket for today on every sign-in), so the activity report's active
+    users lag by up to ACTIVITY_LOGIN_REFRESH_SECONDS.
+    """
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    from app.reports.activity import refresh_logins
+    
+    async def _refresh():
+        async with engine.begin() as conn:
+            return await refresh_logins(conn, tenant_id=tenant_id)
+    
+    rows = run_async(_refresh())
+    logger.info(f"[REPORT] Recounted logins in {rows} activity bucket(s)")
+    
+    return {
+        "success": True,
+        "buckets": rows,
+    }
+
+
 # ============= Automation Tasks =============
 
 @shared_task(
@@ -627,3 +1664,44 @@ def automation_execute(
     except Exception as exc:
         logger.exception(f"[AUTOMATION] Execution failed")
         raise self.retry(exc=exc)
+
+
+# ============= Audit Tasks =============
+
+@shared_task(
+    name="app.jobs.tasks.audit_maintain_partitions",
+    max_retries=2,
+)
+def audit_maintain_partitions(retain_months: Optional[int] = None):
+    """
+    Maintain auth_audit_log monthly partitions.
+    
+    Creates partitions for the upcoming months and detaches/drops the ones
+    older than the retention window. Scheduled daily via Celery beat.
+    """
+    from app.audit.partitions import drop_expired_partitions, ensure_partitions
+    from app.config import get_settings
+    from app.db.session import engine
+    from app.jobs.runtime import run_async
+    
+    settings = get_settings()
+    retain = retain_months or settings.audit_retention_months
+    
+    async def _maintain():
+        async with engine.begin() as conn:
+            created = await ensure_partitions(
+                conn,
+                months_ahead=settings.audit_partitions_ahead,
+                tenant_hash_partitions=settings.audit_tenant_hash_partitions,
+            )
+            dropped = await drop_expired_partitions(conn, retain)
+        return created, dropped
+    
+    created, dropped = run_async(_maintain())
+    logger.info(f"[AUDIT] Partition maintenance: created={len(created)} dropped={len(dropped)}")
+    
+    return {
+        "success": True,
+        "created": created,
+        "dropped": dropped,
+    }
@@ -0,0 +1,11 @@
+"""Outgoing email package."""
+
+from app.mail.delivery import chunked, deliver, render_bulk
+from app.mail.transport import get_transport
+
+__all__ = [
+    "chunked",
+    "deliver",
+    "get_transport",
+    "render_bulk",
+]
@@ -0,0 +1,156 @@
+"""
+Batch Email Delivery
+
+Bulk sends are split into batches of EMAIL_BATCH_SIZE recipients; each
+batch is one send_email_batch task that renders the message once and
+sends it to every recipient over the worker's pooled transport.
+
+A template_id naming one of the tenant's stored notification templates
+is rendered from its cached compiled form (app.rendering); its smart tags
+are resolved for the whole batch with one query, and only templates using
+per-user tags are rendered per recipient.
+
+`deliver` reports per-recipient outcomes so the task can retry only the
+recipients that failed transiently, carrying their attempt counts along.
+If the server becomes unreachable mid-batch (TransportUnavailable) the
+batch stops there, and that recipient and every unsent one after it are
+reported as transient and retried together.
+"""
+
+import string
+from dataclasses import dataclass, field, replace
+from email.message import EmailMessage
+from typing import Any, Iterator, Mapping, Optional, Sequence, TypeVar, Union
+
+from app.mail.transport import MailTransport, TransportUnavailable, is_transient
+from app.rendering.smart_tags import USER_TAGS, RenderContext, resolve_smart_tags
+from app.rendering.templates import load_templates
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text: str
+    html: Optional[str] = None
+
+
+@dataclass
+class DeliveryResult:
+    sent: list[str] = field(default_factory=list)
+    transient: dict[str, str] = field(default_factory=dict)  # recipient -> error
+    permanent: dict[str, str] = field(default_factory=dict)
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _scalars(template_data: Mapping[str, Any]) -> dict[str, str]:
+    return {key: str(value) for key, value in template_data.items() if isinstance(value, (str, int, float))}
+
+
+def render_bulk(subject: str, template_data: Mapping[str, Any]) -> RenderedEmail:
+    """
+    Render a bulk message once for a whole batch.
+
+    `text`/`body` and `html` in template_data are the bodies; `$name`
+    placeholders in them and in the subject are filled from the other
+    scalar values. Unknown placeholders are left as-is.
+    """
+    values = _scalars(template_data)
+
+    def fill(source: Optional[str]) -> Optional[str]:
+        return string.Template(source).safe_substitute(values) if source is not None else None
+
+    return RenderedEmail(
+        subject=fill(subject),
+        text=fill(template_data.get("text") or template_data.get("body") or ""),
+        html=fill(template_data.get("html")),
+    )
+
+
+async def render_stored(
+    conn: Any,
+    tenant_id: str,
+    template_id: str,
+    contexts: Mapping[str, RenderContext],
+    template_data: Mapping[str, Any],
+    base_url: str,
+) -> Union[RenderedEmail, dict[str, RenderedEmail], None]:
+    """
+    Render a stored notification template for a batch.
+
+    Args:
+        contexts: Render context by recipient address
+        template_data: Extra tag values, shared by all recipients
+
+    Returns:
+        One message for everyone when the template has no per-user tags,
+        else a message per recipient; None if template_id is not a stored
+        template of the tenant
+    """
+    template = (await load_templates(conn, "notification", tenant_id, [template_id])).get(template_id)
+    if template is None:
+        return None
+    subject, body = template.fields["messageSubject"], template.fields["messageBody"]
+    extra = _scalars(template_data)
+
+    if not USER_TAGS & template.tags:
+        [values] = await resolve_smart_tags(conn, tenant_id, [RenderContext(values=extra)], template.tags, base_url)
+        return RenderedEmail(subject.render(values), body.render(values))
+
+    recipients = list(contexts)
+    batch = [replace(contexts[to], values={**extra, **contexts[to].values}) for to in recipients]
+    resolved = await resolve_smart_tags(conn, tenant_id, batch, template.tags, base_url)
+    return {to: RenderedEmail(subject.render(values), body.render(values)) for to, values in zip(recipients, resolved)}
+
+
+def build_message(sender: str, to: str, rendered: RenderedEmail, headers: Optional[Mapping[str, str]] = None) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = to
+    message["Subject"] = rendered.subject
+    for name, value in (headers or {}).items():
+        message[name] = value
+    message.set_content(rendered.text)
+    if rendered.html:
+        message.add_alternative(rendered.html, subtype="html")
+    return message
+
+
+def deliver(
+    transport: MailTransport,
+    sender: str,
+    recipients: Sequence[str],
+    rendered: Union[RenderedEmail, Mapping[str, RenderedEmail]],
+    headers: Optional[Mapping[str, str]] = None,
+) -> DeliveryResult:
+    """Send `rendered` (shared, or by recipient) to each recipient, recording per-recipient outcomes."""
+    result = DeliveryResult()
+    for index, to in enumerate(recipients):
+        message = rendered if isinstance(rendered, RenderedEmail) else rendered[to]
+        try:
+            transport.send(build_message(sender, to, message, headers))
+        except TransportUnavailable as exc:
+            for unsent in recipients[index:]:
+                result.transient[unsent] = str(exc)
+            break
+        except Exception as exc:
+            (result.transient if is_transient(exc) else result.permanent)[to] = str(exc) or type(exc).__name__
+        else:
+            result.sent.append(to)
+    return result
+
+
+__all__ = [
+    "DeliveryResult",
+    "RenderedEmail",
+    "build_message",
+    "chunked",
+    "deliver",
+    "render_bulk",
+    "render_stored",
+]
@@ -0,0 +1,153 @@
+"""
+Mail Transports
+
+Delivery backends for outgoing email (EMAIL_TRANSPORT):
+
+- `stub` logs each message and keeps nothing; the default outside
+  production
+- `smtp` keeps one SMTP connection open per worker process and reuses it
+  across messages and tasks, reconnecting when the server drops it
+
+A worker process is single-threaded per task (prefork pool), so the
+cached connection is never used by two sends at once.
+
+Errors are classified per recipient: `is_transient` tells a batch which
+recipients to retry and which to report as failed immediately. A server
+that cannot be reached at all raises TransportUnavailable instead, so a
+batch stops at the first outage rather than waiting out the connect
+timeout once for every remaining recipient.
+"""
+
+import logging
+import smtplib
+from email.message import EmailMessage
+from functools import lru_cache
+from typing import Optional, Protocol
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TransportUnavailable(Exception):
+    """The mail server could not be reached; no further message can be sent now."""
+
+
+class MailTransport(Protocol):
+    def send(self, message: EmailMessage) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class StubTransport:
+    """Logs messages instead of sending them."""
+
+    def send(self, message: EmailMessage) -> None:
+        logger.info(f"[EMAIL] (stub) {message['To']}: {message['Subject']}")
+
+    def close(self) -> None:
+        pass
+
+
+class SMTPTransport:
+    """One lazily opened SMTP connection, reused until the server drops it."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password or "")
+        return smtp
+
+    def _reconnect(self) -> smtplib.SMTP:
+        self._smtp = None
+        try:
+            self._smtp = self._connect()
+        except (smtplib.SMTPException, OSError) as exc:
+            raise TransportUnavailable(f"{self.host}:{self.port}: {str(exc) or type(exc).__name__}") from exc
+        return self._smtp
+
+    def send(self, message: EmailMessage) -> None:
+        """
+        Send one message; a dropped connection is reopened once.
+
+        Raises:
+            TransportUnavailable: The connection could not be (re)opened, or
+                dropped again straight after reopening
+        """
+        smtp = self._smtp or self._reconnect()
+        try:
+            smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            smtp = self._reconnect()
+            try:
+                smtp.send_message(message)
+            except smtplib.SMTPServerDisconnected as exc:
+                self._smtp = None
+                raise TransportUnavailable(f"{self.host}:{self.port}: {str(exc) or 'disconnected'}") from exc
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+def is_transient(exc: Exception) -> bool:
+    """Whether a failed send is worth retrying (4xx replies, network errors)."""
+    if isinstance(exc, TransportUnavailable):
+        return True
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # SMTPException subclasses OSError; the rest are protocol/config errors
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+@lru_cache
+def get_transport() -> MailTransport:
+    """The worker's transport (and SMTP connection), created on first use."""
+    settings = get_settings()
+    if settings.email_transport == "smtp":
+        return SMTPTransport(
+            settings.smtp_host,
+            settings.smtp_port,
+            settings.smtp_username,
+            settings.smtp_password,
+            settings.smtp_starttls,
+            settings.smtp_timeout_seconds,
+        )
+    return StubTransport()
+
+
+__all__ = [
+    "MailTransport",
+    "SMTPTransport",
+    "StubTransport",
+    "TransportUnavailable",
+    "get_transport",
+    "is_transient",
+]
@@ -4,7 +4,8 @@ FastAPI Application Entry Point
 Main application setup with routers, middleware, and exception handlers.
 """
 
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import Any
 
 from fastapi import FastAPI, Request
@@ -14,6 +15,7 @@ from fastapi.responses import JSONResponse
 from app.config import get_settings
 from app.db.session import close_db, init_db
 from app.errors import register_exception_handlers
+from app.responses import ORJSONResponse
 
 settings = get_settings()
 
@@ -21,10 +23,17 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan - startup and shutdown events."""
+    from app.audit.logger import get_audit_spool, run_audit_spool_replayer
+    
     # Startup
     await init_db()
+    spool_replayer = asyncio.create_task(run_audit_spool_replayer())
     yield
     # Shutdown
+    spool_replayer.cancel()
+    with suppress(asyncio.CancelledError):
+        await spool_replayer
+    get_audit_spool().close()
     await close_db()
 
 
@@ -34,6 +43,7 @@ app = FastAPI(
     description="Learning Management System API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     # Disable automatic docs in production
     docs_url="/api/docs" if not settings.is_production else None,
     redoc_url="/api/redoc" if not settings.is_production else None,
@@ -99,7 +109,7 @@ async def api_health_check() -> dict[str, Any]:
 # Import and include routers
 from app.routes import (
     auth, users, courses, enrollments, groups, categories, branches,
-    learning_paths, assignments, notifications, reports
+    learning_paths, assignments, notifications, reports, audit, jobs, gamification, timeline
 )
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
@@ -113,6 +123,10 @@ app.include_router(learning_paths.router, prefix="/api/learning-paths", tags=["l
 app.include_router(assignments.router, prefix="/api/assignments", tags=["assignments"])
 app.include_router(notifications.router, prefix="/api/notifications", tags=["notifications"])
 app.include_router(reports.router, prefix="/api/reports", tags=["reports"])
+app.include_router(audit.router, prefix="/api/audit", tags=["audit"])
+app.include_router(jobs.router, prefix="/api/jobs", tags=["jobs"])
+app.include_router(gamification.router, prefix="/api/gamification", tags=["gamification"])
+app.include_router(timeline.router, prefix="/api/timeline", tags=["timeline"])
 
 
 
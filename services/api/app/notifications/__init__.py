@@ -0,0 +1,9 @@
+"""In-app notification package."""
+
+from app.notifications.fanout import OutgoingNotification, coalesce_side_effects, write_notifications
+
+__all__ = [
+    "OutgoingNotification",
+    "coalesce_side_effects",
+    "write_notifications",
+]
@@ -0,0 +1,188 @@
+"""
+Notification Fan-out
+
+In-app notifications live in `user_notifications` (one row per recipient).
+notify_batch writes them NOTIFICATION_BATCH_SIZE at a time:
+
+- Notifications are grouped by tenant and each group is written with one
+  multi-row INSERT ... SELECT FROM unnest(...)
+- Push and email side effects are coalesced per recipient: a recipient
+  with several push/email notifications in a batch gets one message, and
+  recipients receiving identical email content share one send_email_batch
+- Longer lists are split into one notify_batch task per batch, and
+  audience fan-outs (notify_course) page through recipients with a keyset
+  and queue one task per page, so broker traffic is O(batches) rather
+  than O(recipients)
+"""
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Mapping, Optional, Sequence
+
+import orjson
+from sqlalchemy import text
+
+NOTIFICATIONS_TABLE = "user_notifications"
+SIDE_EFFECT_TYPES = ("push", "email")
+
+INSERT_SQL = f"""
+INSERT INTO "{NOTIFICATIONS_TABLE}" (id, tenant_id, user_id, type, title, body, link, metadata, created_at)
+SELECT i.id, :tenant_id, i.user_id, i.type, i.title, i.body, i.link, CAST(i.metadata AS jsonb), :now
+FROM unnest(
+    CAST(:ids AS text[]), CAST(:user_ids AS text[]), CAST(:types AS text[]),
+    CAST(:titles AS text[]), CAST(:bodies AS text[]), CAST(:links AS text[]), CAST(:metadata AS text[])
+) AS i(id, user_id, type, title, body, link, metadata)
+"""
+
+
+@dataclass
+class OutgoingNotification:
+    tenant_id: str
+    recipient_id: str
+    title: str
+    body: str
+    notification_type: str = "in_app"
+    link: Optional[str] = None
+    metadata: Optional[dict[str, Any]] = None
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "OutgoingNotification":
+        """Accepts notify_user's keyword arguments."""
+        return cls(
+            tenant_id=data["tenant_id"],
+            recipient_id=data["recipient_id"],
+            title=data["title"],
+            body=data["body"],
+            notification_type=data.get("notification_type") or "in_app",
+            link=data.get("link"),
+            metadata=data.get("metadata"),
+        )
+
+
+@dataclass(frozen=True)
+class CoalescedMessage:
+    """One push/email for a recipient, standing for one or more notifications."""
+    recipient_id: str
+    title: str
+    body: str
+    link: Optional[str]
+    count: int
+
+
+def group_by_tenant(notifications: Iterable[OutgoingNotification]) -> dict[str, list[OutgoingNotification]]:
+    groups: dict[str, list[OutgoingNotification]] = defaultdict(list)
+    for notification in notifications:
+        groups[notification.tenant_id].append(notification)
+    return dict(groups)
+
+
+async def write_notifications(
+    conn: Any,
+    tenant_id: str,
+    notifications: Sequence[OutgoingNotification],
+    now: datetime,
+) -> int:
+    """Insert one tenant's notifications with a single statement."""
+    if not notifications:
+        return 0
+    await conn.execute(
+        text(INSERT_SQL),
+        {
+            "tenant_id": tenant_id,
+            "now": now,
+            "ids": [n.id for n in notifications],
+            "user_ids": [n.recipient_id for n in notifications],
+            "types": [n.notification_type for n in notifications],
+            "titles": [n.title for n in notifications],
+            "bodies": [n.body for n in notifications],
+            "links": [n.link for n in notifications],
+            "metadata": [orjson.dumps(n.metadata).decode() if n.metadata else None for n in notifications],
+        },
+    )
+    return len(notifications)
+
+
+def coalesce_side_effects(
+    notifications: Iterable[OutgoingNotification],
+) -> dict[str, list[CoalescedMessage]]:
+    """
+    Collapse push/email notifications to one message per recipient and channel.
+
+    Returns:
+        {"push": [...], "email": [...]}; several notifications for the same
+        recipient become one "You have N new notifications" message
+    """
+    pending: dict[str, dict[str, list[OutgoingNotification]]] = {channel: defaultdict(list) for channel in SIDE_EFFECT_TYPES}
+    for notification in notifications:
+        if notification.notification_type in pending:
+            pending[notification.notification_type][notification.recipient_id].append(notification)
+
+    coalesced: dict[str, list[CoalescedMessage]] = {}
+    for channel, by_recipient in pending.items():
+        messages = []
+        for recipient_id, items in by_recipient.items():
+            if len(items) == 1:
+                only = items[0]
+                messages.append(CoalescedMessage(recipient_id, only.title, only.body, only.link, 1))
+            else:
+                messages.append(CoalescedMessage(
+                    recipient_id,
+                    f"You have {len(items)} new notifications",
+                    "\n".join(f"- {item.title}" for item in items),
+                    None,
+                    len(items),
+                ))
+        coalesced[channel] = messages
+    return coalesced
+
+
+def group_identical(messages: Iterable[CoalescedMessage]) -> dict[tuple[str, str], list[str]]:
+    """Recipient ids by (title, body), so identical emails share one batch task."""
+    groups: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for message in messages:
+        groups[(message.title, message.body)].append(message.recipient_id)
+    return dict(groups)
+
+
+async def recipient_emails(conn: Any, tenant_id: str, user_ids: Sequence[str]) -> dict[str, str]:
+    """Email address by user id, for one tenant's recipients."""
+    result = await conn.execute(
+        text('SELECT id, email FROM users WHERE "tenantId" = :tenant_id AND id = ANY(:ids) AND "deletedAt" IS NULL'),
+        {"tenant_id": tenant_id, "ids": list(user_ids)},
+    )
+    return dict(result.all())
+
+
+async def course_recipients_page(
+    conn: Any,
+    tenant_id: str,
+    course_id: str,
+    after: Optional[str],
+    limit: int,
+) -> list[str]:
+    """Enrolled user ids of a course after `after`, in id order (keyset page)."""
+    result = await conn.execute(
+        text(
+            'SELECT "userId" FROM enrollments WHERE "tenantId" = :tenant_id AND "courseId" = :course_id '
+            'AND "deletedAt" IS NULL AND (CAST(:after AS text) IS NULL OR "userId" > :after) '
+            'ORDER BY "userId" LIMIT :limit'
+        ),
+        {"tenant_id": tenant_id, "course_id": course_id, "after": after, "limit": limit},
+    )
+    return [row[0] for row in result.all()]
+
+
+__all__ = [
+    "CoalescedMessage",
+    "NOTIFICATIONS_TABLE",
+    "OutgoingNotification",
+    "coalesce_side_effects",
+    "course_recipients_page",
+    "group_by_tenant",
+    "group_identical",
+    "recipient_emails",
+    "write_notifications",
+]
@@ -0,0 +1,12 @@
+"""Template rendering package."""
+
+from app.rendering.smart_tags import RenderContext, resolve_smart_tags
+from app.rendering.templates import CompiledTemplate, compile_template, load_templates
+
+__all__ = [
+    "CompiledTemplate",
+    "RenderContext",
+    "compile_template",
+    "load_templates",
+    "resolve_smart_tags",
+]
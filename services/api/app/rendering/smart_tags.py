@@ -0,0 +1,127 @@
+"""
+Smart Tag Resolution
+
+Resolves the smart tags of a render batch (see the web app's
+modules/notifications/server/smartTags.ts; certificate templates also use
+camelCase names such as learnerName/courseName) with one query for the
+whole batch: the batch's (user, course, learning path) keys are unnested
+and LEFT JOINed to users, courses, learning_paths and the tenant.
+
+The query is skipped when the batch's templates use no data tags.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import text
+
+USER_TAGS = frozenset({
+    "related_user_first_name", "related_user_last_name", "related_user_email", "username",
+    "user_full_name", "learnerName", "firstName", "lastName",
+})
+COURSE_TAGS = frozenset({"course_name", "course_code", "course_description", "course_url", "courseName"})
+PATH_TAGS = frozenset({"learning_path_name", "learning_path_description", "learning_path_url", "learningPathName"})
+TENANT_TAGS = frozenset({"site_name", "siteName"})
+DATA_TAGS = USER_TAGS | COURSE_TAGS | PATH_TAGS | TENANT_TAGS
+
+RESOLVE_SQL = """
+SELECT i.ord,
+       COALESCE(ui."firstName", ue."firstName") AS first_name,
+       COALESCE(ui."lastName", ue."lastName") AS last_name,
+       COALESCE(ui.email, ue.email) AS email,
+       COALESCE(ui.username, ue.username) AS username,
+       c.id AS course_id, c.title AS course_name, c.code AS course_code, c.description AS course_description,
+       lp.id AS path_id, lp.name AS path_name, lp.description AS path_description,
+       t.name AS site_name
+FROM unnest(
+    CAST(:ords AS int[]), CAST(:user_ids AS text[]), CAST(:emails AS text[]),
+    CAST(:course_ids AS text[]), CAST(:path_ids AS text[])
+) AS i(ord, user_id, email, course_id, path_id)
+LEFT JOIN users ui ON ui."tenantId" = :tenant_id AND ui.id = i.user_id
+LEFT JOIN users ue ON ue."tenantId" = :tenant_id AND i.user_id IS NULL AND ue.email = i.email
+LEFT JOIN courses c ON c."tenantId" = :tenant_id AND c.id = i.course_id
+LEFT JOIN learning_paths lp ON lp."tenantId" = :tenant_id AND lp.id = i.path_id
+LEFT JOIN tenants t ON t.id = :tenant_id
+"""
+
+
+@dataclass
+class RenderContext:
+    """What one rendered document is about; `values` override resolved tags."""
+    user_id: Optional[str] = None
+    email: Optional[str] = None  # user key when only the address is known
+    course_id: Optional[str] = None
+    path_id: Optional[str] = None
+    values: dict[str, Any] = field(default_factory=dict)
+
+
+def _tag_values(row: Any, base_url: str) -> dict[str, Any]:
+    full_name = " ".join(part for part in (row["first_name"], row["last_name"]) if part) or None
+    values: dict[str, Any] = {
+        "related_user_first_name": row["first_name"],
+        "related_user_last_name": row["last_name"],
+        "related_user_email": row["email"],
+        "username": row["username"],
+        "user_full_name": full_name,
+        "learnerName": full_name,
+        "firstName": row["first_name"],
+        "lastName": row["last_name"],
+        "course_name": row["course_name"],
+        "courseName": row["course_name"],
+        "course_code": row["course_code"],
+        "course_description": row["course_description"],
+        "learning_path_name": row["path_name"],
+        "learningPathName": row["path_name"],
+        "learning_path_description": row["path_description"],
+        "site_name": row["site_name"],
+        "siteName": row["site_name"],
+    }
+    if row["course_id"]:
+        values["course_url"] = f"{base_url}/courses/{row['course_id']}"
+    if row["path_id"]:
+        values["learning_path_url"] = f"{base_url}/learning-paths/{row['path_id']}"
+    return values
+
+
+async def resolve_smart_tags(
+    conn: Any,
+    tenant_id: str,
+    contexts: Sequence[RenderContext],
+    tags: Iterable[str],
+    base_url: str,
+    now: Optional[datetime] = None,
+) -> list[dict[str, Any]]:
+    """
+    Tag values for each context of a render batch, in order.
+
+    Args:
+        tags: Tags used by the batch's templates
+        base_url: Public URL of the web app (site_url, course_url, ...)
+    """
+    now = now or datetime.utcnow()
+    static = {"site_url": base_url, "time": now.strftime("%Y-%m-%d %H:%M:%S")}
+    resolved: dict[int, dict[str, Any]] = {}
+
+    if DATA_TAGS & set(tags) and contexts:
+        result = await conn.execute(
+            text(RESOLVE_SQL),
+            {
+                "tenant_id": tenant_id,
+                "ords": list(range(len(contexts))),
+                "user_ids": [c.user_id for c in contexts],
+                "emails": [c.email for c in contexts],
+                "course_ids": [c.course_id for c in contexts],
+                "path_ids": [c.path_id for c in contexts],
+            },
+        )
+        resolved = {row["ord"]: _tag_values(row, base_url) for row in result.mappings().all()}
+
+    return [{**static, **resolved.get(i, {}), **context.values} for i, context in enumerate(contexts)]
+
+
+__all__ = [
+    "DATA_TAGS",
+    "RenderContext",
+    "resolve_smart_tags",
+]
@@ -0,0 +1,166 @@
+"""
+Template Engine
+
+Tenant templates (certificate HTML bodies, notification subjects/bodies)
+use smart tags written `{tag}` or `{{tag}}`. A template is compiled once
+into literal parts and tag slots, so rendering is a join rather than a
+parse, and compiled templates are cached per worker process keyed by
+(kind, template id, updatedAt): editing a template bumps updatedAt and
+the next render compiles the new version.
+
+`load_templates` serves a batch of template ids with one query for their
+versions and one more for the sources of cache misses only.
+
+Unknown tags are left in the output as written, so a typo stays visible
+on the rendered document instead of silently disappearing.
+"""
+
+import html
+import re
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Optional, Sequence
+
+from cachetools import LRUCache
+from sqlalchemy import text
+
+TAG_RE = re.compile(r"\{\{\s*([A-Za-z_][\w.]*)\s*\}\}|\{([A-Za-z_][\w.]*)\}")
+
+# Template sources by kind: table and the (field, escape HTML) pairs compiled
+TEMPLATE_SOURCES = {
+    "certificate": ("certificate_templates", (("htmlBody", True),)),
+    "notification": ("notifications", (("messageSubject", False), ("messageBody", False))),
+}
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """Literal parts interleaved with tag slots: parts[0] tag[0] parts[1] ..."""
+    parts: tuple[str, ...]
+    slots: tuple[tuple[str, str], ...]  # (tag name, source text)
+    escape: bool = False
+
+    @property
+    def tags(self) -> frozenset[str]:
+        return frozenset(name for name, _ in self.slots)
+
+    def render(self, values: Mapping[str, Any]) -> str:
+        out = [self.parts[0]]
+        for (name, source), literal in zip(self.slots, self.parts[1:]):
+            value = values.get(name)
+            if value is None:
+                out.append(source)
+            else:
+                out.append(html.escape(str(value)) if self.escape else str(value))
+            out.append(literal)
+        return "".join(out)
+
+
+@dataclass(frozen=True)
+class TemplateSet:
+    """The compiled fields of one stored template version."""
+    template_id: str
+    updated_at: Optional[datetime]
+    fields: Mapping[str, CompiledTemplate]
+
+    @property
+    def tags(self) -> frozenset[str]:
+        return frozenset().union(*(field.tags for field in self.fields.values()))
+
+
+def compile_template(source: str, escape: bool = False) -> CompiledTemplate:
+    """Split a template into literals and tag slots (one regex pass)."""
+    parts: list[str] = []
+    slots: list[tuple[str, str]] = []
+    position = 0
+    for match in TAG_RE.finditer(source):
+        parts.append(source[position:match.start()])
+        slots.append((match.group(1) or match.group(2), match.group(0)))
+        position = match.end()
+    parts.append(source[position:])
+    return CompiledTemplate(tuple(parts), tuple(slots), escape)
+
+
+_template_cache: LRUCache[tuple[str, str, Optional[datetime]], TemplateSet] = LRUCache(maxsize=512)
+_template_cache_lock = threading.Lock()
+_template_cache_stats = {"hits": 0, "misses": 0}
+
+
+async def load_templates(
+    conn: Any,
+    kind: str,
+    tenant_id: str,
+    template_ids: Sequence[str],
+) -> dict[str, TemplateSet]:
+    """
+    Compiled templates by id for a render batch.
+
+    Args:
+        kind: "certificate" or "notification"
+
+    Returns:
+        Only the ids that exist for the tenant
+    """
+    table, field_specs = TEMPLATE_SOURCES[kind]
+    ids = sorted(set(template_ids))
+    if not ids:
+        return {}
+    params = {"tenant_id": tenant_id, "ids": ids}
+    versions = await conn.execute(
+        text(f'SELECT id, "updatedAt" FROM {table} WHERE "tenantId" = :tenant_id AND id = ANY(:ids)'),
+        params,
+    )
+
+    loaded: dict[str, TemplateSet] = {}
+    missing: dict[str, Optional[datetime]] = {}
+    with _template_cache_lock:
+        for template_id, updated_at in versions.all():
+            cached = _template_cache.get((kind, template_id, updated_at))
+            _template_cache_stats["hits" if cached is not None else "misses"] += 1
+            if cached is not None:
+                loaded[template_id] = cached
+            else:
+                missing[template_id] = updated_at
+    if not missing:
+        return loaded
+
+    columns = ", ".join(f'"{name}"' for name, _ in field_specs)
+    sources = await conn.execute(
+        text(f'SELECT id, {columns} FROM {table} WHERE "tenantId" = :tenant_id AND id = ANY(:ids)'),
+        {"tenant_id": tenant_id, "ids": sorted(missing)},
+    )
+    for row in sources.all():
+        template_id = row[0]
+        compiled = TemplateSet(
+            template_id,
+            missing[template_id],
+            {name: compile_template(source or "", escape) for (name, escape), source in zip(field_specs, row[1:])},
+        )
+        with _template_cache_lock:
+            _template_cache[(kind, template_id, missing[template_id])] = compiled
+        loaded[template_id] = compiled
+    return loaded
+
+
+def template_cache_info() -> dict[str, int]:
+    """Template cache hit/miss counters and size."""
+    with _template_cache_lock:
+        return {**_template_cache_stats, "size": len(_template_cache)}
+
+
+def clear_template_cache() -> None:
+    """Drop all compiled templates (tests)."""
+    with _template_cache_lock:
+        _template_cache.clear()
+        _template_cache_stats.update(hits=0, misses=0)
+
+
+__all__ = [
+    "CompiledTemplate",
+    "TemplateSet",
+    "clear_template_cache",
+    "compile_template",
+    "load_templates",
+    "template_cache_info",
+]
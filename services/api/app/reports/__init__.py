@@ -0,0 +1,25 @@
+"""Reporting package."""
+
+from app.reports.activity import (
+    read_activity,
+    recompute_activity,
+)
+from app.reports.course_progress import (
+    read_course_progress,
+    rebuild_course_progress,
+)
+from app.reports.dashboard import (
+    format_dashboard_stats,
+    read_dashboard_stats,
+    refresh_dashboard_stats,
+)
+
+__all__ = [
+    "read_activity",
+    "recompute_activity",
+    "read_course_progress",
+    "rebuild_course_progress",
+    "format_dashboard_stats",
+    "read_dashboard_stats",
+    "refresh_dashboard_stats",
+]
@@ -0,0 +1,339 @@
+"""
+Daily Activity Buckets
+
+`tenant_activity_daily` keeps one row per (tenant, UTC day) with:
+
+- new_users: users created that day
+- last_login_users: users whose most recent login falls on that day
+- new_enrollments: enrollments created that day
+- completions: enrollments completed that day
+
+Because each user is counted on the day of their *last* login, summing
+last_login_users over a window equals the number of users who logged in
+during it, so every metric of /api/reports/user-activity is a plain sum
+over at most 365 small rows, and the rows double as the chart series.
+
+The buckets are written three ways:
+- Statement-level triggers on users (inserts/deletes) and enrollments
+  apply deltas for new_users, new_enrollments and completions
+- last_login_users is not trigger-maintained: a login would otherwise
+  lock the tenant's row for today on every sign-in. The
+  report_refresh_login_buckets beat task recounts it for the whole window
+  from users."lastLoginAt" every ACTIVITY_LOGIN_REFRESH_SECONDS (a new
+  login moves the user from their previous day to today)
+- The report_refresh_activity_buckets beat task recomputes the trailing
+  days from the source tables to correct any drift; the backfill command
+  (`python -m app.reports.backfill activity`) does the same for a full year
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Optional
+
+from sqlalchemy import text
+
+ACTIVITY_TABLE = "tenant_activity_daily"
+MAX_WINDOW_DAYS = 365
+
+METRICS = ("new_users", "last_login_users", "new_enrollments", "completions")
+
+# Source timestamp column for each metric, by table
+_TABLE_METRICS = {
+    "users": {"new_users": "createdAt", "last_login_users": "lastLoginAt"},
+    "enrollments": {"new_enrollments": "createdAt", "completions": "completedAt"},
+}
+
+# Metrics and events maintained by triggers (logins: refresh_logins)
+_TRIGGER_METRICS = {
+    "users": {"new_users": "createdAt"},
+    "enrollments": _TABLE_METRICS["enrollments"],
+}
+_TRIGGER_EVENTS = {
+    "users": ("INSERT", "DELETE"),
+    "enrollments": ("INSERT", "UPDATE", "DELETE"),
+}
+
+
+def _metric_select(metric: str, column: str, alias: str, source: str, sign: int = 1, where: str = "TRUE") -> str:
+    """SELECT emitting a signed per-row delta for one metric."""
+    values = ", ".join(f"{sign if m == metric else 0} AS {m}" for m in METRICS)
+    return (
+        f'SELECT {alias}."tenantId" AS tenant_id, {alias}."{column}"::date AS day, {values} '
+        f'FROM {source} WHERE {alias}."{column}" IS NOT NULL AND {where}'
+    )
+
+
+def _metric_selects(table: str, alias: str, source: str, sign: int = 1, where: str = "TRUE") -> str:
+    """UNION ALL of the metric SELECTs for one source table."""
+    return "\nUNION ALL\n".join(
+        _metric_select(metric, column, alias, source, sign, where)
+        for metric, column in _TRIGGER_METRICS[table].items()
+    )
+
+
+_APPLY_DELTAS = f"""
+    INSERT INTO "{ACTIVITY_TABLE}" AS a (tenant_id, day, {", ".join(METRICS)})
+    SELECT tenant_id, day, {", ".join(f"sum({m})" for m in METRICS)}
+    FROM deltas
+    GROUP BY tenant_id, day
+    ON CONFLICT (tenant_id, day) DO UPDATE SET
+        {", ".join(f"{m} = a.{m} + EXCLUDED.{m}" for m in METRICS)};
+"""
+
+
+def _trigger_function_sql(table: str) -> str:
+    """plpgsql function applying activity deltas for one source table."""
+    columns = list(_TRIGGER_METRICS[table].values())
+    changed = (
+        "(" + ", ".join(f'o."{c}"' for c in columns) + ") IS DISTINCT FROM ("
+        + ", ".join(f'n."{c}"' for c in columns) + ")"
+    )
+    joined = "old_rows o JOIN new_rows n ON n.id = o.id"
+    return f"""
+        CREATE OR REPLACE FUNCTION {table}_activity_daily_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                WITH deltas AS ({_metric_selects(table, "n", "new_rows n")})
+                {_APPLY_DELTAS}
+            ELSIF TG_OP = 'DELETE' THEN
+                WITH deltas AS ({_metric_selects(table, "o", "old_rows o", -1)})
+                {_APPLY_DELTAS}
+            ELSE
+                WITH deltas AS (
+                    {_metric_selects(table, "o", joined, -1, changed)}
+                    UNION ALL
+                    {_metric_selects(table, "n", joined, 1, changed)}
+                )
+                {_APPLY_DELTAS}
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """
+
+
+def _create_triggers_sql(table: str) -> list[str]:
+    # Transition tables require one trigger per event
+    return [
+        f"""
+        CREATE TRIGGER {table}_activity_daily_{event.lower()}
+            AFTER {event} ON "{table}"
+            REFERENCING {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {table}_activity_daily_apply()
+        """
+        for event, referencing in (
+            ("INSERT", "NEW TABLE AS new_rows"),
+            ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+            ("DELETE", "OLD TABLE AS old_rows"),
+        )
+        if event in _TRIGGER_EVENTS[table]
+    ]
+
+
+CREATE_TRIGGERS_SQL: tuple[str, ...] = tuple(
+    statement
+    for table in _TRIGGER_METRICS
+    for statement in (_trigger_function_sql(table), *_create_triggers_sql(table))
+)
+
+
+def recompute_sql(single_tenant: bool) -> str:
+    """Statement recomputing the buckets in [:start_day, :end_day) from source rows."""
+    scope = 'AND t."tenantId" = :tenant_id' if single_tenant else ""
+    bucket_scope = "AND d.tenant_id = :tenant_id" if single_tenant else ""
+    selects = "\nUNION ALL\n".join(
+        _metric_select(
+            metric, column, "t", f"{table} t",
+            where=f't."{column}" >= :start_at AND t."{column}" < :end_at {scope}',
+        )
+        for table, metrics in _TABLE_METRICS.items()
+        for metric, column in metrics.items()
+    )
+    return f"""
+        WITH src AS ({selects}),
+        agg AS (
+            SELECT tenant_id, day, {", ".join(f"sum({m}) AS {m}" for m in METRICS)}
+            FROM src
+            GROUP BY tenant_id, day
+        ),
+        cleared AS (
+            DELETE FROM "{ACTIVITY_TABLE}" d
+            WHERE d.day >= :start_day AND d.day < :end_day {bucket_scope}
+              AND NOT EXISTS (SELECT 1 FROM agg WHERE agg.tenant_id = d.tenant_id AND agg.day = d.day)
+        )
+        INSERT INTO "{ACTIVITY_TABLE}" AS a (tenant_id, day, {", ".join(METRICS)})
+        SELECT tenant_id, day, {", ".join(METRICS)}
+        FROM agg
+        WHERE TRUE
+        ON CONFLICT (tenant_id, day) DO UPDATE SET
+            {", ".join(f"{m} = EXCLUDED.{m}" for m in METRICS)}
+    """
+
+
+def logins_sql(single_tenant: bool) -> str:
+    """Statement recounting last_login_users in [:start_day, :end_day), leaving other metrics alone."""
+    scope = 'AND u."tenantId" = :tenant_id' if single_tenant else ""
+    bucket_scope = "AND d.tenant_id = :tenant_id" if single_tenant else ""
+    return f"""
+        WITH agg AS (
+            SELECT u."tenantId" AS tenant_id, u."lastLoginAt"::date AS day, count(*)::int AS last_login_users
+            FROM users u
+            WHERE u."lastLoginAt" >= :start_at AND u."lastLoginAt" < :end_at {scope}
+            GROUP BY 1, 2
+        ),
+        cleared AS (
+            UPDATE "{ACTIVITY_TABLE}" d SET last_login_users = 0
+            WHERE d.day >= :start_day AND d.day < :end_day {bucket_scope}
+              AND d.last_login_users <> 0
+              AND NOT EXISTS (SELECT 1 FROM agg WHERE agg.tenant_id = d.tenant_id AND agg.day = d.day)
+        )
+        INSERT INTO "{ACTIVITY_TABLE}" AS a (tenant_id, day, last_login_users)
+        SELECT tenant_id, day, last_login_users
+        FROM agg
+        WHERE TRUE
+        ON CONFLICT (tenant_id, day) DO UPDATE SET last_login_users = EXCLUDED.last_login_users
+        WHERE a.last_login_users <> EXCLUDED.last_login_users
+    """
+
+
+_RECOMPUTE_ALL_SQL = recompute_sql(single_tenant=False)
+_RECOMPUTE_TENANT_SQL = recompute_sql(single_tenant=True)
+_LOGINS_ALL_SQL = logins_sql(single_tenant=False)
+_LOGINS_TENANT_SQL = logins_sql(single_tenant=True)
+
+_READ_SQL = f"""
+    SELECT day, {", ".join(METRICS)}
+    FROM "{ACTIVITY_TABLE}"
+    WHERE tenant_id = :tenant_id AND day >= :start_day AND day <= :end_day
+    ORDER BY day
+"""
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def recompute_params(start_day: date, end_day: date) -> dict[str, Any]:
+    """Bind parameters for recomputing the days in [start_day, end_day)."""
+    return {
+        "start_day": start_day,
+        "end_day": end_day,
+        "start_at": datetime.combine(start_day, time.min),
+        "end_at": datetime.combine(end_day, time.min),
+    }
+
+
+async def recompute_activity(
+    conn: Any,
+    start_day: date,
+    end_day: date,
+    tenant_id: Optional[str] = None,
+) -> int:
+    """
+    Recompute activity buckets for days in [start_day, end_day).
+
+    Args:
+        conn: AsyncConnection or AsyncSession
+        start_day: First day to rebuild
+        end_day: Day after the last day to rebuild
+        tenant_id: Only rebuild this tenant (all tenants when None)
+
+    Returns:
+        Number of bucket rows written
+    """
+    params = recompute_params(start_day, end_day)
+    if tenant_id is not None:
+        params["tenant_id"] = tenant_id
+        sql = _RECOMPUTE_TENANT_SQL
+    else:
+        sql = _RECOMPUTE_ALL_SQL
+
+    result = await conn.execute(text(sql), params)
+    return result.rowcount
+
+
+async def refresh_logins(conn: Any, today: Optional[date] = None, tenant_id: Optional[str] = None) -> int:
+    """
+    Recount last_login_users for the readable window (the last MAX_WINDOW_DAYS days).
+
+    Only buckets whose count changed are written.
+
+    Args:
+        conn: AsyncConnection or AsyncSession
+        today: Last day of the window (default: UTC today)
+        tenant_id: Only recount this tenant (all tenants when None)
+
+    Returns:
+        Number of bucket rows written
+    """
+    end_day = (today or _utc_today()) + timedelta(days=1)
+    params = recompute_params(end_day - timedelta(days=MAX_WINDOW_DAYS), end_day)
+    if tenant_id is not None:
+        params["tenant_id"] = tenant_id
+        sql = _LOGINS_TENANT_SQL
+    else:
+        sql = _LOGINS_ALL_SQL
+
+    result = await conn.execute(text(sql), params)
+    return result.rowcount
+
+
+async def read_activity(
+    conn: Any,
+    tenant_id: str,
+    days: int,
+    today: Optional[date] = None,
+) -> dict[str, Any]:
+    """
+    Read the user activity report for the last `days` days (including today).
+
+    Returns:
+        Window totals plus the zero-filled daily series
+    """
+    days = max(1, min(days, MAX_WINDOW_DAYS))
+    end_day = today or _utc_today()
+    start_day = end_day - timedelta(days=days - 1)
+
+    result = await conn.execute(
+        text(_READ_SQL),
+        {"tenant_id": tenant_id, "start_day": start_day, "end_day": end_day},
+    )
+    return format_activity(result.mappings().all(), start_day, days)
+
+
+def format_activity(rows: Any, start_day: date, days: int) -> dict[str, Any]:
+    """Shape bucket rows into the /api/reports/user-activity payload."""
+    by_day = {row["day"]: row for row in rows}
+    totals = dict.fromkeys(METRICS, 0)
+    series = []
+
+    for offset in range(days):
+        day = start_day + timedelta(days=offset)
+        row = by_day.get(day)
+        values = {metric: (row[metric] if row else 0) for metric in METRICS}
+        for metric, value in values.items():
+            totals[metric] += value
+        series.append({
+            "date": day.isoformat(),
+            "newUsers": values["new_users"],
+            "activeUsers": values["last_login_users"],
+            "newEnrollments": values["new_enrollments"],
+            "completions": values["completions"],
+        })
+
+    return {
+        "period": f"Last {days} days",
+        "newUsers": totals["new_users"],
+        "activeUsers": totals["last_login_users"],
+        "newEnrollments": totals["new_enrollments"],
+        "completions": totals["completions"],
+        "series": series,
+    }
+
+
+__all__ = [
+    "ACTIVITY_TABLE",
+    "format_activity",
+    "read_activity",
+    "recompute_activity",
+    "refresh_logins",
+]
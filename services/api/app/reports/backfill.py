@@ -0,0 +1,170 @@
+"""
+Report Rollup Backfill
+
+Rebuilds report summary tables from the source rows, for every tenant (or
+the ones given) in parallel chunks. Each chunk runs in its own transaction
+on its own connection, so a failure only rolls back that chunk and the
+command can simply be re-run.
+
+Usage:
+    cd services/api
+    python -m app.reports.backfill {course-progress,activity} [--tenant ID ...]
+        [--concurrency 4] [--chunk-size N]
+
+Chunks are courses for course-progress (default 500) and days of the
+last year for activity (default 31).
+
+Run it after restoring data or if the trigger-maintained counters are
+suspected to have drifted; concurrent writes during a chunk's rebuild are
+picked up by re-running it.
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.db.session import engine
+from app.reports.activity import MAX_WINDOW_DAYS, recompute_activity
+from app.reports.course_progress import prune_course_progress, rebuild_course_progress
+
+logger = logging.getLogger(__name__)
+
+
+def chunked(items: Sequence[Any], size: int) -> list[list[Any]]:
+    """Split items into lists of at most `size`."""
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+async def _list_tenants(tenant_ids: Optional[Sequence[str]]) -> list[str]:
+    if tenant_ids:
+        return list(tenant_ids)
+    async with engine.connect() as conn:
+        result = await conn.execute(text('SELECT id FROM tenants ORDER BY id'))
+        return [row[0] for row in result]
+
+
+async def _plan_course_progress(tenant_ids: Sequence[str], chunk_size: int) -> list[tuple[str, Optional[list[str]]]]:
+    """One job per chunk of each tenant's courses."""
+    jobs: list[tuple[str, Optional[list[str]]]] = []
+    async with engine.connect() as conn:
+        for tenant_id in tenant_ids:
+            result = await conn.execute(
+                text('SELECT id FROM courses WHERE "tenantId" = :tenant_id ORDER BY id'),
+                {"tenant_id": tenant_id},
+            )
+            course_ids = [row[0] for row in result]
+            jobs.extend((tenant_id, chunk) for chunk in chunked(course_ids, chunk_size))
+    return jobs
+
+
+async def run_chunks(
+    jobs: Sequence[tuple[str, Any]],
+    rebuild: Callable[..., Awaitable[int]],
+    concurrency: int,
+) -> tuple[int, int]:
+    """
+    Run rebuild jobs with bounded parallelism.
+
+    Returns:
+        (rows written, failed chunks)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    written = 0
+    failed = 0
+
+    async def _run(tenant_id: str, chunk: Any) -> None:
+        nonlocal written, failed
+        async with semaphore:
+            try:
+                async with engine.begin() as conn:
+                    written += await rebuild(conn, tenant_id, chunk)
+            except Exception:
+                failed += 1
+                logger.exception(f"Backfill chunk failed for tenant {tenant_id}")
+
+    await asyncio.gather(*(_run(tenant_id, chunk) for tenant_id, chunk in jobs))
+    return written, failed
+
+
+async def backfill_course_progress(
+    tenant_ids: Optional[Sequence[str]] = None,
+    concurrency: int = 4,
+    chunk_size: Optional[int] = None,
+) -> tuple[int, int]:
+    """Rebuild course_progress_stats for the given (or all) tenants."""
+    tenants = await _list_tenants(tenant_ids)
+    jobs = await _plan_course_progress(tenants, chunk_size or 500)
+    logger.info(f"course-progress: {len(tenants)} tenant(s), {len(jobs)} chunk(s)")
+    written, failed = await run_chunks(jobs, rebuild_course_progress, concurrency)
+    
+    async with engine.begin() as conn:
+        for tenant_id in tenants:
+            await prune_course_progress(conn, tenant_id)
+    
+    return written, failed
+
+
+def day_ranges(start: date, end: date, days_per_chunk: int) -> list[tuple[date, date]]:
+    """Split [start, end) into consecutive ranges of at most `days_per_chunk` days."""
+    ranges = []
+    while start < end:
+        chunk_end = min(start + timedelta(days=days_per_chunk), end)
+        ranges.append((start, chunk_end))
+        start = chunk_end
+    return ranges
+
+
+async def _recompute_activity_chunk(conn: Any, tenant_id: str, day_range: tuple[date, date]) -> int:
+    return await recompute_activity(conn, day_range[0], day_range[1], tenant_id)
+
+
+async def backfill_activity(
+    tenant_ids: Optional[Sequence[str]] = None,
+    concurrency: int = 4,
+    chunk_size: Optional[int] = None,
+) -> tuple[int, int]:
+    """Rebuild tenant_activity_daily for the last year (through today)."""
+    tenants = await _list_tenants(tenant_ids)
+    end = datetime.now(timezone.utc).date() + timedelta(days=1)
+    ranges = day_ranges(end - timedelta(days=MAX_WINDOW_DAYS + 1), end, chunk_size or 31)
+    jobs = [(tenant_id, day_range) for tenant_id in tenants for day_range in ranges]
+    logger.info(f"activity: {len(tenants)} tenant(s), {len(jobs)} chunk(s)")
+    return await run_chunks(jobs, _recompute_activity_chunk, concurrency)
+
+
+BACKFILLS = {
+    "activity": backfill_activity,
+    "course-progress": backfill_course_progress,
+}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild report rollup tables")
+    parser.add_argument("rollup", choices=sorted(BACKFILLS))
+    parser.add_argument("--tenant", action="append", dest="tenants", help="Tenant ID (repeatable; default all)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Chunks rebuilt in parallel")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Courses (course-progress) or days (activity) per chunk")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    async def _main() -> tuple[int, int]:
+        try:
+            return await BACKFILLS[args.rollup](args.tenants, args.concurrency, args.chunk_size)
+        finally:
+            await engine.dispose()
+
+    start = time.perf_counter()
+    written, failed = asyncio.run(_main())
+    logger.info(f"{args.rollup}: {written} row(s) written, {failed} chunk(s) failed in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
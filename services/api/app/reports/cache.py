@@ -0,0 +1,167 @@
+"""
+Report Artifact Cache
+
+Generated reports are content-addressed: the cache key hashes the tenant,
+the ruleset, the request filters, the output format and a data-version
+watermark of the tables the ruleset reads. Identical requests against
+unchanged data map to the same key, and therefore to the same file.
+
+The watermark is, per table and tenant, max("updatedAt") plus a delete
+counter: inserts, updates and soft deletes move updatedAt, and hard
+deletes bump the tenant's row in report_delete_versions (a statement-level
+trigger, see alembic/versions/010_report_data_versions.py), so a stale
+artifact is never served. Both are index lookups - the
+("tenantId", "updatedAt") indexes and the counter's primary key - so the
+check costs the same for any tenant size.
+
+Two Redis keys per cache key:
+
+- report:inflight:<key>  task id of the job currently building it (SET NX)
+- report:artifact:<key>  the finished job's result, for REPORT_CACHE_TTL_SECONDS
+
+POST /api/reports/generate answers a cached or in-flight key with the
+existing task id, so every requester downloads the same artifact and
+identical concurrent requests queue one task. Artifact files are deleted
+by the report_evict_artifacts task once REPORT_ARTIFACT_RETENTION_SECONDS
+old.
+"""
+
+import hashlib
+import os
+import time
+from typing import Any, Mapping, Optional, Sequence
+
+import orjson
+from sqlalchemy import text
+
+from app.reports.ruleset import ruleset_hash
+
+ARTIFACT_KEY = "report:artifact:{key}"
+INFLIGHT_KEY = "report:inflight:{key}"
+
+# Longer than report_generate's time limit times its attempts
+INFLIGHT_TTL_SECONDS = 1800
+
+DELETE_VERSIONS_TABLE = "report_delete_versions"
+
+
+async def data_version(conn: Any, tenant_id: str, tables: Sequence[str]) -> str:
+    """
+    Data-version watermark for a tenant's rows in the given tables.
+
+    Args:
+        conn: AsyncConnection or AsyncSession
+        tenant_id: Tenant ID
+        tables: Whitelisted table names (CompiledReport.tables)
+    """
+    sql = " UNION ALL ".join(
+        f'SELECT \'{table}\' AS "table", '
+        f'(SELECT max("updatedAt") FROM {table} WHERE "tenantId" = :tenant_id) AS "version", '
+        f'(SELECT version FROM "{DELETE_VERSIONS_TABLE}" '
+        f"WHERE tenant_id = :tenant_id AND table_name = '{table}') AS \"deletes\""
+        for table in sorted(set(tables))
+    )
+    result = await conn.execute(text(sql), {"tenant_id": tenant_id})
+    return ";".join(
+        f"{row['table']}@{row['version'].isoformat() if row['version'] else '-'}#{row['deletes'] or 0}"
+        for row in result.mappings().all()
+    )
+
+
+def cache_key(
+    tenant_id: str,
+    ruleset: Mapping[str, Any],
+    filters: Optional[Mapping[str, Any]],
+    format: str,
+    version: str,
+) -> str:
+    """Content address of a report artifact."""
+    payload = orjson.dumps(
+        [tenant_id, ruleset_hash(ruleset), filters or {}, format.lower(), version],
+        option=orjson.OPT_SORT_KEYS,
+        default=str,
+    )
+    return hashlib.sha256(payload).hexdigest()
+
+
+async def find_cached(redis: Any, key: str) -> Optional[dict[str, Any]]:
+    """Cached report result for a key, if its artifact is still on disk."""
+    entry = await redis.get(ARTIFACT_KEY.format(key=key))
+    if entry is None:
+        return None
+    result = orjson.loads(entry)
+    if not os.path.exists(result.get("path") or ""):
+        await redis.delete(ARTIFACT_KEY.format(key=key))
+        return None
+    return result
+
+
+async def claim(redis: Any, key: str, task_id: str) -> Optional[str]:
+    """
+    Claim a key for a new task.
+
+    Returns None if `task_id` now owns the key, or the id of the task
+    already building it.
+    """
+    inflight = INFLIGHT_KEY.format(key=key)
+    for _ in range(2):
+        if await redis.set(inflight, task_id, nx=True, ex=INFLIGHT_TTL_SECONDS):
+            return None
+        owner = await redis.get(inflight)
+        if owner is not None:
+            return owner
+        # Released between SET and GET: try again
+    return None
+
+
+async def unclaim(redis: Any, key: str, task_id: str) -> None:
+    """Release a claim whose task could not be queued, unless another task took it over."""
+    inflight = INFLIGHT_KEY.format(key=key)
+    if await redis.get(inflight) == task_id:
+        await redis.delete(inflight)
+
+
+def publish(redis: Any, key: str, result: Mapping[str, Any], ttl: int) -> None:
+    """Record a finished report for a key and release the in-flight claim (blocking client)."""
+    pipe = redis.pipeline()
+    pipe.set(ARTIFACT_KEY.format(key=key), orjson.dumps(dict(result), default=str), ex=ttl)
+    pipe.delete(INFLIGHT_KEY.format(key=key))
+    pipe.execute()
+
+
+def release(redis: Any, key: str) -> None:
+    """Release an in-flight claim after a failed run (blocking client)."""
+    redis.delete(INFLIGHT_KEY.format(key=key))
+
+
+def evict_artifacts(storage_dir: str, max_age_seconds: int, now: Optional[float] = None) -> int:
+    """
+    Delete report files last written more than `max_age_seconds` ago.
+
+    Returns:
+        Files deleted
+    """
+    cutoff = (now or time.time()) - max_age_seconds
+    deleted = 0
+    for root, _, files in os.walk(storage_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                if os.stat(path).st_mtime < cutoff:
+                    os.unlink(path)
+                    deleted += 1
+            except FileNotFoundError:
+                pass  # removed concurrently
+    return deleted
+
+
+__all__ = [
+    "cache_key",
+    "claim",
+    "data_version",
+    "evict_artifacts",
+    "find_cached",
+    "publish",
+    "release",
+    "unclaim",
+]
@@ -0,0 +1,226 @@
+"""
+Incremental Course Progress Rollups
+
+`course_progress_stats` keeps one row per (tenant, course) with the
+enrollment counters behind /api/reports/course-progress:
+
+- total_enrollments / completed_enrollments
+- progress_sum (avg progress = progress_sum / total_enrollments)
+
+The counters are maintained by statement-level triggers on `enrollments`
+(INSERT, UPDATE, DELETE) that aggregate the transition tables, so a bulk
+insert of N enrollments costs one upsert per affected course rather than N
+row-level updates. Updates that do not touch courseId, status, progress or
+deletedAt leave the counters alone. Soft-deleted enrollments are not counted.
+
+`rebuild_course_progress` recomputes the counters from scratch for one
+tenant (optionally a chunk of its courses); `python -m app.reports.backfill`
+runs it for every tenant in parallel chunks.
+"""
+
+from typing import Any, Iterable, Optional, Sequence
+
+from sqlalchemy import text
+
+COURSE_PROGRESS_TABLE = "course_progress_stats"
+
+# Adds signed deltas from the `deltas` CTE to the counters
+_APPLY_DELTAS = f"""
+    INSERT INTO "{COURSE_PROGRESS_TABLE}" AS s
+        (tenant_id, course_id, total_enrollments, completed_enrollments, progress_sum, updated_at)
+    SELECT tenant_id, course_id, sum(d_total), sum(d_completed), sum(d_progress), now()
+    FROM deltas
+    GROUP BY tenant_id, course_id
+    HAVING sum(d_total) <> 0 OR sum(d_completed) <> 0 OR sum(d_progress) <> 0
+    ON CONFLICT (tenant_id, course_id) DO UPDATE SET
+        total_enrollments = s.total_enrollments + EXCLUDED.total_enrollments,
+        completed_enrollments = s.completed_enrollments + EXCLUDED.completed_enrollments,
+        progress_sum = s.progress_sum + EXCLUDED.progress_sum,
+        updated_at = EXCLUDED.updated_at;
+"""
+
+
+def _delta_select(alias: str, sign: int, where: str = "TRUE") -> str:
+    """SELECT producing signed counter deltas for the rows in `alias`."""
+    return f"""
+        SELECT {alias}."tenantId" AS tenant_id,
+               {alias}."courseId" AS course_id,
+               {sign} AS d_total,
+               CASE WHEN {alias}.status = 'COMPLETED' THEN {sign} ELSE 0 END AS d_completed,
+               {sign} * COALESCE({alias}.progress, 0)::bigint AS d_progress
+        FROM {{source}}
+        WHERE {alias}."deletedAt" IS NULL AND {where}
+    """
+
+
+_CHANGED = """
+    (o."courseId", o.status, o.progress, o."deletedAt")
+        IS DISTINCT FROM (n."courseId", n.status, n.progress, n."deletedAt")
+"""
+
+CREATE_TRIGGER_FUNCTION_SQL = f"""
+    CREATE OR REPLACE FUNCTION course_progress_stats_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            WITH deltas AS ({_delta_select("n", 1).format(source="new_rows n")})
+            {_APPLY_DELTAS}
+        ELSIF TG_OP = 'DELETE' THEN
+            WITH deltas AS ({_delta_select("o", -1).format(source="old_rows o")})
+            {_APPLY_DELTAS}
+        ELSE
+            WITH deltas AS (
+                {_delta_select("o", -1, _CHANGED).format(source="old_rows o JOIN new_rows n ON n.id = o.id")}
+                UNION ALL
+                {_delta_select("n", 1, _CHANGED).format(source="old_rows o JOIN new_rows n ON n.id = o.id")}
+            )
+            {_APPLY_DELTAS}
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# Transition tables require one trigger per event
+CREATE_TRIGGERS_SQL = (
+    """
+    CREATE TRIGGER enrollments_progress_stats_insert
+        AFTER INSERT ON "enrollments"
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """,
+    """
+    CREATE TRIGGER enrollments_progress_stats_update
+        AFTER UPDATE ON "enrollments"
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """,
+    """
+    CREATE TRIGGER enrollments_progress_stats_delete
+        AFTER DELETE ON "enrollments"
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION course_progress_stats_apply()
+    """,
+)
+
+
+def rebuild_sql(chunked: bool) -> str:
+    """Statement recomputing counters for a tenant (optionally a course chunk)."""
+    chunk_filter = "AND c.id = ANY(:course_ids)" if chunked else ""
+    return f"""
+        INSERT INTO "{COURSE_PROGRESS_TABLE}" AS s
+            (tenant_id, course_id, total_enrollments, completed_enrollments, progress_sum, updated_at)
+        SELECT c."tenantId", c.id,
+               count(e.id),
+               count(e.id) FILTER (WHERE e.status = 'COMPLETED'),
+               COALESCE(sum(e.progress), 0),
+               now()
+        FROM courses c
+        LEFT JOIN enrollments e
+            ON e."tenantId" = c."tenantId" AND e."courseId" = c.id AND e."deletedAt" IS NULL
+        WHERE c."tenantId" = :tenant_id {chunk_filter}
+        GROUP BY c."tenantId", c.id
+        ON CONFLICT (tenant_id, course_id) DO UPDATE SET
+            total_enrollments = EXCLUDED.total_enrollments,
+            completed_enrollments = EXCLUDED.completed_enrollments,
+            progress_sum = EXCLUDED.progress_sum,
+            updated_at = EXCLUDED.updated_at
+    """
+
+
+_REBUILD_TENANT_SQL = rebuild_sql(chunked=False)
+_REBUILD_CHUNK_SQL = rebuild_sql(chunked=True)
+
+_PRUNE_SQL = f"""
+    DELETE FROM "{COURSE_PROGRESS_TABLE}" s
+    WHERE s.tenant_id = :tenant_id
+      AND NOT EXISTS (SELECT 1 FROM courses c WHERE c.id = s.course_id)
+"""
+
+_READ_SQL = f"""
+    SELECT c.id, c.title, c.code,
+           COALESCE(s.total_enrollments, 0) AS total_enrollments,
+           COALESCE(s.completed_enrollments, 0) AS completed_enrollments,
+           COALESCE(s.progress_sum, 0) AS progress_sum
+    FROM courses c
+    LEFT JOIN "{COURSE_PROGRESS_TABLE}" s
+        ON s.tenant_id = c."tenantId" AND s.course_id = c.id
+    WHERE c."tenantId" = :tenant_id AND c."deletedAt" IS NULL {{course_filter}}
+    ORDER BY c.title
+"""
+
+
+async def rebuild_course_progress(
+    conn: Any,
+    tenant_id: str,
+    course_ids: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Recompute course_progress_stats for a tenant.
+
+    Args:
+        conn: AsyncConnection or AsyncSession
+        tenant_id: Tenant to rebuild
+        course_ids: Only rebuild these courses (whole tenant when None;
+            the whole-tenant rebuild also prunes rows for deleted courses)
+
+    Returns:
+        Number of course rows written
+    """
+    if course_ids is None:
+        result = await conn.execute(text(_REBUILD_TENANT_SQL), {"tenant_id": tenant_id})
+        await prune_course_progress(conn, tenant_id)
+    else:
+        result = await conn.execute(
+            text(_REBUILD_CHUNK_SQL),
+            {"tenant_id": tenant_id, "course_ids": list(course_ids)},
+        )
+    return result.rowcount
+
+
+async def prune_course_progress(conn: Any, tenant_id: str) -> int:
+    """Delete counter rows whose course no longer exists."""
+    result = await conn.execute(text(_PRUNE_SQL), {"tenant_id": tenant_id})
+    return result.rowcount
+
+
+async def read_course_progress(
+    conn: Any,
+    tenant_id: str,
+    course_id: Optional[str] = None,
+) -> list[dict[str, Any]]:
+    """Read the course progress report from the precomputed counters."""
+    params: dict[str, Any] = {"tenant_id": tenant_id}
+    course_filter = ""
+    if course_id:
+        course_filter = "AND c.id = :course_id"
+        params["course_id"] = course_id
+
+    result = await conn.execute(text(_READ_SQL.format(course_filter=course_filter)), params)
+    return format_course_progress(result.mappings().all())
+
+
+def format_course_progress(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    """Shape counter rows into the /api/reports/course-progress payload."""
+    data = []
+    for row in rows:
+        total = row["total_enrollments"]
+        completed = row["completed_enrollments"]
+        data.append({
+            "courseId": row["id"],
+            "title": row["title"],
+            "code": row["code"],
+            "totalEnrollments": total,
+            "completed": completed,
+            "avgProgress": round(row["progress_sum"] / total, 2) if total else 0,
+            "completionRate": round(completed / (total or 1) * 100, 1),
+        })
+    return data
+
+
+__all__ = [
+    "COURSE_PROGRESS_TABLE",
+    "format_course_progress",
+    "prune_course_progress",
+    "read_course_progress",
+    "rebuild_course_progress",
+]
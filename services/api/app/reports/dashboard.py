@@ -0,0 +1,172 @@
+"""
+Materialized Dashboard Statistics
+
+The reports dashboard used to run four aggregate queries over the tenant's
+users, courses and enrollments on every load. Those counts are now rolled
+up into `tenant_dashboard_stats` (one row per tenant):
+
+- `refresh_dashboard_stats` recomputes the rollup with one set-based
+  INSERT ... SELECT ... ON CONFLICT DO UPDATE, either for every tenant
+  (periodic Celery job) or for a single tenant (on demand)
+- `read_dashboard_stats` reads a tenant's row
+- `format_dashboard_stats` shapes a row into the dashboard response,
+  including its `refreshedAt` freshness timestamp
+
+Soft-deleted rows are excluded. "Active" users are those who logged in
+within the last ACTIVE_WINDOW_DAYS days.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping, Optional
+
+from sqlalchemy import text
+
+DASHBOARD_STATS_TABLE = "tenant_dashboard_stats"
+ACTIVE_WINDOW_DAYS = 30
+
+STAT_COLUMNS = (
+    "total_users",
+    "active_users",
+    "total_courses",
+    "enrollments_total",
+    "enrollments_completed",
+    "enrollments_in_progress",
+    "enrollments_not_started",
+)
+
+
+def _refresh_sql(single_tenant: bool) -> str:
+    """Build the rollup statement, optionally restricted to one tenant."""
+    scope = 'AND "tenantId" = :tenant_id' if single_tenant else ""
+    # "WHERE true" keeps ON CONFLICT from parsing as a join condition
+    tenant_scope = "WHERE t.id = :tenant_id" if single_tenant else "WHERE true"
+    return f"""
+        WITH u AS (
+            SELECT "tenantId",
+                   count(*) AS total,
+                   count(*) FILTER (WHERE "lastLoginAt" >= :active_since) AS active
+            FROM users
+            WHERE "deletedAt" IS NULL {scope}
+            GROUP BY "tenantId"
+        ),
+        c AS (
+            SELECT "tenantId", count(*) AS total
+            FROM courses
+            WHERE "deletedAt" IS NULL {scope}
+            GROUP BY "tenantId"
+        ),
+        e AS (
+            SELECT "tenantId",
+                   count(*) AS total,
+                   count(*) FILTER (WHERE status = 'COMPLETED') AS completed,
+                   count(*) FILTER (WHERE status = 'IN_PROGRESS') AS in_progress,
+                   count(*) FILTER (WHERE status = 'NOT_STARTED') AS not_started
+            FROM enrollments
+            WHERE "deletedAt" IS NULL {scope}
+            GROUP BY "tenantId"
+        )
+        INSERT INTO {DASHBOARD_STATS_TABLE} (
+            tenant_id, {", ".join(STAT_COLUMNS)}, refreshed_at
+        )
+        SELECT t.id,
+               COALESCE(u.total, 0), COALESCE(u.active, 0),
+               COALESCE(c.total, 0),
+               COALESCE(e.total, 0), COALESCE(e.completed, 0),
+               COALESCE(e.in_progress, 0), COALESCE(e.not_started, 0),
+               :refreshed_at
+        FROM tenants t
+        LEFT JOIN u ON u."tenantId" = t.id
+        LEFT JOIN c ON c."tenantId" = t.id
+        LEFT JOIN e ON e."tenantId" = t.id
+        {tenant_scope}
+        ON CONFLICT (tenant_id) DO UPDATE SET
+            {", ".join(f"{col} = EXCLUDED.{col}" for col in STAT_COLUMNS)},
+            refreshed_at = EXCLUDED.refreshed_at
+        RETURNING tenant_id, {", ".join(STAT_COLUMNS)}, refreshed_at
+    """
+
+
+_REFRESH_ALL_SQL = _refresh_sql(single_tenant=False)
+_REFRESH_TENANT_SQL = _refresh_sql(single_tenant=True)
+
+_READ_SQL = f"""
+    SELECT tenant_id, {", ".join(STAT_COLUMNS)}, refreshed_at
+    FROM {DASHBOARD_STATS_TABLE}
+    WHERE tenant_id = :tenant_id
+"""
+
+
+def refresh_params(now: Optional[datetime] = None) -> dict[str, Any]:
+    """Bind parameters for the rollup statement at a reference time."""
+    now = (now or datetime.now(timezone.utc)).replace(tzinfo=None)
+    return {
+        "active_since": now - timedelta(days=ACTIVE_WINDOW_DAYS),
+        "refreshed_at": now,
+    }
+
+
+async def refresh_dashboard_stats(
+    conn: Any,
+    tenant_id: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> list[Mapping[str, Any]]:
+    """
+    Recompute the dashboard rollup.
+
+    Args:
+        conn: AsyncConnection or AsyncSession
+        tenant_id: Only refresh this tenant (all tenants when None)
+        now: Reference time (defaults to now, UTC)
+
+    Returns:
+        The refreshed rows
+    """
+    params = refresh_params(now)
+    if tenant_id is not None:
+        params["tenant_id"] = tenant_id
+        sql = _REFRESH_TENANT_SQL
+    else:
+        sql = _REFRESH_ALL_SQL
+
+    result = await conn.execute(text(sql), params)
+    return list(result.mappings().all())
+
+
+async def read_dashboard_stats(conn: Any, tenant_id: str) -> Optional[Mapping[str, Any]]:
+    """Read a tenant's materialized stats row, or None if not computed yet."""
+    result = await conn.execute(text(_READ_SQL), {"tenant_id": tenant_id})
+    return result.mappings().first()
+
+
+def format_dashboard_stats(row: Mapping[str, Any]) -> dict[str, Any]:
+    """Shape a stats row into the /api/reports/dashboard response."""
+    total = row["enrollments_total"] or 0
+    completed = row["enrollments_completed"] or 0
+    refreshed_at = row["refreshed_at"]
+
+    return {
+        "users": {
+            "total": row["total_users"],
+            "active": row["active_users"],
+        },
+        "courses": {
+            "total": row["total_courses"],
+        },
+        "enrollments": {
+            "total": total,
+            "completed": completed,
+            "inProgress": row["enrollments_in_progress"],
+            "notStarted": row["enrollments_not_started"],
+        },
+        "completionRate": round(completed / total * 100, 1) if total else 0,
+        "refreshedAt": refreshed_at.isoformat() if refreshed_at else None,
+    }
+
+
+__all__ = [
+    "DASHBOARD_STATS_TABLE",
+    "format_dashboard_stats",
+    "read_dashboard_stats",
+    "refresh_dashboard_stats",
+    "refresh_params",
+]
@@ -0,0 +1,167 @@
+"""
+Streaming Report Engine
+
+Generates report files without materializing the result set:
+
+1. The ruleset (built-in type or a tenant's saved `reports.ruleset`) is
+   compiled to a parameterized SELECT
+2. Rows are streamed from a server-side cursor in fixed-size chunks
+3. Each chunk is appended to the output file by an incremental writer
+   (CSV, JSONL or XLSX) and then dropped
+
+Peak memory is one chunk of rows plus the writer's buffers, independent of
+the number of rows. Files are written to `<name>.<ext>.part` under the
+report storage directory and renamed into place only when complete.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Mapping, Optional, Sequence
+
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.reports.ruleset import BUILTIN_RULESETS, RulesetError, compile_ruleset
+from app.reports.writers import get_writer
+
+ProgressCallback = Callable[[int], None]
+
+
+@dataclass(frozen=True)
+class ReportArtifact:
+    """A generated report file."""
+    path: str
+    format: str
+    content_type: str
+    rows: int
+    bytes: int
+    seconds: float
+
+
+def report_storage_dir() -> str:
+    return get_settings().report_storage_dir
+
+
+def artifact_path(tenant_id: Optional[str], name: str, format: str) -> str:
+    """Storage path for a tenant's report artifact."""
+    extension = get_writer(format).extension
+    return os.path.join(report_storage_dir(), tenant_id or "_global", f"{name}.{extension}")
+
+
+async def load_ruleset(conn: Any, report_id: str, tenant_id: Optional[str]) -> Mapping[str, Any]:
+    """
+    Resolve a report id to its ruleset.
+
+    Built-in report types (enrollment, course_progress, user_activity) map to
+    predefined rulesets; anything else is looked up in the tenant's reports.
+    """
+    if report_id in BUILTIN_RULESETS:
+        return BUILTIN_RULESETS[report_id]
+
+    result = await conn.execute(
+        text('SELECT ruleset FROM reports WHERE id = :id AND "tenantId" = :tenant_id'),
+        {"id": report_id, "tenant_id": tenant_id},
+    )
+    ruleset = result.scalar_one_or_none()
+    if ruleset is None:
+        raise RulesetError(f"Report not found: {report_id}")
+    return ruleset
+
+
+async def stream_rows(
+    conn: Any,
+    statement: Any,
+    params: Mapping[str, Any],
+    chunk_size: int,
+) -> AsyncIterator[Sequence[Sequence[Any]]]:
+    """Yield result rows in chunks from a server-side cursor."""
+    result = await conn.stream(statement.execution_options(yield_per=chunk_size), params)
+    async for rows in result.partitions(chunk_size):
+        yield rows
+
+
+async def write_report(
+    chunks: AsyncIterator[Sequence[Sequence[Any]]],
+    columns: Sequence[str],
+    path: str,
+    format: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> ReportArtifact:
+    """
+    Write streamed row chunks to `path` in the given format.
+
+    The file is built at `path + ".part"` and atomically renamed on success;
+    on failure the partial file is removed.
+    """
+    writer_class = get_writer(format)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    partial = f"{path}.part"
+
+    start = time.perf_counter()
+    rows = 0
+    writer = writer_class(partial, columns)
+    try:
+        async for chunk in chunks:
+            writer.write_rows(chunk)
+            rows += len(chunk)
+            if on_progress:
+                on_progress(rows)
+        writer.close()
+        os.replace(partial, path)
+    except BaseException:
+        try:
+            writer.close()
+        except Exception:
+            pass
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+
+    return ReportArtifact(
+        path=path,
+        format=writer_class.extension,
+        content_type=writer_class.content_type,
+        rows=rows,
+        bytes=os.path.getsize(path),
+        seconds=time.perf_counter() - start,
+    )
+
+
+async def generate_report(
+    conn: Any,
+    ruleset: Mapping[str, Any],
+    tenant_id: str,
+    format: str,
+    path: str,
+    filters: Optional[Mapping[str, Any]] = None,
+    chunk_size: Optional[int] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> ReportArtifact:
+    """
+    Compile a ruleset and stream its rows into a report file.
+
+    Args:
+        conn: AsyncConnection (server-side cursors need a connection in a transaction)
+        ruleset: Report ruleset
+        tenant_id: Tenant whose rows are exported
+        format: csv, jsonl or xlsx
+        path: Destination file
+        filters: Request-time equality filters
+        chunk_size: Rows fetched per round trip (defaults to REPORT_CHUNK_SIZE)
+        on_progress: Called with the running row count after each chunk
+    """
+    compiled = compile_ruleset(ruleset, filters)
+    chunk_size = chunk_size or get_settings().report_chunk_size
+    chunks = stream_rows(conn, compiled.statement, compiled.params(tenant_id), chunk_size)
+    return await write_report(chunks, compiled.columns, path, format, on_progress)
+
+
+__all__ = [
+    "ReportArtifact",
+    "artifact_path",
+    "generate_report",
+    "load_ruleset",
+    "stream_rows",
+    "write_report",
+]
@@ -0,0 +1,501 @@
+"""
+Report Ruleset Compiler
+
+A report's `ruleset` JSON describes which rows and columns to export:
+
+    {
+        "entity": "enrollments",
+        "columns": ["course.code", "course.title"],
+        "groupBy": ["course.code", "course.title"],
+        "aggregates": [
+            {"fn": "count", "field": "id", "as": "enrollments"},
+            {"fn": "avg", "field": "progress", "as": "avgProgress"}
+        ],
+        "filters": [{"field": "status", "op": "in", "value": ["COMPLETED"]}],
+        "orderBy": [{"field": "course.code", "dir": "asc"}]
+    }
+
+`compile_ruleset` validates it against a column whitelist (ENTITIES: only
+the declared fields of users, courses and enrollments and their joins)
+and turns it into a parameterized SQLAlchemy Core SELECT over the raw
+tables, scoped to the tenant via `:tenant_id` and excluding soft-deleted
+rows. Whitelisted columns are typed, so each filter value is coerced to
+its field's type when bound (ISO strings for timestamps, numeric strings
+for numbers) and operators that do not apply to the type are rejected.
+
+Compiled plans are cached by a hash of the ruleset's *shape* (everything
+except filter values). Filter values and the tenant are bind parameters,
+and `in` filters bind one array (`= ANY(:f0)`), so the SQL text is the
+same for every run and tenant. SQLAlchemy's compiled cache and asyncpg's
+per-connection prepared statement cache then reuse the compiled SQL and
+server-side prepared statement for scheduled reports.
+
+The built-in report types offered by POST /api/reports/generate are plain
+rulesets in BUILTIN_RULESETS.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Mapping, Optional
+
+import orjson
+from cachetools import LRUCache
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    Integer,
+    Numeric,
+    Select,
+    String,
+    and_,
+    any_,
+    bindparam,
+    column,
+    distinct,
+    func,
+    select,
+    table,
+)
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.types import TypeEngine
+
+from app.db.models import CourseStatus, EnrollmentStatus, RoleKey, UserStatus
+
+
+class RulesetError(ValueError):
+    """Raised for rulesets that fail validation against the whitelist."""
+
+
+# ============= Tables =============
+
+def _enum(enum_class: type) -> Enum:
+    """Native Prisma enum column, read and bound as plain strings."""
+    return Enum(*(member.value for member in enum_class), name=enum_class.__name__)
+
+
+_users = table(
+    "users",
+    column("id", String), column("tenantId", String), column("username", String), column("email", String),
+    column("firstName", String), column("lastName", String), column("status", _enum(UserStatus)),
+    column("activeRole", _enum(RoleKey)), column("is_active", Boolean), column("createdAt", DateTime),
+    column("lastLoginAt", DateTime), column("deletedAt", DateTime),
+)
+
+_courses = table(
+    "courses",
+    column("id", String), column("tenantId", String), column("code", String), column("title", String),
+    column("status", _enum(CourseStatus)), column("isActive", Boolean), column("categoryId", String),
+    column("createdAt", DateTime), column("deletedAt", DateTime),
+)
+
+_enrollments = table(
+    "enrollments",
+    column("id", String), column("tenantId", String), column("userId", String), column("courseId", String),
+    column("status", _enum(EnrollmentStatus)), column("progress", Integer), column("score", Numeric),
+    column("startedAt", DateTime), column("completedAt", DateTime), column("expiresAt", DateTime),
+    column("createdAt", DateTime), column("deletedAt", DateTime),
+)
+
+# ============= Column Whitelist =============
+
+_USER_FIELDS = ("id", "username", "email", "firstName", "lastName", "status", "activeRole", "createdAt", "lastLoginAt")
+_COURSE_FIELDS = ("id", "code", "title", "status", "isActive", "categoryId", "createdAt")
+_ENROLLMENT_FIELDS = ("id", "userId", "courseId", "status", "progress", "score", "startedAt", "completedAt", "expiresAt", "createdAt")
+
+# Fields sum/avg may be applied to
+NUMERIC_FIELDS = frozenset({"progress", "score"})
+
+
+@dataclass(frozen=True)
+class Entity:
+    """A reportable base table and the tables it can join to."""
+    table: Any
+    fields: tuple[str, ...]
+    # relation prefix -> (table, fields, join condition)
+    relations: Mapping[str, tuple[Any, tuple[str, ...], Any]]
+
+
+ENTITIES: dict[str, Entity] = {
+    "users": Entity(_users, _USER_FIELDS, {}),
+    "courses": Entity(_courses, _COURSE_FIELDS, {}),
+    "enrollments": Entity(
+        _enrollments,
+        _ENROLLMENT_FIELDS,
+        {
+            "user": (
+                _users,
+                _USER_FIELDS,
+                and_(_users.c.id == _enrollments.c.userId, _users.c.tenantId == _enrollments.c.tenantId),
+            ),
+            "course": (
+                _courses,
+                _COURSE_FIELDS,
+                and_(_courses.c.id == _enrollments.c.courseId, _courses.c.tenantId == _enrollments.c.tenantId),
+            ),
+        },
+    ),
+}
+
+
+# ============= Built-in Reports =============
+
+BUILTIN_RULESETS: dict[str, dict[str, Any]] = {
+    "enrollment": {
+        "entity": "enrollments",
+        "columns": [
+            "user.email", "user.firstName", "user.lastName", "course.code", "course.title",
+            "status", "progress", "score", "startedAt", "completedAt", "createdAt",
+        ],
+    },
+    "course_progress": {
+        "entity": "enrollments",
+        "columns": ["course.code", "course.title"],
+        "groupBy": ["course.code", "course.title"],
+        "aggregates": [
+            {"fn": "count", "field": "id", "as": "enrollments"},
+            {"fn": "count", "field": "completedAt", "as": "completed"},
+            {"fn": "avg", "field": "progress", "as": "avgProgress"},
+        ],
+        "orderBy": [{"field": "course.code"}],
+    },
+    "user_activity": {
+        "entity": "users",
+        "columns": ["email", "firstName", "lastName", "status", "activeRole", "createdAt", "lastLoginAt"],
+        "orderBy": [{"field": "lastLoginAt", "dir": "desc"}],
+    },
+}
+
+
+# ============= Compilation =============
+
+_OPERATORS = {
+    "eq": lambda col, p: col == p,
+    "ne": lambda col, p: col != p,
+    "gt": lambda col, p: col > p,
+    "gte": lambda col, p: col >= p,
+    "lt": lambda col, p: col < p,
+    "lte": lambda col, p: col <= p,
+    "in": lambda col, p: col == any_(p),
+    "contains": lambda col, p: col.ilike(p, escape="\\"),
+}
+
+
+_EQUALITY_OPERATORS = frozenset({"eq", "ne", "in"})
+_ORDERED_OPERATORS = _EQUALITY_OPERATORS | {"gt", "gte", "lt", "lte"}
+
+# Operators that apply to each kind of column (see _kind)
+_KIND_OPERATORS = {
+    "text": frozenset(_OPERATORS),
+    "enum": _EQUALITY_OPERATORS,
+    "boolean": _EQUALITY_OPERATORS,
+    "integer": _ORDERED_OPERATORS,
+    "number": _ORDERED_OPERATORS,
+    "datetime": _ORDERED_OPERATORS,
+}
+
+
+def _escape_like(value: str) -> str:
+    """Match `value` literally inside an ILIKE pattern (escape character \\)."""
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _kind(type_: TypeEngine) -> str:
+    """Which values and operators a column type takes."""
+    if isinstance(type_, Enum):
+        return "enum"
+    if isinstance(type_, Boolean):
+        return "boolean"
+    if isinstance(type_, DateTime):
+        return "datetime"
+    if isinstance(type_, Integer):
+        return "integer"
+    if isinstance(type_, Numeric):
+        return "number"
+    return "text"
+
+
+def _coerce(field: str, type_: TypeEngine, value: Any) -> Any:
+    """
+    Convert a JSON filter value to the Python type the driver binds for the column.
+
+    Raises:
+        RulesetError: the value does not fit the field's type
+    """
+    kind = _kind(type_)
+    try:
+        if value is None or isinstance(value, (list, tuple, set, dict)):
+            raise ValueError
+        if kind == "datetime":
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif isinstance(value, date) and not isinstance(value, datetime):
+                value = datetime.combine(value, datetime.min.time())
+            if not isinstance(value, datetime):
+                raise ValueError
+            # Timestamp columns hold naive UTC
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc).replace(tzinfo=None)
+            return value
+        if kind == "boolean":
+            if isinstance(value, str) and value.lower() in ("true", "false"):
+                return value.lower() == "true"
+            if not isinstance(value, bool):
+                raise ValueError
+            return value
+        if isinstance(value, bool):
+            raise ValueError
+        if kind == "integer":
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError
+            return int(value)
+        if kind == "number":
+            number = Decimal(str(value))
+            if not number.is_finite():
+                raise ValueError
+            return number
+        if not isinstance(value, (str, int, float, Decimal)):
+            raise ValueError
+        value = str(value)
+        if kind == "enum" and value not in type_.enums:
+            raise ValueError
+        return value
+    except (ValueError, InvalidOperation):
+        raise RulesetError(f"Invalid {kind} value for {field}: {value!r}") from None
+
+
+_AGGREGATES = {
+    "count": func.count,
+    "count_distinct": lambda col: func.count(distinct(col)),
+    "sum": func.sum,
+    "avg": func.avg,
+    "min": func.min,
+    "max": func.max,
+}
+
+_plan_cache: LRUCache[str, "CompiledReport"] = LRUCache(maxsize=256)
+_plan_cache_lock = threading.Lock()
+_plan_cache_stats = {"hits": 0, "misses": 0}
+
+
+@dataclass(frozen=True)
+class CompiledReport:
+    """A compiled ruleset plan: the statement, its output columns and filter binding."""
+    statement: Select
+    columns: tuple[str, ...]
+    plan_hash: str
+    # (bind key, op, field, column type) in the order filter values are supplied
+    bindings: tuple[tuple[str, str, str, TypeEngine], ...] = ()
+    # tables read by the statement (for data-version checks)
+    tables: tuple[str, ...] = ()
+    # bind values for one call, set by compile_ruleset; the cached plan has none
+    values: Optional[Mapping[str, Any]] = None
+
+    def bind(self, values: list[Any]) -> dict[str, Any]:
+        """
+        Bind parameter values for filter values given in binding order.
+
+        Raises:
+            RulesetError: a value does not fit its field's type
+        """
+        params = {}
+        for (key, op, field, type_), value in zip(self.bindings, values):
+            if op == "in":
+                items = value if isinstance(value, (list, tuple, set)) else [value]
+                params[key] = [_coerce(field, type_, item) for item in items]
+            elif op == "contains":
+                params[key] = f"%{_escape_like(_coerce(field, type_, value))}%"
+            else:
+                params[key] = _coerce(field, type_, value)
+        return params
+
+    def params(self, tenant_id: str) -> dict[str, Any]:
+        """Bind parameters for running the statement for a tenant."""
+        return {**(self.values or {}), "tenant_id": tenant_id}
+
+
+def ruleset_hash(ruleset: Mapping[str, Any]) -> str:
+    """Stable hash of a full ruleset (including filter values)."""
+    return hashlib.sha256(orjson.dumps(ruleset, option=orjson.OPT_SORT_KEYS, default=str)).hexdigest()
+
+
+def _rules(ruleset: Mapping[str, Any], key: str) -> list[Mapping[str, Any]]:
+    """The rule objects under `key` (filters, aggregates, orderBy)."""
+    rules = ruleset.get(key) or []
+    if not isinstance(rules, list) or not all(isinstance(rule, Mapping) for rule in rules):
+        raise RulesetError(f"{key} must be a list of objects")
+    return rules
+
+
+def _shape(ruleset: Mapping[str, Any], filter_fields: tuple[str, ...]) -> dict[str, Any]:
+    """The parts of a ruleset that determine the SQL (no filter values)."""
+    return {
+        "entity": ruleset.get("entity"),
+        "columns": ruleset.get("columns"),
+        "groupBy": ruleset.get("groupBy"),
+        "aggregates": ruleset.get("aggregates"),
+        "orderBy": ruleset.get("orderBy"),
+        "filters": [[rule.get("field"), rule.get("op", "eq")] for rule in _rules(ruleset, "filters")],
+        "requestFilters": list(filter_fields),
+    }
+
+
+def _resolve(entity: Entity, field: Any, joins: dict[str, Any]) -> ColumnElement:
+    """Resolve a (possibly relation-prefixed) whitelisted field, recording joins."""
+    if not isinstance(field, str):
+        raise RulesetError(f"Invalid field: {field!r}")
+    prefix, _, name = field.rpartition(".")
+    if not prefix:
+        if field not in entity.fields:
+            raise RulesetError(f"Field not allowed: {field}")
+        return entity.table.c[field]
+
+    relation = entity.relations.get(prefix)
+    if relation is None or name not in relation[1]:
+        raise RulesetError(f"Field not allowed: {field}")
+    joins[prefix] = relation
+    return relation[0].c[name]
+
+
+def _build(ruleset: Mapping[str, Any], filter_fields: tuple[str, ...], plan_hash: str) -> CompiledReport:
+    """Validate a ruleset shape and build its statement."""
+    entity = ENTITIES.get(ruleset.get("entity", ""))
+    if entity is None:
+        raise RulesetError(f"Unknown entity: {ruleset.get('entity')!r}")
+
+    joins: dict[str, Any] = {}
+    group_by = list(ruleset.get("groupBy") or [])
+    aggregates = _rules(ruleset, "aggregates")
+    grouped = bool(group_by or aggregates)
+
+    column_names = list(ruleset.get("columns") or (group_by if grouped else entity.fields))
+    if grouped:
+        ungrouped = [name for name in column_names if name not in group_by]
+        if ungrouped:
+            raise RulesetError(f"Columns must be grouped or aggregated: {', '.join(ungrouped)}")
+    selected = [_resolve(entity, name, joins).label(name) for name in column_names]
+
+    aggregated: dict[str, ColumnElement] = {}
+    for aggregate in aggregates:
+        fn = aggregate.get("fn")
+        field = aggregate.get("field", "id")
+        alias = aggregate.get("as") or f"{fn}_{field}"
+        if fn not in _AGGREGATES:
+            raise RulesetError(f"Unknown aggregate: {fn!r}")
+        expression = _AGGREGATES[fn](_resolve(entity, field, joins))
+        if fn in ("sum", "avg") and field.rpartition(".")[2] not in NUMERIC_FIELDS:
+            raise RulesetError(f"Aggregate {fn} needs a numeric field, got {field}")
+        if alias in column_names:
+            raise RulesetError(f"Duplicate column: {alias}")
+        aggregated[alias] = expression
+        selected.append(expression.label(alias))
+        column_names.append(alias)
+
+    conditions = [entity.table.c.tenantId == bindparam("tenant_id"), entity.table.c.deletedAt.is_(None)]
+    bindings = []
+    rules = [(rule.get("field"), rule.get("op", "eq")) for rule in _rules(ruleset, "filters")]
+    rules += [(field, "eq") for field in filter_fields]
+    for index, (field, op) in enumerate(rules):
+        if op not in _OPERATORS:
+            raise RulesetError(f"Unknown operator: {op!r}")
+        col = _resolve(entity, field, joins)
+        if op not in _KIND_OPERATORS[_kind(col.type)]:
+            raise RulesetError(f"Operator {op} does not apply to {_kind(col.type)} field {field}")
+        key = f"f{index}"
+        conditions.append(_OPERATORS[op](col, bindparam(key)))
+        bindings.append((key, op, field, col.type))
+
+    order_by = []
+    for rule in _rules(ruleset, "orderBy"):
+        field = rule.get("field")
+        if field in aggregated:
+            col = aggregated[field]
+        elif grouped and field not in group_by:
+            raise RulesetError(f"Order by must use a grouped or aggregated column: {field}")
+        else:
+            col = _resolve(entity, field, joins)
+        order_by.append(col.desc() if rule.get("dir") == "desc" else col.asc())
+
+    source = entity.table
+    for related, _, on in joins.values():
+        source = source.join(related, on)
+
+    statement = select(*selected).select_from(source).where(*conditions)
+    if grouped:
+        statement = statement.group_by(*(_resolve(entity, name, joins) for name in group_by))
+    else:
+        order_by.append(entity.table.c.id)
+    if order_by:
+        statement = statement.order_by(*order_by)
+
+    tables = (entity.table.name, *(related.name for related, _, _ in joins.values()))
+    return CompiledReport(statement, tuple(column_names), plan_hash, tuple(bindings), tables)
+
+
+def compile_ruleset(
+    ruleset: Mapping[str, Any],
+    filters: Optional[Mapping[str, Any]] = None,
+) -> CompiledReport:
+    """
+    Compile a ruleset (plus optional request-time equality filters).
+
+    The statement is taken from the plan cache when a ruleset of the same
+    shape was compiled before; only the bind values are computed per call.
+
+    Raises:
+        RulesetError: unknown entity, field, operator or aggregate, a
+            field outside the whitelist, an operator or filter value that
+            does not fit the field's type, or a malformed ruleset
+    """
+    if not isinstance(ruleset, Mapping):
+        raise RulesetError("Ruleset must be an object")
+    for key in ("filters", "aggregates", "orderBy"):
+        _rules(ruleset, key)
+    filters = filters or {}
+    filter_fields = tuple(sorted(filters))
+    plan_hash = hashlib.sha256(
+        orjson.dumps(_shape(ruleset, filter_fields), option=orjson.OPT_SORT_KEYS, default=str)
+    ).hexdigest()
+
+    with _plan_cache_lock:
+        plan = _plan_cache.get(plan_hash)
+        _plan_cache_stats["hits" if plan is not None else "misses"] += 1
+    if plan is None:
+        plan = _build(ruleset, filter_fields, plan_hash)
+        with _plan_cache_lock:
+            _plan_cache[plan_hash] = plan
+
+    values = [rule.get("value") for rule in _rules(ruleset, "filters")]
+    values += [filters[field] for field in filter_fields]
+    return CompiledReport(
+        plan.statement, plan.columns, plan.plan_hash, plan.bindings, plan.tables, plan.bind(values)
+    )
+
+
+def plan_cache_info() -> dict[str, int]:
+    """Plan cache hit/miss counters and size."""
+    with _plan_cache_lock:
+        return {**_plan_cache_stats, "size": len(_plan_cache)}
+
+
+def clear_plan_cache() -> None:
+    """Drop all cached plans (tests, or after changing the whitelist)."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
+        _plan_cache_stats.update(hits=0, misses=0)
+
+
+__all__ = [
+    "BUILTIN_RULESETS",
+    "CompiledReport",
+    "ENTITIES",
+    "NUMERIC_FIELDS",
+    "RulesetError",
+    "clear_plan_cache",
+    "compile_ruleset",
+    "plan_cache_info",
+    "ruleset_hash",
+]
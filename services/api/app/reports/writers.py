@@ -0,0 +1,169 @@
+"""
+Incremental Report Writers
+
+Each writer appends rows to a file as they arrive, so a report never has
+to be held in memory:
+
+- CSV and JSONL write straight through a buffered file handle
+- XLSX uses XlsxWriter's constant_memory mode, which flushes each row to
+  a temporary sheet file as soon as the next one starts; sheets roll over
+  at Excel's row limit
+
+Cell values are normalized the same way for every format: enums become
+their value, Decimals become floats, and NULLs become empty cells.
+"""
+
+import csv
+import enum
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Iterable, Sequence
+
+import orjson
+
+XLSX_MAX_ROWS = 1_048_576
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+def _cell(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class ReportWriter:
+    """Base class for incremental report writers."""
+
+    extension = ""
+    content_type = "application/octet-stream"
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        self.path = path
+        self.columns = list(columns)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        raise NotImplementedError
+
+
+class CsvReportWriter(ReportWriter):
+    """CSV with a header row; datetimes as ISO 8601."""
+
+    extension = "csv"
+    content_type = "text/csv"
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        super().__init__(path, columns)
+        self._file = open(path, "w", newline="", encoding="utf-8", buffering=1024 * 1024)
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(self.columns)
+
+    @staticmethod
+    def _csv_cell(value: Any) -> Any:
+        value = _cell(value)
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        cell = self._csv_cell
+        self._writer.writerows([cell(value) for value in row] for row in rows)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JsonlReportWriter(ReportWriter):
+    """One JSON object per line, keyed by column name."""
+
+    extension = "jsonl"
+    content_type = "application/x-ndjson"
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        super().__init__(path, columns)
+        self._file = open(path, "wb", buffering=1024 * 1024)
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        columns = self.columns
+        self._file.write(b"".join(
+            orjson.dumps(dict(zip(columns, row)), default=_json_default) + b"\n"
+            for row in rows
+        ))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class XlsxReportWriter(ReportWriter):
+    """Excel workbook written in constant-memory mode."""
+
+    extension = "xlsx"
+    content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    def __init__(self, path: str, columns: Sequence[str]):
+        import xlsxwriter
+
+        super().__init__(path, columns)
+        self._workbook = xlsxwriter.Workbook(path, {
+            "constant_memory": True,
+            "remove_timezone": True,
+            "default_date_format": "yyyy-mm-dd hh:mm:ss",
+            "strings_to_numbers": False,
+            "strings_to_formulas": False,
+            "strings_to_urls": False,
+        })
+        self._header_format = self._workbook.add_format({"bold": True})
+        self._sheet = None
+        self._sheet_count = 0
+        self._row = XLSX_MAX_ROWS
+
+    def _next_sheet(self) -> None:
+        self._sheet_count += 1
+        self._sheet = self._workbook.add_worksheet(f"Report {self._sheet_count}" if self._sheet_count > 1 else "Report")
+        self._sheet.write_row(0, 0, self.columns, self._header_format)
+        self._row = 1
+
+    def write_rows(self, rows: Iterable[Sequence[Any]]) -> None:
+        for row in rows:
+            if self._row >= XLSX_MAX_ROWS:
+                self._next_sheet()
+            self._sheet.write_row(self._row, 0, [_cell(value) for value in row])
+            self._row += 1
+
+    def close(self) -> None:
+        if self._sheet is None:
+            self._next_sheet()
+        self._workbook.close()
+
+
+WRITERS: dict[str, type[ReportWriter]] = {
+    writer.extension: writer
+    for writer in (CsvReportWriter, JsonlReportWriter, XlsxReportWriter)
+}
+
+
+def get_writer(format: str) -> type[ReportWriter]:
+    """Writer class for an output format."""
+    writer = WRITERS.get((format or "").lower())
+    if writer is None:
+        raise ValueError(f"Unsupported report format: {format}")
+    return writer
+
+
+__all__ = [
+    "CsvReportWriter",
+    "JsonlReportWriter",
+    "ReportWriter",
+    "WRITERS",
+    "XlsxReportWriter",
+    "get_writer",
+]
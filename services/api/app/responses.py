@@ -0,0 +1,70 @@
+"""
+Fast JSON Responses
+
+ORJSONResponse is the application's default response class. It encodes
+with orjson, which handles datetime, UUID and enums natively, so routes
+can return raw column values without per-row isoformat()/`.value` calls.
+
+Routes that build large payloads should return an ORJSONResponse instance
+directly: FastAPI then skips its own jsonable_encoder/response_model pass,
+so the payload is serialized exactly once.
+
+is_not_modified answers conditional GETs (If-None-Match/If-Modified-Since)
+for file downloads, which Starlette's FileResponse does not do itself.
+"""
+
+from decimal import Decimal
+from email.utils import parsedate_to_datetime
+from typing import Any, Mapping
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return str(value)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def is_not_modified(request_headers: Mapping[str, str], response_headers: Mapping[str, str]) -> bool:
+    """
+    Whether a conditional GET can be answered with 304 Not Modified.
+
+    If-None-Match is compared against the response ETag (weak comparison);
+    If-Modified-Since is only consulted when no If-None-Match was sent.
+    """
+    if_none_match = request_headers.get("if-none-match")
+    etag = response_headers.get("etag")
+    if if_none_match is not None:
+        if etag is None:
+            return False
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request_headers.get("if-modified-since")
+    last_modified = response_headers.get("last-modified")
+    if if_modified_since and last_modified:
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+__all__ = [
+    "ORJSONResponse",
+    "is_not_modified",
+]
@@ -4,21 +4,28 @@ Assignment Routes
 CRUD endpoints for assignments with role-based access control.
 """
 
+import logging
 from typing import Annotated, Any, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
+from redis.exceptions import RedisError
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.auth import AuthContext, RequireAuth
 from app.db.models import Assignment, Course, Enrollment
-from app.db.session import get_db
+from app.db.session import engine, get_db
 from app.errors import BadRequestError, NotFoundError, RBACError, ForbiddenError
 from app.rbac import can
-from app.jobs.tasks import timeline_add_event
+from app.config import get_settings
+from app.db.redis import get_redis
+from app.jobs.tasks import timeline_flush
+from app.timeline import buffer_events_async, flush_due, timeline_event, write_batch
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -38,6 +45,37 @@ class UpdateAssignmentRequest(BaseModel):
     dueAt: Optional[str] = None
 
 
+# ============= Helper Functions =============
+
+async def record_timeline_event(event: dict[str, Any]) -> None:
+    """
+    Buffer a timeline event for timeline_flush.
+
+    Runs after the request's commit, so failures never fail the request:
+    without Redis the event is written directly, and if that fails too it
+    is dropped with a warning.
+    """
+    try:
+        buffered = await buffer_events_async(get_redis(), [event])
+    except RedisError:
+        logger.warning("Timeline buffer unavailable, writing event directly", exc_info=True)
+        try:
+            _, rejected = await write_batch(engine, [event])
+        except Exception:
+            logger.warning(f"Timeline event {event['eventType']} dropped", exc_info=True)
+            return
+        if rejected:
+            logger.warning(f"Timeline event {event['eventType']} rejected by the database")
+        return
+
+    if flush_due(buffered, 1, get_settings().timeline_flush_batch_size):
+        try:
+            timeline_flush.delay()
+        except Exception:
+            # The scheduled flush picks the batch up
+            logger.warning("Could not queue timeline flush", exc_info=True)
+
+
 # ============= Endpoints =============
 
 @router.get("")
@@ -202,15 +240,16 @@ async def create_assignment(
     await db.commit()
     await db.refresh(assignment)
     
-    # Queue timeline event
+    # Buffer timeline event (written in batches by timeline_flush)
     if request.courseId and context.tenant_id:
-        timeline_add_event.delay(
+        event = timeline_event(
+            context.tenant_id,
+            "ASSIGNMENT_CREATED",
             user_id=context.user_id,
-            tenant_id=context.tenant_id,
-            event_type="ASSIGNMENT_CREATED",
             course_id=request.courseId,
             details={"assignmentId": assignment.id, "title": request.title},
         )
+        await record_timeline_event(event)
     
     return {
         "id": assignment.id,
@@ -0,0 +1,116 @@
+"""
+Audit Log Routes
+
+Read and export endpoints for the tenant's audit trail.
+"""
+
+from datetime import datetime
+from typing import Annotated, Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.audit.query import AuditQuery, export_audit_ndjson, query_audit_log
+from app.auth import AuthContext, RequireAuth
+from app.db.session import get_db
+from app.errors import BadRequestError, RBACError
+from app.rbac import can
+
+router = APIRouter()
+
+
+# ============= Helper Functions =============
+
+def build_audit_query(
+    context: AuthContext,
+    start: Optional[datetime],
+    end: Optional[datetime],
+    eventType: Optional[list[str]],
+    userId: Optional[str],
+    resourceType: Optional[str],
+    resourceId: Optional[str],
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> AuditQuery:
+    """Build an AuditQuery pinned to the caller's tenant."""
+    if start and end and start >= end:
+        raise BadRequestError("start must be before end")
+
+    return AuditQuery(
+        tenant_id=context.tenant_id,
+        start=start,
+        end=end,
+        event_types=eventType or [],
+        user_id=userId,
+        resource_type=resourceType,
+        resource_id=resourceId,
+        limit=limit,
+        cursor=cursor,
+    )
+
+
+# ============= Endpoints =============
+
+@router.get("")
+async def list_audit_events(
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start: Optional[datetime] = Query(None, description="Window start (default: 30 days before end)"),
+    end: Optional[datetime] = Query(None, description="Window end (default: now)"),
+    eventType: Optional[list[str]] = Query(None, description="Filter by event type (repeatable)"),
+    userId: Optional[str] = Query(None, description="Filter by acting user"),
+    resourceType: Optional[str] = Query(None, description="Filter by resource type"),
+    resourceId: Optional[str] = Query(None, description="Filter by resource ID"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+) -> dict[str, Any]:
+    """
+    GET /api/audit
+    List audit events, newest first, with keyset pagination.
+    """
+    if not await can(db, context, "security:audit:read"):
+        raise RBACError("security:audit:read")
+
+    query = build_audit_query(
+        context, start, end, eventType, userId, resourceType, resourceId, limit, cursor,
+    )
+
+    try:
+        events, next_cursor = await query_audit_log(db, query)
+    except ValueError as e:
+        raise BadRequestError(str(e))
+
+    return {
+        "data": events,
+        "nextCursor": next_cursor,
+    }
+
+
+@router.get("/export")
+async def export_audit_events(
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    start: Optional[datetime] = Query(None, description="Window start (default: 30 days before end)"),
+    end: Optional[datetime] = Query(None, description="Window end (default: now)"),
+    eventType: Optional[list[str]] = Query(None, description="Filter by event type (repeatable)"),
+    userId: Optional[str] = Query(None, description="Filter by acting user"),
+    resourceType: Optional[str] = Query(None, description="Filter by resource type"),
+    resourceId: Optional[str] = Query(None, description="Filter by resource ID"),
+) -> StreamingResponse:
+    """
+    GET /api/audit/export
+    Stream matching audit events as NDJSON (oldest first).
+    """
+    if not await can(db, context, "security:audit:read"):
+        raise RBACError("security:audit:read")
+
+    query = build_audit_query(
+        context, start, end, eventType, userId, resourceType, resourceId,
+    )
+
+    return StreamingResponse(
+        export_audit_ndjson(query),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit-log.ndjson"'},
+    )
@@ -14,9 +14,11 @@ from sqlalchemy.orm import selectinload
 
 from app.auth import AuthContext, RequireAuth
 from app.db.models import Branch, Tenant
+from app.db.serializers import BRANCH_DETAIL
 from app.db.session import get_db
 from app.errors import BadRequestError, NotFoundError, RBACError
 from app.rbac import can
+from app.responses import ORJSONResponse
 
 router = APIRouter()
 
@@ -33,6 +35,16 @@ def generate_slug(name: str) -> str:
     return slug
 
 
+def _tenant_summary(tenant: Tenant | None) -> dict[str, Any] | None:
+    """Embedded tenant info for branch responses."""
+    if not tenant:
+        return None
+    return {
+        "name": tenant.name,
+        "domain": tenant.domain,
+    }
+
+
 # ============= Request/Response Schemas =============
 
 class CreateBranchRequest(BaseModel):
@@ -69,7 +81,7 @@ async def list_branches(
     search: Optional[str] = Query(None, description="Search by name, slug, or title"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     GET /api/branches
     List all branches with pagination.
@@ -79,8 +91,8 @@ async def list_branches(
     
     skip = (page - 1) * limit
     
-    # Build query
-    query = select(Branch)
+    # Build query (projected columns plus embedded tenant fields)
+    query = select(*BRANCH_DETAIL.columns, Tenant.name, Tenant.domain).outerjoin(Tenant, Branch.tenant)
     count_query = select(func.count()).select_from(Branch)
     
     # Apply search filter
@@ -97,39 +109,22 @@ async def list_branches(
     count_result = await db.execute(count_query)
     total = count_result.scalar() or 0
     
-    # Apply pagination and include tenant
-    query = query.options(selectinload(Branch.tenant)).offset(skip).limit(limit).order_by(Branch.created_at.desc())
+    # Apply pagination
+    query = query.offset(skip).limit(limit).order_by(Branch.created_at.desc())
     
     # Execute query
     result = await db.execute(query)
-    branches = result.scalars().all()
     
     # Transform for response
+    width = len(BRANCH_DETAIL.keys)
     branches_data = []
-    for branch in branches:
-        tenant_data = None
-        if branch.tenant:
-            tenant_data = {
-                "name": branch.tenant.name,
-                "domain": branch.tenant.domain,
-            }
-        
-        branches_data.append({
-            "id": branch.id,
-            "tenantId": branch.tenant_id,
-            "name": branch.name,
-            "slug": branch.slug,
-            "title": branch.title,
-            "description": branch.description,
-            "isActive": branch.is_active,
-            "defaultLanguage": branch.default_language,
-            "settings": branch.settings,
-            "createdAt": branch.created_at.isoformat() if branch.created_at else None,
-            "updatedAt": branch.updated_at.isoformat() if branch.updated_at else None,
-            "tenant": tenant_data,
-        })
+    for row in result.all():
+        branch_data = BRANCH_DETAIL.row(row[:width])
+        tenant_name, tenant_domain = row[width:]
+        branch_data["tenant"] = {"name": tenant_name, "domain": tenant_domain} if tenant_name is not None else None
+        branches_data.append(branch_data)
     
-    return {
+    return ORJSONResponse({
         "data": branches_data,
         "pagination": {
             "page": page,
@@ -137,7 +132,7 @@ async def list_branches(
             "total": total,
             "totalPages": (total + limit - 1) // limit,
         }
-    }
+    })
 
 
 @router.post("")
@@ -220,7 +215,7 @@ async def get_branch(
     branch_id: str,
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     GET /api/branches/{branch_id}
     Get a single branch by ID.
@@ -236,27 +231,10 @@ async def get_branch(
     if not branch:
         raise NotFoundError("Branch")
     
-    tenant_data = None
-    if branch.tenant:
-        tenant_data = {
-            "name": branch.tenant.name,
-            "domain": branch.tenant.domain,
-        }
+    branch_data = BRANCH_DETAIL.entity(branch)
+    branch_data["tenant"] = _tenant_summary(branch.tenant)
     
-    return {
-        "id": branch.id,
-        "tenantId": branch.tenant_id,
-        "name": branch.name,
-        "slug": branch.slug,
-        "title": branch.title,
-        "description": branch.description,
-        "isActive": branch.is_active,
-        "defaultLanguage": branch.default_language,
-        "settings": branch.settings,
-        "createdAt": branch.created_at.isoformat() if branch.created_at else None,
-        "updatedAt": branch.updated_at.isoformat() if branch.updated_at else None,
-        "tenant": tenant_data,
-    }
+    return ORJSONResponse(branch_data)
 
 
 @router.put("/{branch_id}")
@@ -13,9 +13,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import AuthContext, RequireAuth
 from app.db.models import Course, CourseStatus
+from app.db.serializers import COURSE_DETAIL, COURSE_LIST
 from app.db.session import get_db
 from app.errors import BadRequestError, NotFoundError, RBACError
 from app.rbac import can
+from app.responses import ORJSONResponse
 
 router = APIRouter()
 
@@ -58,7 +60,7 @@ class CourseListResponse(BaseModel):
 
 # ============= Endpoints =============
 
-@router.get("")
+@router.get("", response_model=CourseListResponse)
 async def list_courses(
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -67,15 +69,15 @@ async def list_courses(
     hidden: str | None = Query(None, description="Filter by hiddenFromCatalog"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-) -> CourseListResponse:
+) -> ORJSONResponse:
     """
     List courses with pagination and filtering.
     """
     if not await can(db, context, "course:read"):
         raise RBACError("course:read")
     
-    # Build query
-    query = select(Course)
+    # Build query (projected columns only, no ORM entities)
+    query = select(*COURSE_LIST.columns)
     count_query = select(func.count()).select_from(Course)
     
     # Apply search filter
@@ -109,31 +111,14 @@ async def list_courses(
     
     # Execute query
     result = await db.execute(query)
-    courses = result.scalars().all()
-    
-    # Transform for response
-    courses_data = []
-    for course in courses:
-        courses_data.append({
-            "id": course.id,
-            "code": course.code,
-            "title": course.title,
-            "description": course.description,
-            "status": course.status.value if hasattr(course.status, 'value') else str(course.status),
-            "isActive": course.is_active,
-            "hiddenFromCatalog": course.hidden_from_catalog,
-            "thumbnail_url": course.thumbnail_url,
-            "categoryId": course.category_id,
-            "createdAt": course.created_at.isoformat() if course.created_at else None,
-        })
-    
-    return CourseListResponse(
-        courses=courses_data,
-        total=total,
-        page=page,
-        limit=limit,
-        totalPages=(total + limit - 1) // limit,
-    )
+    
+    return ORJSONResponse({
+        "courses": COURSE_LIST.rows(result.all()),
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": (total + limit - 1) // limit,
+    })
 
 
 @router.post("")
@@ -194,7 +179,7 @@ async def get_course(
     course_id: str,
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get a single course by ID.
     """
@@ -209,20 +194,7 @@ async def get_course(
     if not course:
         raise NotFoundError("Course")
     
-    return {
-        "id": course.id,
-        "code": course.code,
-        "title": course.title,
-        "description": course.description,
-        "status": course.status.value if hasattr(course.status, 'value') else str(course.status),
-        "isActive": course.is_active,
-        "hiddenFromCatalog": course.hidden_from_catalog,
-        "thumbnail_url": course.thumbnail_url,
-        "categoryId": course.category_id,
-        "instructorId": course.instructor_id,
-        "createdAt": course.created_at.isoformat() if course.created_at else None,
-        "updatedAt": course.updated_at.isoformat() if course.updated_at else None,
-    }
+    return ORJSONResponse(COURSE_DETAIL.entity(course))
 
 
 @router.put("/{course_id}")
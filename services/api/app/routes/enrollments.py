@@ -1,24 +1,30 @@
 """
 Enrollment Routes
 
-CRUD endpoints for course enrollments.
+CRUD endpoints for course enrollments, plus a bulk endpoint that enrolls
+user x course sets with set-wise validation and chunked inserts.
 """
 
 from typing import Annotated, Any, Optional
 from datetime import datetime
+from uuid import uuid4
 
 from fastapi import APIRouter, Depends, Query
 from pydantic import BaseModel, Field
-from sqlalchemy import func, select, and_
+from sqlalchemy import func, select, and_, text
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.auth import AuthContext, RequireAuth
+from app.config import get_settings
 from app.db.models import Enrollment, Course, EnrollmentStatus
+from app.db.serializers import COURSE_SUMMARY, ENROLLMENT_LIST
 from app.db.session import get_db
 from app.errors import BadRequestError, NotFoundError, RBACError
 from app.rbac import can
+from app.responses import ORJSONResponse
 from app.audit import log_audit_background, AuditEntry, AuditEventType
+from app.imports.enrollments import batch_audit_entries, insert_enrollments
+from app.jobs.tasks import enrollments_created
 
 router = APIRouter()
 
@@ -30,6 +36,12 @@ class CreateEnrollmentRequest(BaseModel):
     courseId: str
 
 
+class BulkEnrollmentRequest(BaseModel):
+    userIds: list[str] = Field(default_factory=list, max_length=10000)
+    courseIds: list[str] = Field(default_factory=list, max_length=100)
+    groupId: Optional[str] = None  # members are added to userIds; its courses are used if courseIds is empty
+
+
 class EnrollmentListResponse(BaseModel):
     data: list[dict[str, Any]]
     stats: dict[str, int]
@@ -38,7 +50,7 @@ class EnrollmentListResponse(BaseModel):
 
 # ============= Endpoints =============
 
-@router.get("")
+@router.get("", response_model=EnrollmentListResponse)
 async def list_enrollments(
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -47,7 +59,7 @@ async def list_enrollments(
     search: Optional[str] = Query(None, description="Search by course title/code"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     GET /api/enrollments
     List enrollments with pagination and filtering.
@@ -59,8 +71,12 @@ async def list_enrollments(
     target_user_id = userId or context.user_id
     skip = (page - 1) * limit
     
-    # Build query
-    query = select(Enrollment).where(Enrollment.user_id == target_user_id)
+    # Build query (projected enrollment + course columns, no ORM entities)
+    query = (
+        select(*ENROLLMENT_LIST.columns, *COURSE_SUMMARY.columns)
+        .join(Course, Enrollment.course_id == Course.id)
+        .where(Enrollment.user_id == target_user_id)
+    )
     count_query = select(func.count()).select_from(Enrollment).where(Enrollment.user_id == target_user_id)
     
     # Apply status filter
@@ -70,7 +86,7 @@ async def list_enrollments(
     
     # Apply search filter (requires join with course)
     if search:
-        query = query.join(Course).where(
+        query = query.where(
             Course.title.ilike(f"%{search}%") | Course.code.ilike(f"%{search}%")
         )
         count_query = count_query.join(Course).where(
@@ -81,12 +97,12 @@ async def list_enrollments(
     count_result = await db.execute(count_query)
     total = count_result.scalar() or 0
     
-    # Apply pagination and include course
-    query = query.options(selectinload(Enrollment.course)).offset(skip).limit(limit).order_by(Enrollment.updated_at.desc())
+    # Apply pagination
+    query = query.offset(skip).limit(limit).order_by(Enrollment.updated_at.desc())
     
     # Execute query
     result = await db.execute(query)
-    enrollments = result.scalars().all()
+    rows = result.all()
     
     # Calculate stats
     stats_result = await db.execute(
@@ -107,33 +123,14 @@ async def list_enrollments(
             stats["notStarted"] = count
     
     # Transform for response
+    width = len(ENROLLMENT_LIST.keys)
     enrollments_data = []
-    for enrollment in enrollments:
-        course_data = None
-        if enrollment.course:
-            course_data = {
-                "id": enrollment.course.id,
-                "code": enrollment.course.code,
-                "title": enrollment.course.title,
-                "description": enrollment.course.description,
-                "thumbnail_url": enrollment.course.thumbnail_url,
-                "status": enrollment.course.status.value if hasattr(enrollment.course.status, 'value') else str(enrollment.course.status),
-            }
-        
-        enrollments_data.append({
-            "id": enrollment.id,
-            "userId": enrollment.user_id,
-            "courseId": enrollment.course_id,
-            "status": enrollment.status.value if hasattr(enrollment.status, 'value') else str(enrollment.status),
-            "progress": enrollment.progress,
-            "score": float(enrollment.score) if enrollment.score else None,
-            "startedAt": enrollment.started_at.isoformat() if enrollment.started_at else None,
-            "completedAt": enrollment.completed_at.isoformat() if enrollment.completed_at else None,
-            "createdAt": enrollment.created_at.isoformat() if enrollment.created_at else None,
-            "course": course_data,
-        })
+    for row in rows:
+        enrollment_data = ENROLLMENT_LIST.row(row[:width])
+        enrollment_data["course"] = COURSE_SUMMARY.row(row[width:])
+        enrollments_data.append(enrollment_data)
     
-    return {
+    return ORJSONResponse({
         "data": enrollments_data,
         "stats": stats,
         "pagination": {
@@ -142,7 +139,7 @@ async def list_enrollments(
             "total": total,
             "totalPages": (total + limit - 1) // limit,
         }
-    }
+    })
 
 
 @router.post("")
@@ -217,6 +214,130 @@ async def create_enrollment(
     }
 
 
+@router.post("/bulk")
+async def bulk_create_enrollments(
+    request: BulkEnrollmentRequest,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> ORJSONResponse:
+    """
+    POST /api/enrollments/bulk
+    Enroll every user in every course, one result per pair.
+    
+    Users, courses and existing enrollments are checked with one query
+    each, new enrollments are inserted ENROLLMENT_BULK_CHUNK_SIZE per
+    statement in a single transaction, and notifications, timeline events
+    and badge checks are queued as one enrollments_created job.
+    """
+    if not await can(db, context, "enrollments:create"):
+        raise RBACError("enrollments:create")
+    
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+    
+    settings = get_settings()
+    tenant_id = context.tenant_id
+    params: dict[str, Any] = {"tenant_id": tenant_id, "group_id": request.groupId}
+    user_ids = list(dict.fromkeys(request.userIds))
+    course_ids = list(dict.fromkeys(request.courseIds))
+    
+    if request.groupId:
+        group = await db.execute(
+            text('SELECT id FROM groups WHERE id = :group_id AND "tenantId" = :tenant_id AND "deletedAt" IS NULL'),
+            params,
+        )
+        if group.first() is None:
+            raise NotFoundError("Group")
+        members = await db.execute(
+            text('SELECT "userId" FROM group_members WHERE "groupId" = :group_id AND "tenantId" = :tenant_id ORDER BY "addedAt"'),
+            params,
+        )
+        user_ids = list(dict.fromkeys([*user_ids, *(row[0] for row in members.all())]))
+        if not course_ids:
+            courses = await db.execute(
+                text('SELECT "courseId" FROM group_courses WHERE "groupId" = :group_id AND "tenantId" = :tenant_id ORDER BY "addedAt"'),
+                params,
+            )
+            course_ids = [row[0] for row in courses.all()]
+    
+    if not user_ids or not course_ids:
+        raise BadRequestError("At least one user and one course are required")
+    if len(user_ids) * len(course_ids) > settings.enrollment_bulk_max_pairs:
+        raise BadRequestError(f"At most {settings.enrollment_bulk_max_pairs} enrollments per request")
+    
+    params.update(user_ids=user_ids, course_ids=course_ids)
+    users_result = await db.execute(
+        text('SELECT id FROM users WHERE "tenantId" = :tenant_id AND id = ANY(:user_ids) AND "deletedAt" IS NULL'),
+        params,
+    )
+    known_users = {row[0] for row in users_result.all()}
+    courses_result = await db.execute(
+        text('SELECT id, status FROM courses WHERE "tenantId" = :tenant_id AND id = ANY(:course_ids) AND "deletedAt" IS NULL'),
+        params,
+    )
+    course_status = {row[0]: str(row[1]) for row in courses_result.all()}
+    existing_result = await db.execute(
+        text(
+            'SELECT id, "userId", "courseId" FROM enrollments WHERE "tenantId" = :tenant_id '
+            'AND "courseId" = ANY(:course_ids) AND "userId" = ANY(:user_ids)'
+        ),
+        params,
+    )
+    existing = {(row[1], row[2]): row[0] for row in existing_result.all()}
+    
+    results: list[dict[str, Any]] = []
+    pending: list[dict[str, Any]] = []
+    for course_id in course_ids:
+        status = course_status.get(course_id)
+        for user_id in user_ids:
+            item: dict[str, Any] = {"userId": user_id, "courseId": course_id}
+            if user_id not in known_users:
+                item.update(status="failed", error="User not found")
+            elif status is None:
+                item.update(status="failed", error="Course not found")
+            elif status != "PUBLISHED":
+                item.update(status="failed", error="Cannot enroll in unpublished course")
+            elif (user_id, course_id) in existing:
+                item.update(status="skipped", enrollmentId=existing[(user_id, course_id)], error="Already enrolled in this course")
+            else:
+                item.update(status="created", enrollmentId=str(uuid4()))
+                pending.append(item)
+            results.append(item)
+    
+    now = datetime.utcnow()
+    chunk_size = settings.enrollment_bulk_chunk_size
+    chunks: list[list[tuple[str, str, str]]] = []
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        inserted = await insert_enrollments(
+            db, tenant_id, [(item["enrollmentId"], item["userId"], item["courseId"]) for item in chunk], now
+        )
+        inserted_ids = {row[0] for row in inserted}
+        for item in chunk:
+            if item["enrollmentId"] not in inserted_ids:
+                # Enrolled concurrently since the existence check
+                del item["enrollmentId"]
+                item.update(status="skipped", error="Already enrolled in this course")
+        chunks.append(inserted)
+    await db.commit()
+    
+    created = [row for chunk in chunks for row in chunk]
+    for chunk in chunks:
+        for entry in batch_audit_entries(
+            tenant_id, context.user_id, chunk, {"source": "bulk", "groupId": request.groupId}
+        ):
+            log_audit_background(entry)
+    job_id = None
+    if created:
+        job_id = enrollments_created.delay(tenant_id, context.user_id, [list(row) for row in created]).id
+    
+    counts = {"created": 0, "skipped": 0, "failed": 0}
+    for item in results:
+        counts[item["status"]] += 1
+    
+    return ORJSONResponse({**counts, "jobId": job_id, "results": results})
+
+
 @router.delete("/{enrollment_id}")
 async def delete_enrollment(
     enrollment_id: str,
@@ -0,0 +1,82 @@
+"""
+Gamification Routes
+
+Points leaderboards, served from Redis sorted sets maintained by the
+gamification tasks (see app.gamification.leaderboard). A board is 404
+while gamification is disabled for its tenant/branch and 403 while only
+the leaderboard is.
+"""
+
+from typing import Annotated, Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import RequireAuth
+from app.db.redis import get_redis
+from app.db.session import get_db
+from app.errors import BadRequestError, ForbiddenError, NotFoundError
+from app.gamification.leaderboard import leaderboard_settings, top_scores, user_profiles, user_rank
+
+router = APIRouter()
+
+
+# ============= Helper Functions =============
+
+async def check_leaderboard_enabled(db: AsyncSession, tenant_id: str, branch_id: Optional[str]) -> None:
+    enabled, leaderboard_enabled = await leaderboard_settings(db, tenant_id, branch_id)
+    if not enabled:
+        raise NotFoundError("Leaderboard")
+    if not leaderboard_enabled:
+        raise ForbiddenError("Leaderboard is disabled")
+
+
+# ============= Endpoints =============
+
+@router.get("/leaderboard")
+async def get_leaderboard(
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    branchId: Optional[str] = Query(None, description="Branch board (default: whole tenant)"),
+    limit: int = Query(20, ge=1, le=100),
+) -> dict[str, Any]:
+    """
+    GET /api/gamification/leaderboard
+    Top users by points, for the tenant or one branch.
+    """
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+
+    await check_leaderboard_enabled(db, context.tenant_id, branchId)
+
+    scores = await top_scores(get_redis(), context.tenant_id, branchId, limit)
+    profiles = await user_profiles(db, context.tenant_id, [user_id for user_id, _ in scores])
+
+    return {
+        "branchId": branchId,
+        "leaderboard": [
+            {"rank": rank, "userId": user_id, "points": points, **profiles.get(user_id, {})}
+            for rank, (user_id, points) in enumerate(scores, start=1)
+        ],
+    }
+
+
+@router.get("/leaderboard/me")
+async def get_my_rank(
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    branchId: Optional[str] = Query(None, description="Branch board (default: whole tenant)"),
+) -> dict[str, Any]:
+    """
+    GET /api/gamification/leaderboard/me
+    The current user's rank and points.
+    """
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+
+    await check_leaderboard_enabled(db, context.tenant_id, branchId)
+
+    return {
+        "branchId": branchId,
+        **await user_rank(get_redis(), context.tenant_id, branchId, context.user_id),
+    }
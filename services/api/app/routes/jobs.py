@@ -0,0 +1,169 @@
+"""
+Job Routes
+
+Status and progress of background tasks (report generation, imports),
+read from the Celery result backend in Redis.
+
+A task is visible to the user who queued it and to admins of the same
+tenant. Report tasks are shared within the tenant (identical report
+requests are handed the same task, see app.reports.cache), so they are
+also visible to anyone there with reports:read - the same rule as
+/api/reports/{task_id}/download. Tasks the caller may not see are
+reported exactly like unknown ones (PENDING), so task ids cannot be
+probed across tenants.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Optional, Sequence
+
+import orjson
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import AuthContext, RequireAuth
+from app.db.redis import get_redis
+from app.db.session import get_db
+from app.jobs.results import format_task_status, get_task_meta, get_task_metas, task_owner
+from app.rbac import can
+
+router = APIRouter()
+
+# Server-sent events
+EVENT_POLL_SECONDS = 1.0
+EVENT_HEARTBEAT_SECONDS = 15.0
+EVENT_MAX_SECONDS = 3600.0
+
+# Tasks shared by everyone in the tenant with reports:read
+REPORT_TASK = "app.jobs.tasks.report_generate"
+
+
+# ============= Request/Response Schemas =============
+
+class JobStatusRequest(BaseModel):
+    taskIds: list[str] = Field(min_length=1, max_length=100)
+
+
+# ============= Helpers =============
+
+def _is_report(meta: Optional[dict[str, Any]]) -> bool:
+    return bool(meta) and meta.get("name") == REPORT_TASK
+
+
+def _visible(
+    context: AuthContext,
+    meta: Optional[dict[str, Any]],
+    reads_reports: bool = False,
+) -> Optional[dict[str, Any]]:
+    """The meta if the caller may see the task, else None."""
+    tenant_id, user_id = task_owner(meta)
+    if meta is None or not context.tenant_id or tenant_id != context.tenant_id:
+        return None
+    if user_id != context.user_id and context.role != "ADMIN":
+        if not (reads_reports and _is_report(meta)):
+            return None
+    return meta
+
+
+async def _reads_reports(
+    db: AsyncSession,
+    context: AuthContext,
+    metas: Sequence[Optional[dict[str, Any]]],
+) -> bool:
+    """reports:read, checked only if a colleague's report task is among `metas`."""
+    if context.role == "ADMIN":
+        return False
+    if not any(_is_report(meta) and task_owner(meta)[1] != context.user_id for meta in metas):
+        return False
+    return await can(db, context, "reports:read")
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+# ============= Endpoints =============
+
+@router.get("/{task_id}")
+async def get_job_status(
+    task_id: str,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """
+    GET /api/jobs/{task_id}
+    Get a task's status, progress or result.
+    """
+    meta = await get_task_meta(get_redis(), task_id)
+    reads_reports = await _reads_reports(db, context, [meta])
+    return format_task_status(task_id, _visible(context, meta, reads_reports))
+
+
+@router.post("/status")
+async def get_job_statuses(
+    request: JobStatusRequest,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> dict[str, Any]:
+    """
+    POST /api/jobs/status
+    Get the status of up to 100 tasks in one request (one Redis MGET).
+    """
+    task_ids = list(dict.fromkeys(request.taskIds))
+    metas = await get_task_metas(get_redis(), task_ids)
+    reads_reports = await _reads_reports(db, context, metas)
+
+    return {
+        "data": [
+            format_task_status(task_id, _visible(context, meta, reads_reports))
+            for task_id, meta in zip(task_ids, metas)
+        ],
+    }
+
+
+@router.get("/{task_id}/events")
+async def stream_job_status(
+    task_id: str,
+    request: Request,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> StreamingResponse:
+    """
+    GET /api/jobs/{task_id}/events
+    Server-sent events: a `status` event whenever the task's state or
+    progress changes, ending after the task is ready.
+    """
+    redis = get_redis()
+    # Resolved up front: the request's session is not usable while streaming
+    reads_reports = context.role != "ADMIN" and await can(db, context, "reports:read")
+
+    async def events() -> AsyncIterator[bytes]:
+        started = last_sent = time.monotonic()
+        previous = None
+        while time.monotonic() - started < EVENT_MAX_SECONDS:
+            if await request.is_disconnected():
+                return
+
+            status = format_task_status(
+                task_id, _visible(context, await get_task_meta(redis, task_id), reads_reports),
+            )
+            if status != previous:
+                yield _sse("status", status)
+                previous, last_sent = status, time.monotonic()
+                if status["ready"]:
+                    return
+            elif time.monotonic() - last_sent >= EVENT_HEARTBEAT_SECONDS:
+                # Comment line keeps proxies from closing an idle stream
+                yield b": keep-alive\n\n"
+                last_sent = time.monotonic()
+
+            await asyncio.sleep(EVENT_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,20 +4,39 @@ Reports Routes
 Endpoints for generating and exporting reports.
 """
 
+import asyncio
+import logging
+import os
+import uuid
 from typing import Annotated, Any, Optional
-from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, Query
-from pydantic import BaseModel, Field
-from sqlalchemy import select, func
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import FileResponse, Response
+from pydantic import BaseModel, EmailStr, Field
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.auth import AuthContext, RequireAuth
-from app.db.models import Enrollment, User, Course, EnrollmentStatus
+from app.db.redis import get_redis
 from app.db.session import get_db
-from app.errors import RBACError
+from app.errors import AppError, BadRequestError, NotFoundError, RBACError
 from app.rbac import can
+from app.jobs.results import get_task_meta
 from app.jobs.tasks import report_generate
+from app.reports import (
+    format_dashboard_stats,
+    read_activity,
+    read_course_progress,
+    read_dashboard_stats,
+    refresh_dashboard_stats,
+)
+from app.reports.cache import cache_key, claim, data_version, find_cached, unclaim
+from app.reports.engine import load_ruleset
+from app.reports.ruleset import compile_ruleset
+from app.reports.writers import get_writer
+from app.responses import is_not_modified
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -28,7 +47,7 @@ class GenerateReportRequest(BaseModel):
     reportType: str = Field(description="Type of report: course_progress, user_activity, enrollment")
     format: Optional[str] = "xlsx"
     filters: Optional[dict] = None
-    recipients: Optional[list[str]] = None
+    recipients: Optional[list[EmailStr]] = Field(None, description="Emailed a download link when the report is ready")
 
 
 # ============= Endpoints =============
@@ -37,76 +56,30 @@ class GenerateReportRequest(BaseModel):
 async def get_dashboard_stats(
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
+    fresh: bool = Query(False, description="Recompute instead of reading the rollup (admins only)"),
 ) -> dict[str, Any]:
     """
     GET /api/reports/dashboard
-    Get dashboard statistics.
+    Get dashboard statistics from the materialized per-tenant rollup.
     """
     if not await can(db, context, "reports:read"):
         raise RBACError("reports:read")
     
-    # Get user count
-    user_count_result = await db.execute(
-        select(func.count()).select_from(User)
-    )
-    total_users = user_count_result.scalar() or 0
-    
-    # Get active users (logged in within last 30 days)
-    thirty_days_ago = datetime.now(timezone.utc).replace(day=1)
-    active_users_result = await db.execute(
-        select(func.count()).select_from(User).where(
-            User.last_login_at >= thirty_days_ago
-        )
-    )
-    active_users = active_users_result.scalar() or 0
-    
-    # Get course count
-    course_count_result = await db.execute(
-        select(func.count()).select_from(Course)
-    )
-    total_courses = course_count_result.scalar() or 0
-    
-    # Get enrollment stats
-    enrollment_stats_result = await db.execute(
-        select(
-            Enrollment.status,
-            func.count(Enrollment.id)
-        ).group_by(Enrollment.status)
-    )
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
     
-    enrollment_stats = {
-        "total": 0,
-        "completed": 0,
-        "inProgress": 0,
-        "notStarted": 0,
-    }
+    row = None
+    if not (fresh and context.role == "ADMIN"):
+        row = await read_dashboard_stats(db, context.tenant_id)
     
-    for row in enrollment_stats_result:
-        status, count = row
-        enrollment_stats["total"] += count
-        if status == EnrollmentStatus.COMPLETED:
-            enrollment_stats["completed"] = count
-        elif status == EnrollmentStatus.IN_PROGRESS:
-            enrollment_stats["inProgress"] = count
-        elif status == EnrollmentStatus.NOT_STARTED:
-            enrollment_stats["notStarted"] = count
-    
-    # Calculate completion rate
-    completion_rate = 0
-    if enrollment_stats["total"] > 0:
-        completion_rate = round(enrollment_stats["completed"] / enrollment_stats["total"] * 100, 1)
+    # Not computed yet (new tenant) or explicit bypass: refresh this tenant now
+    if row is None:
+        rows = await refresh_dashboard_stats(db, context.tenant_id)
+        if not rows:
+            raise NotFoundError("Tenant")
+        row = rows[0]
     
-    return {
-        "users": {
-            "total": total_users,
-            "active": active_users,
-        },
-        "courses": {
-            "total": total_courses,
-        },
-        "enrollments": enrollment_stats,
-        "completionRate": completion_rate,
-    }
+    return format_dashboard_stats(row)
 
 
 @router.get("/course-progress")
@@ -117,48 +90,15 @@ async def get_course_progress_report(
 ) -> dict[str, Any]:
     """
     GET /api/reports/course-progress
-    Get course progress report.
+    Get course progress report from the precomputed per-course counters.
     """
     if not await can(db, context, "reports:read"):
         raise RBACError("reports:read")
     
-    # Build query
-    query = (
-        select(
-            Course.id,
-            Course.title,
-            Course.code,
-            func.count(Enrollment.id).label("total_enrollments"),
-            func.sum(
-                func.case(
-                    (Enrollment.status == EnrollmentStatus.COMPLETED, 1),
-                    else_=0
-                )
-            ).label("completed"),
-            func.avg(Enrollment.progress).label("avg_progress"),
-        )
-        .join(Enrollment, Enrollment.course_id == Course.id, isouter=True)
-        .group_by(Course.id, Course.title, Course.code)
-    )
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
     
-    if courseId:
-        query = query.where(Course.id == courseId)
-    
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # Transform for response
-    courses_data = []
-    for row in rows:
-        courses_data.append({
-            "courseId": row[0],
-            "title": row[1],
-            "code": row[2],
-            "totalEnrollments": row[3] or 0,
-            "completed": row[4] or 0,
-            "avgProgress": float(row[5]) if row[5] else 0,
-            "completionRate": round((row[4] or 0) / (row[3] or 1) * 100, 1),
-        })
+    courses_data = await read_course_progress(db, context.tenant_id, courseId)
     
     return {"data": courses_data}
 
@@ -171,24 +111,85 @@ async def generate_report(
 ) -> dict[str, Any]:
     """
     POST /api/reports/generate
-    Queue a report generation job.
+    Queue a report generation job, or return the task that already built
+    (or is building) the same report over the same data. Reports with
+    recipients are always generated, so that the task emails them.
     """
     if not await can(db, context, "reports:create"):
         raise RBACError("reports:create")
     
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+    
+    format = request.format or "xlsx"
+    try:
+        get_writer(format)
+        ruleset = await load_ruleset(db, request.reportType, context.tenant_id)
+        compiled = compile_ruleset(ruleset, request.filters)
+    except ValueError as exc:
+        # Unknown report, invalid ruleset (RulesetError) or unsupported format
+        raise BadRequestError(str(exc))
+    
+    task_id = str(uuid.uuid4())
+    key = None
+    
+    # Emailed reports skip the cache: a cached or in-flight task would not
+    # send to these recipients
+    if not request.recipients:
+        version = await data_version(db, context.tenant_id, compiled.tables)
+        key = cache_key(context.tenant_id, ruleset, request.filters, format, version)
+        
+        try:
+            redis = get_redis()
+            cached = await find_cached(redis, key)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "taskId": cached["task_id"],
+                    "cached": True,
+                    "message": "Report already generated",
+                }
+            
+            owner = await claim(redis, key, task_id)
+            if owner is not None:
+                return {
+                    "success": True,
+                    "taskId": owner,
+                    "cached": False,
+                    "message": "Report generation already queued",
+                }
+        except RedisError:
+            # Cache unavailable: generate without it
+            logger.warning("Report cache unavailable, queueing uncached report", exc_info=True)
+            key = None
+    
     # Queue the report generation task
-    task = report_generate.delay(
-        report_id=request.reportType,
-        tenant_id=context.tenant_id or "",
-        user_id=context.user_id,
-        format=request.format or "xlsx",
-        filters=request.filters,
-        recipients=request.recipients,
-    )
+    try:
+        report_generate.apply_async(
+            kwargs={
+                "report_id": request.reportType,
+                "tenant_id": context.tenant_id,
+                "user_id": context.user_id,
+                "format": format,
+                "filters": request.filters,
+                "recipients": request.recipients,
+                "cache_key": key,
+            },
+            task_id=task_id,
+        )
+    except Exception:
+        # Identical requests must not be handed a task that was never queued
+        if key is not None:
+            try:
+                await unclaim(get_redis(), key, task_id)
+            except RedisError:
+                logger.warning("Could not release report claim", exc_info=True)
+        raise
     
     return {
         "success": True,
-        "taskId": task.id,
+        "taskId": task_id,
+        "cached": False,
         "message": "Report generation queued",
     }
 
@@ -201,51 +202,67 @@ async def get_user_activity_report(
 ) -> dict[str, Any]:
     """
     GET /api/reports/user-activity
-    Get user activity report.
+    Get user activity totals and the daily series from the activity buckets.
+    """
+    if not await can(db, context, "reports:read"):
+        raise RBACError("reports:read")
+    
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+    
+    return await read_activity(db, context.tenant_id, days)
+
+
+@router.get("/{task_id}/download")
+async def download_report(
+    task_id: str,
+    request: Request,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> Response:
+    """
+    GET /api/reports/{task_id}/download
+    Stream a generated report file.
+    
+    Supports Range requests (resumable downloads) and conditional requests
+    via ETag/Last-Modified. The file is streamed in fixed-size chunks, or
+    handed to the server for zero-copy sending where it supports it.
     """
     if not await can(db, context, "reports:read"):
         raise RBACError("reports:read")
     
-    from datetime import timedelta
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
     
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    meta = await get_task_meta(get_redis(), task_id)
+    result = (meta or {}).get("result")
+    if meta is None or meta.get("status") != "SUCCESS" or not isinstance(result, dict):
+        if meta is not None and meta.get("status") in ("STARTED", "RETRY", "PROGRESS"):
+            raise AppError("Report is not ready yet", error_code="CONFLICT", status_code=409)
+        raise NotFoundError("Report")
     
-    # Get new users in period
-    new_users_result = await db.execute(
-        select(func.count()).select_from(User).where(
-            User.created_at >= cutoff
-        )
-    )
-    new_users = new_users_result.scalar() or 0
+    # Artifacts are only visible to the tenant they were generated for
+    if not result.get("success") or result.get("tenant_id") != context.tenant_id:
+        raise NotFoundError("Report")
     
-    # Get active users (logged in during period)
-    active_users_result = await db.execute(
-        select(func.count()).select_from(User).where(
-            User.last_login_at >= cutoff
-        )
-    )
-    active_users = active_users_result.scalar() or 0
+    try:
+        stat_result = await asyncio.to_thread(os.stat, result["path"])
+    except FileNotFoundError:
+        raise NotFoundError("Report")
     
-    # Get new enrollments in period
-    new_enrollments_result = await db.execute(
-        select(func.count()).select_from(Enrollment).where(
-            Enrollment.created_at >= cutoff
-        )
+    response = FileResponse(
+        result["path"],
+        media_type=result.get("content_type"),
+        filename=f"{result['report_id']}.{result['format']}",
+        stat_result=stat_result,
+        headers={"Cache-Control": "private, no-cache"},
     )
-    new_enrollments = new_enrollments_result.scalar() or 0
-    
-    # Get completions in period
-    completions_result = await db.execute(
-        select(func.count()).select_from(Enrollment).where(
-            Enrollment.completed_at >= cutoff
+    if is_not_modified(request.headers, response.headers):
+        return Response(
+            status_code=304,
+            headers={
+                name: response.headers[name]
+                for name in ("etag", "last-modified", "cache-control")
+            },
         )
-    )
-    completions = completions_result.scalar() or 0
-    
-    return {
-        "period": f"Last {days} days",
-        "newUsers": new_users,
-        "activeUsers": active_users,
-        "newEnrollments": new_enrollments,
-        "completions": completions,
-    }
+    return response
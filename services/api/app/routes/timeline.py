@@ -0,0 +1,89 @@
+"""
+Timeline Routes
+
+Activity feeds for a user or a course, newest first with keyset
+pagination (see app.timeline.store).
+"""
+
+from typing import Annotated, Any, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import AuthContext, RequireAuth
+from app.db.session import get_db
+from app.errors import BadRequestError, RBACError
+from app.rbac import can
+from app.timeline import read_feed
+
+router = APIRouter()
+
+
+# ============= Helper Functions =============
+
+async def feed_page(
+    db: AsyncSession,
+    context: AuthContext,
+    scope: str,
+    owner_id: str,
+    limit: int,
+    cursor: Optional[str],
+    event_types: Optional[list[str]],
+) -> dict[str, Any]:
+    try:
+        events, next_cursor = await read_feed(
+            db, context.tenant_id, scope, owner_id, limit, cursor, event_types,
+        )
+    except ValueError as e:
+        raise BadRequestError(str(e))
+
+    return {
+        "data": events,
+        "nextCursor": next_cursor,
+    }
+
+
+# ============= Endpoints =============
+
+@router.get("/users/{user_id}")
+async def get_user_timeline(
+    user_id: str,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    eventType: Optional[list[str]] = Query(None, description="Filter by event type (repeatable)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+) -> dict[str, Any]:
+    """
+    GET /api/timeline/users/{user_id}
+    A user's activity feed. Users may read their own; others need user:read.
+    """
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+
+    if user_id != context.user_id and not await can(db, context, "user:read"):
+        raise RBACError("user:read")
+
+    return await feed_page(db, context, "user", user_id, limit, cursor, eventType)
+
+
+@router.get("/courses/{course_id}")
+async def get_course_timeline(
+    course_id: str,
+    context: RequireAuth,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    eventType: Optional[list[str]] = Query(None, description="Filter by event type (repeatable)"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+) -> dict[str, Any]:
+    """
+    GET /api/timeline/courses/{course_id}
+    A course's activity feed.
+    """
+    if not context.tenant_id:
+        raise BadRequestError("Tenant context required")
+
+    if not await can(db, context, "course:read"):
+        raise RBACError("course:read")
+
+    return await feed_page(db, context, "course", course_id, limit, cursor, eventType)
@@ -14,9 +14,11 @@ from sqlalchemy.orm import selectinload
 
 from app.auth import AuthContext, RequireAuth, hash_password
 from app.db.models import User, UserRole
+from app.db.serializers import USER_DETAIL, USER_LIST
 from app.db.session import get_db
 from app.errors import BadRequestError, NotFoundError, RBACError
 from app.rbac import can, require_permission
+from app.responses import ORJSONResponse
 from app.scope import enforce_node_filter
 
 router = APIRouter()
@@ -60,7 +62,7 @@ class UserListResponse(BaseModel):
 
 # ============= Endpoints =============
 
-@router.get("")
+@router.get("", response_model=UserListResponse)
 async def list_users(
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -69,7 +71,7 @@ async def list_users(
     role: str = Query("", description="Filter by role"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
-) -> UserListResponse:
+) -> ORJSONResponse:
     """
     List users with pagination and filtering.
     Respects node scoping for non-admin users.
@@ -78,8 +80,8 @@ async def list_users(
     if not await can(db, context, "user:read"):
         raise RBACError("user:read")
     
-    # Build query
-    query = select(User).options(selectinload(User.roles))
+    # Build query (projected columns only, no ORM entities)
+    query = select(*USER_LIST.columns)
     count_query = select(func.count()).select_from(User)
     
     # Apply search filter
@@ -112,36 +114,28 @@ async def list_users(
     
     # Execute query
     result = await db.execute(query)
-    users = result.scalars().all()
-    
-    # Transform for response
-    users_data = []
-    for user in users:
-        role_keys = [ur.role_key.value for ur in user.roles] if user.roles else []
-        if not role_keys:
-            role_keys = [user.role.value if hasattr(user.role, 'value') else str(user.role)]
-        
-        users_data.append({
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "firstName": user.first_name,
-            "lastName": user.last_name,
-            "status": user.status.value if hasattr(user.status, 'value') else str(user.status),
-            "role": user.role.value if hasattr(user.role, 'value') else str(user.role),
-            "roles": role_keys,
-            "isActive": user.is_active,
-            "nodeId": user.node_id,
-            "createdAt": user.created_at.isoformat() if user.created_at else None,
-        })
-    
-    return UserListResponse(
-        users=users_data,
-        total=total,
-        page=page,
-        limit=limit,
-        totalPages=(total + limit - 1) // limit,
-    )
+    users_data = USER_LIST.rows(result.all())
+    
+    # Load role keys for the page in one query
+    roles_by_user: dict[str, list[Any]] = {}
+    if users_data:
+        roles_result = await db.execute(
+            select(UserRole.user_id, UserRole.role_key)
+            .where(UserRole.user_id.in_([user["id"] for user in users_data]))
+        )
+        for user_id, role_key in roles_result:
+            roles_by_user.setdefault(user_id, []).append(role_key)
+    
+    for user_data in users_data:
+        user_data["roles"] = roles_by_user.get(user_data["id"]) or [user_data["role"]]
+    
+    return ORJSONResponse({
+        "users": users_data,
+        "total": total,
+        "page": page,
+        "limit": limit,
+        "totalPages": (total + limit - 1) // limit,
+    })
 
 
 @router.post("")
@@ -213,7 +207,7 @@ async def get_user(
     user_id: str,
     context: RequireAuth,
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> dict[str, Any]:
+) -> ORJSONResponse:
     """
     Get a single user by ID.
     """
@@ -233,26 +227,10 @@ async def get_user(
     if not validate_node_access(context, user.node_id):
         raise NotFoundError("User")
     
-    role_keys = [ur.role_key.value for ur in user.roles] if user.roles else []
+    user_data = USER_DETAIL.entity(user)
+    user_data["roles"] = [ur.role_key for ur in user.roles]
     
-    return {
-        "id": user.id,
-        "username": user.username,
-        "email": user.email,
-        "firstName": user.first_name,
-        "lastName": user.last_name,
-        "bio": user.bio,
-        "timezone": user.timezone,
-        "language": user.language,
-        "status": user.status.value if hasattr(user.status, 'value') else str(user.status),
-        "role": user.role.value if hasattr(user.role, 'value') else str(user.role),
-        "roles": role_keys,
-        "isActive": user.is_active,
-        "isVerified": user.is_verified,
-        "nodeId": user.node_id,
-        "createdAt": user.created_at.isoformat() if user.created_at else None,
-        "lastLoginAt": user.last_login_at.isoformat() if user.last_login_at else None,
-    }
+    return ORJSONResponse(user_data)
 
 
 @router.put("/{user_id}")
@@ -0,0 +1,25 @@
+"""Activity timeline package."""
+
+from app.timeline.buffer import (
+    buffer_events,
+    buffer_events_async,
+    dead_letter,
+    flush_due,
+    return_batch,
+    take_batch,
+    timeline_event,
+)
+from app.timeline.store import insert_events, read_feed, write_batch
+
+__all__ = [
+    "buffer_events",
+    "buffer_events_async",
+    "dead_letter",
+    "flush_due",
+    "insert_events",
+    "read_feed",
+    "return_batch",
+    "take_batch",
+    "timeline_event",
+    "write_batch",
+]
@@ -0,0 +1,121 @@
+"""
+Timeline Write Buffer
+
+Recording an activity event must not cost a Celery task and an INSERT
+each. Producers append the event (as JSON, id and timestamp fixed at
+record time) to one Redis list, and the timeline_flush task drains it in
+batches of TIMELINE_FLUSH_BATCH_SIZE, one INSERT per batch
+(app.timeline.store.insert_events):
+
+- timeline:buffer       RPUSH by producers, drained oldest first
+- timeline:dead-letter  events the database rejected (newest
+                        DEAD_LETTER_MAX kept) for inspection
+
+A flush is queued by the producer whose push fills another batch, and
+Celery beat flushes the remainder every TIMELINE_FLUSH_SECONDS. A batch
+is taken off the list atomically (LRANGE + LTRIM in MULTI), so concurrent
+flushers never write the same event. If the database is unavailable the
+batch is pushed back to the head of the list; events rejected for their
+data (app.timeline.store.write_batch) are moved to the dead-letter list
+so they cannot block every later flush. Events drained by a worker that
+dies before writing them are lost - the feed is best-effort activity
+history, not an audit trail.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+import orjson
+
+BUFFER_KEY = "timeline:buffer"
+DEAD_LETTER_KEY = "timeline:dead-letter"
+DEAD_LETTER_MAX = 10000
+
+
+def timeline_event(
+    tenant_id: str,
+    event_type: str,
+    user_id: Optional[str] = None,
+    course_id: Optional[str] = None,
+    branch_id: Optional[str] = None,
+    details: Optional[dict[str, Any]] = None,
+    timestamp: Optional[datetime] = None,
+) -> dict[str, Any]:
+    """A timeline_events row as buffered (camelCase keys, naive UTC ISO timestamp)."""
+    timestamp = timestamp or datetime.now(timezone.utc).replace(tzinfo=None)
+    return {
+        "id": str(uuid.uuid4()),
+        "tenantId": tenant_id,
+        "userId": user_id,
+        "courseId": course_id,
+        "branchId": branch_id,
+        "eventType": event_type,
+        "details": details or {},
+        "timestamp": timestamp.isoformat(),
+    }
+
+
+def flush_due(length: int, added: int, batch_size: int) -> bool:
+    """True if a push of `added` events leaving `length` buffered filled another batch."""
+    return length // batch_size > (length - added) // batch_size
+
+
+def _encode(events: Sequence[dict[str, Any]]) -> list[bytes]:
+    return [orjson.dumps(event) for event in events]
+
+
+def buffer_events(redis: Any, events: Sequence[dict[str, Any]]) -> int:
+    """
+    Append events to the buffer (blocking client).
+
+    Returns:
+        Buffer length after the push
+    """
+    if not events:
+        return redis.llen(BUFFER_KEY)
+    return redis.rpush(BUFFER_KEY, *_encode(events))
+
+
+async def buffer_events_async(redis: Any, events: Sequence[dict[str, Any]]) -> int:
+    """buffer_events for the asyncio client (request handlers)."""
+    if not events:
+        return await redis.llen(BUFFER_KEY)
+    return await redis.rpush(BUFFER_KEY, *_encode(events))
+
+
+def take_batch(redis: Any, batch_size: int) -> list[dict[str, Any]]:
+    """Atomically remove and return up to `batch_size` of the oldest buffered events."""
+    pipe = redis.pipeline(transaction=True)
+    pipe.lrange(BUFFER_KEY, 0, batch_size - 1)
+    pipe.ltrim(BUFFER_KEY, batch_size, -1)
+    raw, _ = pipe.execute()
+    return [orjson.loads(item) for item in raw]
+
+
+def return_batch(redis: Any, events: Sequence[dict[str, Any]]) -> None:
+    """Put a batch that failed to write back at the head of the buffer, in order."""
+    if events:
+        redis.lpush(BUFFER_KEY, *reversed(_encode(events)))
+
+
+def dead_letter(redis: Any, events: Sequence[dict[str, Any]]) -> None:
+    """Keep rejected events for inspection, bounded to the newest DEAD_LETTER_MAX."""
+    if events:
+        pipe = redis.pipeline(transaction=False)
+        pipe.rpush(DEAD_LETTER_KEY, *_encode(events))
+        pipe.ltrim(DEAD_LETTER_KEY, -DEAD_LETTER_MAX, -1)
+        pipe.execute()
+
+
+__all__ = [
+    "BUFFER_KEY",
+    "DEAD_LETTER_KEY",
+    "buffer_events",
+    "buffer_events_async",
+    "dead_letter",
+    "flush_due",
+    "return_batch",
+    "take_batch",
+    "timeline_event",
+]
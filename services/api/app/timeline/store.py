@@ -0,0 +1,174 @@
+"""
+Timeline Event Store
+
+Activity feed events live in the Prisma-managed timeline_events table.
+Writes arrive in batches from the buffer flusher (app.timeline.buffer) as
+one multi-row INSERT ... SELECT FROM unnest(...) per batch; ids are
+generated when the event is recorded, so a batch written twice (a flush
+retried after a lost commit) inserts nothing the second time.
+
+A batch rejected for its data (a foreign key to a deleted user/course/
+branch, an invalid value) is split and retried in halves until the
+offending events are isolated; write_batch returns those so the flusher
+can dead-letter them instead of retrying them forever.
+
+Feeds are read newest first with keyset pagination on (timestamp, id),
+served by the per-user and per-course indexes created in
+alembic/versions/008_timeline_indexes.py:
+
+- ("tenantId", "userId", timestamp DESC, id DESC)
+- ("tenantId", "courseId", timestamp DESC, id DESC)
+"""
+
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+import orjson
+from sqlalchemy import text
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.audit.query import decode_cursor, encode_cursor
+
+TIMELINE_TABLE = "timeline_events"
+MAX_PAGE_SIZE = 100
+
+# Failures caused by the rows themselves; anything else (connection loss,
+# timeouts) fails the whole write so the batch is retried later
+REJECTED_ROW_ERRORS = (DataError, IntegrityError)
+
+INSERT_SQL = f"""
+INSERT INTO "{TIMELINE_TABLE}" (id, "tenantId", "userId", "courseId", "branchId", "eventType", details, timestamp, partition_key)
+SELECT i.id, i.tenant_id, i.user_id, i.course_id, i.branch_id, i.event_type, CAST(i.details AS jsonb),
+       CAST(i.ts AS timestamp), to_char(CAST(i.ts AS timestamp), 'YYYY-MM')
+FROM unnest(
+    CAST(:ids AS text[]), CAST(:tenant_ids AS text[]), CAST(:user_ids AS text[]), CAST(:course_ids AS text[]),
+    CAST(:branch_ids AS text[]), CAST(:event_types AS text[]), CAST(:details AS text[]), CAST(:timestamps AS text[])
+) AS i(id, tenant_id, user_id, course_id, branch_id, event_type, details, ts)
+ON CONFLICT (id) DO NOTHING
+"""
+
+_COLUMNS = 'id, "userId", "courseId", "branchId", "eventType", details, timestamp'
+
+FEED_SQL = {
+    scope: f"""
+SELECT {_COLUMNS}
+FROM "{TIMELINE_TABLE}"
+WHERE "tenantId" = :tenant_id AND "{column}" = :owner_id
+  AND (CAST(:event_types AS text[]) IS NULL OR "eventType" = ANY(CAST(:event_types AS text[])))
+  AND (CAST(:cursor_at AS timestamp) IS NULL OR (timestamp, id) < (CAST(:cursor_at AS timestamp), CAST(:cursor_id AS text)))
+ORDER BY timestamp DESC, id DESC
+LIMIT :limit
+"""
+    for scope, column in (("user", "userId"), ("course", "courseId"))
+}
+
+
+async def insert_events(conn: Any, events: Sequence[dict[str, Any]]) -> int:
+    """
+    Write a batch of recorded events (app.timeline.buffer.timeline_event).
+
+    Returns:
+        Rows inserted (replayed ids are skipped)
+    """
+    if not events:
+        return 0
+    result = await conn.execute(text(INSERT_SQL), {
+        "ids": [e["id"] for e in events],
+        "tenant_ids": [e["tenantId"] for e in events],
+        "user_ids": [e.get("userId") for e in events],
+        "course_ids": [e.get("courseId") for e in events],
+        "branch_ids": [e.get("branchId") for e in events],
+        "event_types": [e["eventType"] for e in events],
+        "details": [orjson.dumps(e.get("details") or {}).decode() for e in events],
+        "timestamps": [e["timestamp"] for e in events],
+    })
+    return result.rowcount
+
+
+async def write_batch(engine: Any, events: Sequence[dict[str, Any]]) -> tuple[int, list[dict[str, Any]]]:
+    """
+    Insert events, one transaction per batch, isolating rejected rows.
+
+    A batch failing with REJECTED_ROW_ERRORS is split in halves, recursively,
+    so only the offending events are left out. Other errors propagate;
+    halves already committed are skipped when the batch is written again.
+
+    Returns:
+        (rows inserted, rejected events)
+    """
+    if not events:
+        return 0, []
+    try:
+        async with engine.begin() as conn:
+            return await insert_events(conn, events), []
+    except REJECTED_ROW_ERRORS:
+        if len(events) == 1:
+            return 0, list(events)
+    middle = len(events) // 2
+    written, rejected = await write_batch(engine, events[:middle])
+    more_written, more_rejected = await write_batch(engine, events[middle:])
+    return written + more_written, rejected + more_rejected
+
+
+def _row_to_dict(row: Any) -> dict[str, Any]:
+    details = row[5]
+    if isinstance(details, (str, bytes)):
+        details = orjson.loads(details)
+    return {
+        "id": row[0],
+        "userId": row[1],
+        "courseId": row[2],
+        "branchId": row[3],
+        "eventType": row[4],
+        "details": details,
+        "timestamp": row[6].isoformat() if row[6] else None,
+    }
+
+
+async def read_feed(
+    conn: Any,
+    tenant_id: str,
+    scope: str,
+    owner_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    event_types: Optional[Sequence[str]] = None,
+) -> tuple[list[dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page of a user's ("user") or course's ("course") feed, newest first.
+
+    Raises ValueError on a malformed cursor.
+
+    Returns:
+        (events, next_cursor) - next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    cursor_at: Optional[datetime] = None
+    cursor_id: Optional[str] = None
+    if cursor:
+        cursor_at, cursor_id = decode_cursor(cursor)
+
+    result = await conn.execute(text(FEED_SQL[scope]), {
+        "tenant_id": tenant_id,
+        "owner_id": owner_id,
+        "event_types": list(event_types) if event_types else None,
+        "cursor_at": cursor_at,
+        "cursor_id": cursor_id,
+        "limit": limit + 1,
+    })
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][6], rows[-1][0])
+
+    return [_row_to_dict(row) for row in rows], next_cursor
+
+
+__all__ = [
+    "TIMELINE_TABLE",
+    "insert_events",
+    "read_feed",
+    "write_batch",
+]
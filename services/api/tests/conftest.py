@@ -0,0 +1,28 @@
+"""
+Shared Test Fixtures
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def mock_engine():
+    """
+    Factory of AsyncEngine stand-ins.
+
+    `mock_engine(conn=None)` returns (engine, conn): both engine.connect()
+    and engine.begin() yield `conn` (a fresh AsyncMock by default), and
+    engine.dispose() is awaitable so tasks can run under run_async.
+    """
+    def make(conn=None):
+        conn = conn if conn is not None else AsyncMock()
+        engine = MagicMock()
+        for method in (engine.connect, engine.begin):
+            method.return_value.__aenter__ = AsyncMock(return_value=conn)
+            method.return_value.__aexit__ = AsyncMock(return_value=False)
+        engine.dispose = AsyncMock()
+        return engine, conn
+
+    return make